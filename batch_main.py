@@ -0,0 +1,517 @@
+"""
+Headless batch entry point for scheduled IPS to PowerFactory transfers.
+
+The scheduler runs this once for a set of projects instead of calling
+main.main from an outer script per project. It:
+- Imports only the modules batch mode needs (never tkinter or ui) and
+  reports how long each import took
+- Validates the configuration once for all projects
+- Activates each selected project in turn and runs main.main in batch mode
+  (the region SettingIndex is built once per region and reused)
+- With --workers N, runs the projects in a pool of N worker processes
+  instead (see Worker Pool below)
+- Prints a line per project and optionally writes a JSON summary
+
+Output and cache directories are passed to config.paths through
+IPS_PF_OUTPUT_DIR and IPS_PF_CACHE_DIR, so they are set before any
+project module is imported.
+
+Usage:
+    python batch_main.py --projects "SEQ Models/*"
+    python batch_main.py --region Ergon --projects "*" --output D:\\Results --resume
+    python batch_main.py --projects "*" --workers 4
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Modules a batch run imports, in dependency order so that each time only
+# covers what the earlier imports did not already load
+BATCH_MODULES = [
+    "powerfactory",
+    "config.paths",
+    "config.validation",
+    "logging_config",
+    "core",
+    "utils.pf_utils",
+    "ips_data.query_database",
+    "ips_data.ips_settings",
+    "update_powerfactory.orchestrator",
+    "main",
+]
+
+# Modules only needed for interactive runs
+INTERACTIVE_MODULES = ["tkinter", "ui"]
+
+
+class ImportProfile:
+    """
+    Import timings for the batch modules.
+
+    Attributes:
+        timings: (module name, seconds) for each import, in import order
+    """
+
+    def __init__(self):
+        """Initialize an empty profile."""
+        self.timings: List[Tuple[str, float]] = []
+
+    def load(self, name: str) -> Any:
+        """
+        Import a module and record how long it took.
+
+        Args:
+            name: Module name
+
+        Returns:
+            The imported module
+        """
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.timings.append((name, time.perf_counter() - start))
+        return module
+
+    @property
+    def total_seconds(self) -> float:
+        """Total import time."""
+        return sum(seconds for _, seconds in self.timings)
+
+    def interactive_modules(self) -> List[str]:
+        """Get the interactive-only modules that have been loaded."""
+        return [name for name in INTERACTIVE_MODULES if name in sys.modules]
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarise the profile.
+
+        Returns:
+            Dictionary with the total, per-module seconds and any
+            interactive modules that were loaded
+        """
+        return {
+            "total_seconds": round(self.total_seconds, 4),
+            "modules": {name: round(seconds, 4) for name, seconds in self.timings},
+            "interactive_modules": self.interactive_modules(),
+        }
+
+
+# =============================================================================
+# Project Selection
+# =============================================================================
+
+def project_path(project) -> str:
+    """Get a project's "folder/name" path, as matched by --projects."""
+    folder = project.GetAttribute("fold_id")
+    return f"{folder.GetAttribute('loc_name')}/{project.GetAttribute('loc_name')}"
+
+
+def find_projects(app) -> List:
+    """
+    Find the current user's projects.
+
+    Only folders are searched, so project contents are never loaded.
+
+    Args:
+        app: PowerFactory application object
+
+    Returns:
+        List of IntPrj objects
+    """
+    projects = []
+    folders = [app.GetCurrentUser()]
+    while folders:
+        folder = folders.pop(0)
+        projects.extend(folder.GetContents("*.IntPrj"))
+        folders.extend(folder.GetContents("*.IntFolder"))
+    return projects
+
+
+def select_projects(
+    app,
+    patterns: Sequence[str],
+    region: Optional[str] = None
+) -> List:
+    """
+    Select the projects to run.
+
+    Args:
+        app: PowerFactory application object
+        patterns: Wildcard patterns matched against each project's name and
+            "folder/name" path
+        region: If given, only projects in this region ("Energex" or "Ergon")
+
+    Returns:
+        Matching projects, sorted by path
+    """
+    from utils.pf_utils import determine_region
+
+    selected = [
+        project for project in find_projects(app)
+        if any(
+            fnmatch.fnmatchcase(project_path(project), pattern)
+            or fnmatch.fnmatchcase(project.GetAttribute("loc_name"), pattern)
+            for pattern in patterns
+        )
+    ]
+    if region:
+        selected = [
+            project for project in selected if determine_region(project) == region
+        ]
+    return sorted(selected, key=project_path)
+
+
+# =============================================================================
+# Running
+# =============================================================================
+
+def run_project(app, entry, project, logger, **options) -> Dict[str, Any]:
+    """
+    Activate a project and run the transfer for it.
+
+    A failing project is recorded and the batch carries on with the next.
+
+    Args:
+        app: PowerFactory application object
+        entry: The main module
+        project: Project to run
+        logger: Logger for failures
+        **options: Passed to main.main (resume, count_api_calls, cache_reads,
+            timing_columns)
+
+    Returns:
+        Dictionary with the project path, status and elapsed seconds
+    """
+    path = project_path(project)
+    start = time.perf_counter()
+
+    if project.Activate():
+        status = "activation failed"
+    else:
+        try:
+            updates_applied = entry.main(app=app, batch=True, validate=False, **options)
+            status = "updated" if updates_applied else "no updates"
+        except (Exception, SystemExit) as e:
+            logger.exception(f"Batch run failed for {path}")
+            status = f"failed: {e!r}"
+        finally:
+            project.Deactivate()
+
+    return {
+        "project": path,
+        "status": status,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# =============================================================================
+# Worker Pool
+# =============================================================================
+#
+# Each worker is a separate process with its own PowerFactory engine
+# session (powerfactory.GetApplication() in the worker). Workers are
+# started with "spawn", as on Windows PowerFactory hosts, so nothing from
+# the parent's engine session is inherited.
+#
+# The parent builds the read-only state once and hands a copy to every
+# worker when it starts:
+# - The SettingIndex of each region with a selected project
+# - The type, relay and curve mapping files
+#
+# Projects are handed out one at a time by "folder/name" path, so a worker
+# that finishes a small project picks up the next one. Each worker keeps
+# its module caches (setting plans, the region indexes) across the
+# projects it runs. Workers log to the same log file as the parent.
+
+# State of this process when it is a pool worker, set by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def prepare_shared_state(app, projects: Sequence) -> Dict[str, Any]:
+    """
+    Build the read-only state shared with the workers.
+
+    Args:
+        app: PowerFactory application object
+        projects: Projects the workers will run
+
+    Returns:
+        Dictionary with the setting index of each region with a project
+        ("setting_indexes") and the mapping file data ("mapping")
+    """
+    from ips_data import query_database as qd
+    from update_powerfactory import mapping_file
+    from update_powerfactory.mapping_bundle import load_mapping_bundle
+    from utils.pf_utils import determine_region
+
+    regions = sorted({determine_region(project) for project in projects})
+    load_mapping_bundle()
+    return {
+        "setting_indexes": {
+            region: qd.get_setting_ids(app, region) for region in regions
+        },
+        "mapping": mapping_file.get_cache_snapshot(),
+    }
+
+
+def _init_worker(
+    shared: Dict[str, Any],
+    options: Dict[str, Any],
+    setup: Optional[Callable[[], None]]
+) -> None:
+    """
+    Start a worker: connect to PowerFactory and load the shared state.
+
+    Args:
+        shared: State from prepare_shared_state()
+        options: Passed to main.main for each project
+        setup: Called before anything is imported (e.g. to install
+            in-memory stand-ins for the PowerFactory modules)
+    """
+    if setup is not None:
+        setup()
+
+    from ips_data import query_database as qd
+    from logging_config import get_logger
+    from update_powerfactory import mapping_file
+
+    for region, index in shared["setting_indexes"].items():
+        qd.set_setting_index(region, index)
+    mapping_file.load_cache_snapshot(shared["mapping"])
+
+    _worker.update(
+        app=importlib.import_module("powerfactory").GetApplication(),
+        entry=importlib.import_module("main"),
+        logger=get_logger(__name__),
+        options=options,
+    )
+
+
+def _run_in_worker(path: str) -> Dict[str, Any]:
+    """
+    Run one project in a worker.
+
+    Args:
+        path: The project's "folder/name" path
+
+    Returns:
+        The run_project() result with the worker's process ID added
+    """
+    app = _worker["app"]
+    matches = [
+        project for project in find_projects(app) if project_path(project) == path
+    ]
+    if matches:
+        result = run_project(
+            app, _worker["entry"], matches[0], _worker["logger"], **_worker["options"]
+        )
+    else:
+        result = {"project": path, "status": "not found", "seconds": 0.0}
+    result["worker"] = os.getpid()
+    return result
+
+
+def run_pool(
+    paths: Sequence[str],
+    workers: int,
+    shared: Dict[str, Any],
+    options: Dict[str, Any],
+    setup: Optional[Callable[[], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run projects in a pool of worker processes.
+
+    Args:
+        paths: "folder/name" paths of the projects to run
+        workers: Number of worker processes
+        shared: State from prepare_shared_state()
+        options: Passed to main.main (resume, count_api_calls, cache_reads,
+            timing_columns)
+        setup: Called first in each worker; must be picklable (a module
+            level function or a functools.partial of one)
+
+    Returns:
+        run_project() results with the worker process IDs, in path order
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(
+        processes=min(workers, len(paths)) or 1,
+        initializer=_init_worker,
+        initargs=(shared, options, setup),
+    ) as pool:
+        return pool.map(_run_in_worker, paths, chunksize=1)
+
+
+def summarise(
+    results: Sequence[Dict[str, Any]], workers: int, wall_seconds: float
+) -> Dict[str, Any]:
+    """
+    Aggregate the per-project results.
+
+    Args:
+        results: run_project() results
+        workers: Number of worker processes (1 for a serial run)
+        wall_seconds: Elapsed time for all projects
+
+    Returns:
+        Dictionary with the project count, status counts, wall time and
+        the sum of the per-project times
+    """
+    statuses: Dict[str, int] = {}
+    for entry in results:
+        status = entry["status"].split(":")[0]
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "projects": len(results),
+        "workers": workers,
+        "statuses": statuses,
+        "wall_seconds": round(wall_seconds, 3),
+        "project_seconds": round(sum(entry["seconds"] for entry in results), 3),
+    }
+
+
+def _set_directory_overrides(args: argparse.Namespace) -> None:
+    """
+    Pass the output and cache directories to config.paths.
+
+    Raises:
+        RuntimeError: If config.paths was already imported with other
+            directories
+    """
+    overrides = {"IPS_PF_OUTPUT_DIR": args.output, "IPS_PF_CACHE_DIR": args.cache_dir}
+    for name, directory in overrides.items():
+        if directory:
+            os.environ[name] = str(directory)
+
+    paths = sys.modules.get("config.paths")
+    if paths is None:
+        return
+    if (args.output and Path(paths.OUTPUT_BATCH_DIR) != args.output) or (
+        args.cache_dir and Path(paths.CACHE_DIR) != args.cache_dir
+    ):
+        raise RuntimeError(
+            "config.paths was imported before the batch directories were set"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Returns:
+        0 if every project ran, 1 if any failed, 2 if the configuration
+        is invalid
+    """
+    parser = argparse.ArgumentParser(
+        description="Transfer IPS settings to PowerFactory for a batch of projects"
+    )
+    parser.add_argument(
+        "--projects", nargs="+", default=["*"],
+        help='Project name or "folder/name" wildcard patterns (default: all)',
+    )
+    parser.add_argument("--region", choices=["Energex", "Ergon"], default=None)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Results CSV directory"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None,
+        help="Directory for state kept between runs (run journals)",
+    )
+    parser.add_argument(
+        "--summary", type=Path, default=None,
+        help="Write the import profile and per-project results to this JSON file",
+    )
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--count-api-calls", action="store_true")
+    parser.add_argument("--cache-reads", action="store_true")
+    parser.add_argument(
+        "--timing-columns", action="store_true",
+        help="Add TIME_<STAGE> columns with each device's stage timings to the results",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Worker processes, each with its own PowerFactory session (default: 1, "
+             "run the projects in this process)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    _set_directory_overrides(args)
+
+    profile = ImportProfile()
+    modules = {name: profile.load(name) for name in BATCH_MODULES}
+    logger = modules["logging_config"].get_logger(__name__)
+    logger.info("Batch imports finished", extra={"extra_data": profile.report()})
+    print(f"Imported batch modules in {profile.total_seconds:.2f}s")
+    for name, seconds in profile.timings:
+        print(f"  {name:<36} {seconds:.3f}s")
+    if profile.interactive_modules():
+        logger.warning(f"Interactive modules loaded: {profile.interactive_modules()}")
+
+    app = modules["powerfactory"].GetApplication()
+
+    result = modules["config.validation"].validate_for_batch_mode(app)
+    if not result.is_valid:
+        for error in result.errors:
+            print(f"Configuration error: {error}")
+        logger.error(f"Configuration validation failed: {result.errors}")
+        return 2
+    for warning in result.warnings:
+        app.PrintWarn(warning)
+
+    projects = select_projects(app, args.projects, args.region)
+    print(f"Selected {len(projects)} projects")
+
+    options = {
+        "resume": args.resume,
+        "count_api_calls": args.count_api_calls,
+        "cache_reads": args.cache_reads,
+        "timing_columns": args.timing_columns,
+    }
+    start = time.perf_counter()
+    if args.workers > 1 and len(projects) > 1:
+        shared = prepare_shared_state(app, projects)
+        results = run_pool(
+            [project_path(project) for project in projects],
+            args.workers,
+            shared,
+            options,
+        )
+    else:
+        results = [
+            run_project(app, modules["main"], project, logger, **options)
+            for project in projects
+        ]
+    summary = summarise(results, args.workers, time.perf_counter() - start)
+
+    for entry in results:
+        print(f"{entry['project']}: {entry['status']} in {entry['seconds']:.1f}s")
+    print(
+        f"{summary['projects']} projects in {summary['wall_seconds']:.1f}s "
+        f"({summary['project_seconds']:.1f}s of project time, {args.workers} workers)"
+    )
+    logger.info("Batch run finished", extra={"extra_data": summary})
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(
+                {"imports": profile.report(), "summary": summary, "projects": results},
+                f, indent=2,
+            )
+
+    failed = [
+        entry for entry in results if entry["status"] not in ("updated", "no updates")
+    ]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
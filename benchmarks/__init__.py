@@ -0,0 +1,36 @@
+"""
+Offline benchmarking against an in-memory PowerFactory.
+
+This package runs the transfer pipeline without PowerFactory or the IPS
+databases, for profiling and scaling measurements:
+- fake_pf: In-memory stand-in for the PowerFactory object model
+- synthetic_network: Generator for SEQ and Ergon networks with matching
+  IPS data and mapping files
+- headless: Runs main.main in batch mode against a synthetic network
+  (python -m benchmarks.headless)
+- ips_fixtures: IPS report stand-ins backed by the queries/ extracts
+- ips_matching: Timing and memory benchmarks for the ips_data matching
+  layer, compared against baselines/ips_matching.json
+  (python -m benchmarks.ips_matching)
+- ips_scaler: Scaled copies of the queries/ extracts with the same shape
+  (python -m benchmarks.ips_scaler)
+- batch_pool: Scaling of the batch_main worker pool over a synthetic
+  network with several projects (python -m benchmarks.batch_pool)
+
+Like main.py, this package may depend on every other package.
+"""
+
+from benchmarks.fake_pf import FakeApplication, FakeDataObject
+from benchmarks.synthetic_network import (
+    SyntheticNetwork,
+    build_network,
+    write_mapping_files,
+)
+
+__all__ = [
+    "FakeApplication",
+    "FakeDataObject",
+    "SyntheticNetwork",
+    "build_network",
+    "write_mapping_files",
+]
@@ -0,0 +1,162 @@
+"""
+PowerFactory API call budgets for headless runs.
+
+measure_api_calls() runs main.main in batch mode against a synthetic
+network with the application wrapped in an ApiCallCounter, and counts the
+API calls made in each budgeted stage. check_budgets() compares the counts
+with API_BUDGETS, the ceilings per protection device of:
+
+- get_all_protection_devices: Ergon device discovery
+- relay_settings: Every relay stage (setting lookup, type check, setting
+  application, reclosing and DIP logic, CT and VT configuration)
+- relay_settings/update_ct and relay_settings/update_vt: The CT and VT
+  paths on their own
+
+The ceilings leave about 20% headroom over the calls the synthetic
+networks need, so a change that adds API round trips per device (or per
+device pair) fails the budget at any scale.
+
+As with benchmarks.headless, the paths are set when the run starts, so
+each run must be in its own process. The command line exits with status 1
+if a budget is exceeded.
+
+Usage:
+    python -m benchmarks.api_budget --region Ergon --scale 20
+    python -m benchmarks.api_budget --region Energex --scale 5 --workdir /tmp/bench
+"""
+
+import argparse
+import importlib
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.headless import (
+    DEFAULT_WORKDIR,
+    install_fake_modules,
+    set_path_overrides,
+)
+from benchmarks.synthetic_network import build_network, write_mapping_files
+
+RESULT_FILE = "api_budget.json"
+
+# Ceiling on the API calls per protection device, by region and stage path
+# (sub-stages included)
+API_BUDGETS: Dict[str, Dict[str, float]] = {
+    "Energex": {
+        "relay_settings": 95,
+        "relay_settings/update_ct": 23,
+        "relay_settings/update_vt": 9.5,
+    },
+    "Ergon": {
+        "get_all_protection_devices": 5.5,
+        "relay_settings": 58,
+        "relay_settings/update_ct": 14,
+        "relay_settings/update_vt": 2.5,
+    },
+}
+
+
+def measure_api_calls(
+    region: str,
+    scale: int,
+    workdir: Path = DEFAULT_WORKDIR,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Count the API calls of a headless run in each budgeted stage.
+
+    Args:
+        region: "Energex" or "Ergon"
+        scale: Number of substations (about 10 devices each)
+        workdir: Directory for mapping files, output and results
+        seed: Random seed for setting values
+
+    Returns:
+        Dictionary with the run's device count, total calls and calls per
+        budgeted stage. It is also written to api_budget.json in the run
+        directory.
+    """
+    run_dir = Path(workdir) / f"api_{region.lower()}_{scale}"
+    mapping_dir = run_dir / "mapping_files"
+    output_dir = run_dir / "output"
+    shutil.rmtree(run_dir, ignore_errors=True)
+    output_dir.mkdir(parents=True)
+
+    set_path_overrides(mapping_dir, output_dir)
+    write_mapping_files(mapping_dir)
+    network = build_network(region, scale, seed)
+    install_fake_modules(network)
+
+    # Project modules are imported once the paths and stand-ins are set
+    pf_proxy = importlib.import_module("utils.pf_proxy")
+    counter = pf_proxy.ApiCallCounter()
+    entry = importlib.import_module("main")
+    entry.main(app=counter.wrap(network.app), batch=True, validate=False)
+
+    result = {
+        "region": region,
+        "scale": scale,
+        "devices": network.device_count,
+        "total": counter.calls(),
+        "calls": {
+            path: counter.calls(stage=path) for path in API_BUDGETS[region]
+        },
+    }
+    with open(run_dir / RESULT_FILE, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def check_budgets(result: Dict[str, Any]) -> List[str]:
+    """
+    Compare measured calls with the region's budgets.
+
+    Args:
+        result: Result of measure_api_calls()
+
+    Returns:
+        Description of each exceeded budget (empty if all are met)
+    """
+    devices = max(result["devices"], 1)
+    exceeded = []
+    for path, per_device in API_BUDGETS[result["region"]].items():
+        calls = result["calls"][path]
+        if calls > per_device * devices:
+            exceeded.append(
+                f"{path}: {calls} calls for {devices} devices "
+                f"(budget {per_device} per device)"
+            )
+    return exceeded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Check PowerFactory API call budgets against a synthetic network"
+    )
+    parser.add_argument("--region", choices=["Energex", "Ergon"], default="Ergon")
+    parser.add_argument(
+        "--scale", type=int, default=10,
+        help="Number of substations (about 10 devices each)",
+    )
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = measure_api_calls(args.region, args.scale, args.workdir, args.seed)
+    exceeded = check_budgets(result)
+
+    print(f"{result['region']} x{result['scale']}: {result['devices']} devices, "
+          f"{result['total']} API calls")
+    for path, calls in result["calls"].items():
+        print(f"  {path}: {calls / max(result['devices'], 1):.1f} per device")
+    for message in exceeded:
+        print(f"Budget exceeded - {message}")
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Worker pool scaling of batch_main against a synthetic multi-project network.
+
+run_batch_pool() generates a synthetic network with several projects and
+runs them all through batch_main's worker pool once for each worker count.
+Each worker process rebuilds the same network from the seed, standing in
+for the PowerFactory engine session a real worker would start. The setting
+index and mapping files are built once in this process and shared with the
+workers, as batch_main does.
+
+Wall times include starting the workers (imports and the network rebuild),
+so they show what a scheduled run would see. The speedup is relative to
+the first worker count given and is bounded by the number of cores.
+
+Usage:
+    python -m benchmarks.batch_pool --region Ergon --projects 8 --scale 20
+    python -m benchmarks.batch_pool --workers 1 2 4 8 --workdir /tmp/bench
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.headless import (
+    DEFAULT_WORKDIR,
+    install_fake_modules,
+    set_path_overrides,
+)
+from benchmarks.synthetic_network import (
+    SyntheticNetwork,
+    build_network,
+    write_mapping_files,
+)
+
+RESULT_FILE = "pool_result.json"
+
+
+def install_network(
+    region: str, scale: int, projects: int, seed: int
+) -> SyntheticNetwork:
+    """
+    Generate the network and register it as the PowerFactory host modules.
+
+    This is the worker setup, so it must stay a module level function.
+
+    Args:
+        region: "Energex" or "Ergon"
+        scale: Substations per project
+        projects: Number of projects
+        seed: Random seed for setting values
+
+    Returns:
+        The generated network
+    """
+    network = build_network(region, scale, seed, projects)
+    install_fake_modules(network)
+    return network
+
+
+def run_batch_pool(
+    region: str,
+    scale: int,
+    projects: int,
+    worker_counts: Sequence[int],
+    workdir: Path = DEFAULT_WORKDIR,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Run every project through the worker pool for each worker count.
+
+    Args:
+        region: "Energex" or "Ergon"
+        scale: Substations per project (about 10 devices each)
+        projects: Number of projects
+        worker_counts: Worker counts to measure
+        workdir: Directory for mapping files, output and results
+        seed: Random seed for setting values
+
+    Returns:
+        batch_main.summarise() results, one per worker count, with the
+        number of results files written and the speedup. They are also
+        written to pool_result.json in the run directory.
+    """
+    run_dir = Path(workdir) / f"pool_{region.lower()}_{scale}x{projects}"
+    mapping_dir = run_dir / "mapping_files"
+    set_path_overrides(mapping_dir, run_dir / "output")
+    write_mapping_files(mapping_dir)
+
+    network = install_network(region, scale, projects, seed)
+    batch_main = importlib.import_module("batch_main")
+    project_list = batch_main.find_projects(network.app)
+    paths = [batch_main.project_path(project) for project in project_list]
+    shared = batch_main.prepare_shared_state(network.app, project_list)
+    setup = partial(install_network, region, scale, projects, seed)
+
+    results = []
+    for workers in worker_counts:
+        # Workers read the output directory from the environment when
+        # they import config.paths, and a results file written in the
+        # last day makes them skip the project
+        output_dir = run_dir / "output" / f"workers_{workers}"
+        shutil.rmtree(output_dir, ignore_errors=True)
+        output_dir.mkdir(parents=True)
+        os.environ["IPS_PF_OUTPUT_DIR"] = str(output_dir)
+
+        start = time.perf_counter()
+        project_results = batch_main.run_pool(paths, workers, shared, {}, setup)
+        summary = batch_main.summarise(
+            project_results, workers, time.perf_counter() - start
+        )
+        summary["results_files"] = len(list(output_dir.glob("*.csv")))
+        summary["devices"] = network.device_count
+        results.append(summary)
+
+    for summary in results:
+        summary["speedup"] = round(
+            results[0]["wall_seconds"] / summary["wall_seconds"], 2
+        )
+
+    with open(run_dir / RESULT_FILE, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Measure batch_main worker pool scaling on a synthetic network"
+    )
+    parser.add_argument("--region", choices=["Energex", "Ergon"], default="Ergon")
+    parser.add_argument("--scale", type=int, default=20, help="Substations per project")
+    parser.add_argument("--projects", type=int, default=8)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4],
+        help="Worker counts to measure (the first is the speedup baseline)",
+    )
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_batch_pool(
+        args.region, args.scale, args.projects, args.workers, args.workdir, args.seed
+    )
+    print(f"os.cpu_count() = {os.cpu_count()}")
+    for summary in results:
+        print(
+            f"{summary['workers']} workers: {summary['projects']} projects "
+            f"({summary['statuses']}) in {summary['wall_seconds']:.2f}s, "
+            f"speedup {summary['speedup']:.2f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
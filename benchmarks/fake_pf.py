@@ -0,0 +1,580 @@
+"""
+In-memory stand-in for the PowerFactory object model.
+
+The pipeline cannot be run without `import powerfactory`, so it cannot be
+benchmarked or profiled on build hosts. This module implements the subset
+of the PowerFactory API used by this project on plain Python objects:
+
+- GetContents with "name.Class" wildcard patterns and recursion
+- GetAttribute/SetAttribute/HasAttribute with "r:"/"e:" attribute paths,
+  and the same attributes as Python attributes (obj.loc_name, obj.typ_id)
+- CreateObject (with PowerFactory's "(1)" suffix on name clashes), Delete,
+  Move, IsDeleted, GetParent, GetFullName, GetClassName, SearchObject
+- Relay slots: assigning a relay type creates the relay's elements and
+  sizes pdiselm from the type's pblk slot definitions, and GetSlot()
+  returns the object in a named slot
+- IsOutOfService, IsCalcRelevant, IsEnergized, GetCubicle and
+  GetConnectionCount for network elements
+- Activate/Deactivate for projects
+- Application methods: GetActiveProject, GetProjectFolder,
+  GetLocalLibrary, GetGlobalLibrary, GetCurrentUser, Print*,
+  SetWriteCacheEnabled, WriteChangesToDb and SearchObjectByForeignKey
+
+Attribute Semantics:
+    Objects are created with the default attributes of their class (see
+    CLASS_ATTRIBUTES). Reading an attribute that was never set and has no
+    class default raises AttributeError, as PowerFactory does. Writes are
+    accepted for any attribute. Numeric defaults coerce written values
+    ("3" is stored as 3), and a value that cannot be converted raises
+    TypeError. fold_id, cpGrid and (for cubicles) cterm are derived from
+    the object's position in the tree.
+
+Usage:
+    from benchmarks.fake_pf import FakeApplication
+
+    app = FakeApplication()
+    user = app.create_user("benchmark")
+    grid = ...
+    relay = cubicle.CreateObject("ElmRelay", "RC-00001")
+    relay.typ_id = relay_type
+"""
+
+import fnmatch
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Splits "name.Class" GetContents patterns (class names are e.g. ElmRelay,
+# StaCt, IntPrjfolder)
+_CLASS_PATTERN = re.compile(r"^(?P<name>.*)\.(?P<cls>[A-Z][a-z]{2}[A-Za-z0-9]*\*?|\*)$")
+
+# Attributes derived from the object tree rather than stored
+_DERIVED_ATTRIBUTES = frozenset({"fold_id", "cpGrid", "cterm"})
+
+# Classes connected through bus1/bus2 cubicles
+_BRANCH_CLASSES = frozenset({"ElmCoup", "ElmLne", "ElmTr2"})
+
+
+# =============================================================================
+# Class Defaults
+# =============================================================================
+
+# Default attributes per PowerFactory class. Lists are copied per object.
+CLASS_ATTRIBUTES: Dict[str, Dict[str, Any]] = {
+    "IntPrj": {"der_baseproject": None},
+    "IntPrjfolder": {"iopt_typ": ""},
+    "ElmNet": {"outserv": 0},
+    "ElmSubstat": {"sType": "", "outserv": 0},
+    "ElmTrfstat": {"sType": "", "outserv": 0},
+    "ElmTerm": {"outserv": 0, "nphase": 3, "phtech": 0, "uknom": 11.0},
+    "StaCubic": {"obj_id": None, "nphase": 3},
+    "ElmCoup": {
+        "outserv": 0, "on_off": 1, "aUsage": "cbk", "bus1": None, "bus2": None,
+    },
+    "StaSwitch": {"outserv": 0, "on_off": 1, "aUsage": "cbk"},
+    "ElmLne": {"outserv": 0, "bus1": None, "bus2": None},
+    "ElmTr2": {"outserv": 0, "typ_id": None, "bushv": None, "buslv": None},
+    "ElmRelay": {
+        "outserv": 0, "typ_id": None, "pdiselm": [], "sernum": "",
+        "chr_name": "", "for_name": "", "dat_src": "",
+    },
+    "RelFuse": {"outserv": 0, "typ_id": None, "chr_name": "", "for_name": ""},
+    "RelToc": {
+        "outserv": 0, "typ_id": None, "Ipset": 1.0, "Tpset": 1.0, "pcharac": None,
+    },
+    "RelIoc": {"outserv": 0, "typ_id": None, "Ipset": 1.0, "Tset": 0.0},
+    "RelMeasure": {"typ_id": None, "iphase": 0, "Inom": 1.0, "Unom": 110.0},
+    "RelRecl": {
+        "outserv": 0, "typ_id": None, "oplockout": 4, "ilogic": [],
+        "reclnotactive": 0,
+    },
+    "RelLogdip": {"typ_id": None, "aDipset": ""},
+    "StaCt": {"typ_id": None, "ptapset": 1, "stapset": 1, "iphase": 3, "sernum": ""},
+    "StaVt": {"typ_id": None, "ptapset": 1, "stapset": 1, "sernum": ""},
+    "TypRelay": {"pblk": []},
+    "BlkSlot": {"filtmod": "", "typ_id": None},
+    "TypToc": {"pcharac": []},
+    "TypRecl": {"blockid": []},
+    "TypLogdip": {"sInput": []},
+    "TypCt": {"primtaps": [], "sectaps": []},
+    "TypVt": {"primtaps": [], "sectaps": [], "iopt_mod": 0},
+    "TypTr2": {"nt2ph": 3, "utrn_h": 11.0, "utrn_l": 0.433, "strn": 0.1},
+}
+
+
+def _default_attributes(class_name: str) -> Dict[str, Any]:
+    """Copy the default attributes of a class for a new object."""
+    return {
+        name: list(value) if isinstance(value, list) else value
+        for name, value in CLASS_ATTRIBUTES.get(class_name, {}).items()
+    }
+
+
+def _split_pattern(pattern: str) -> Tuple[str, str]:
+    """
+    Split a GetContents pattern into name and class patterns.
+
+    Examples:
+        >>> _split_pattern("*.ElmRelay")
+        ('*', 'ElmRelay')
+        >>> _split_pattern("I>")
+        ('I>', '*')
+    """
+    match = _CLASS_PATTERN.match(pattern)
+    if match:
+        return match.group("name") or "*", match.group("cls")
+    return pattern, "*"
+
+
+# =============================================================================
+# Data Objects
+# =============================================================================
+
+class FakeDataObject:
+    """
+    In-memory PowerFactory DataObject.
+
+    Attributes are readable and writable both through GetAttribute/
+    SetAttribute and as Python attributes, like PowerFactory objects.
+    """
+
+    def __init__(
+        self,
+        class_name: str,
+        loc_name: str,
+        parent: Optional["FakeDataObject"] = None,
+        **attributes: Any
+    ):
+        """
+        Create an object, attached to a parent if one is given.
+
+        Prefer parent.CreateObject() in pipeline code; this constructor is
+        used to build the database root and synthetic networks.
+
+        Args:
+            class_name: PowerFactory class name (e.g. "ElmRelay")
+            loc_name: Object name
+            parent: Containing object
+            **attributes: Attribute values overriding the class defaults
+        """
+        object.__setattr__(self, "_class_name", class_name)
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_children", [])
+        object.__setattr__(self, "_attrs", _default_attributes(class_name))
+        object.__setattr__(self, "_deleted", False)
+        object.__setattr__(self, "_calc_relevant", True)
+        object.__setattr__(self, "_energized", True)
+        self._attrs["loc_name"] = loc_name
+        for name, value in attributes.items():
+            self._write(name, value)
+        if parent is not None:
+            parent._children.append(self)
+
+    # -------------------------------------------------------------------------
+    # Attribute access
+    # -------------------------------------------------------------------------
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._read(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            self._write(name, value)
+
+    def _read(self, name: str) -> Any:
+        """Read a single attribute."""
+        if name == "fold_id":
+            return self._parent
+        if name == "cpGrid":
+            return self._ancestor("ElmNet")
+        if name == "cterm" and self._class_name == "StaCubic":
+            return self._parent
+        if name == "pdiselm":
+            return list(self._attrs.get("pdiselm", []))
+        try:
+            return self._attrs[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{self._class_name}' object has no attribute '{name}'"
+            ) from None
+
+    def _write(self, name: str, value: Any) -> None:
+        """Write a single attribute, applying PowerFactory side effects."""
+        if name in _DERIVED_ATTRIBUTES:
+            raise AttributeError(f"Attribute '{name}' is read only")
+
+        default = CLASS_ATTRIBUTES.get(self._class_name, {}).get(name)
+        if isinstance(default, (int, float)) and not isinstance(default, bool):
+            try:
+                value = type(default)(float(value))
+            except (TypeError, ValueError):
+                raise TypeError(
+                    f"Cannot set '{name}' of {self._class_name} to {value!r}"
+                ) from None
+        elif isinstance(value, list):
+            value = list(value)
+
+        self._attrs[name] = value
+
+        if name == "typ_id" and self._class_name == "ElmRelay":
+            self._build_relay_elements()
+
+    def _resolve(self, path: str) -> Tuple["FakeDataObject", str]:
+        """
+        Resolve an attribute path to the owning object and attribute name.
+
+        Args:
+            path: "name", "e:name" or "r:ref:...:e:name"
+
+        Returns:
+            Tuple of (object, attribute name)
+
+        Raises:
+            AttributeError: If a referenced object is missing
+        """
+        parts = path.split(":")
+        if len(parts) == 1:
+            return self, parts[0]
+        if len(parts) % 2:
+            raise AttributeError(f"Malformed attribute path '{path}'")
+
+        target = self
+        for prefix, name in zip(parts[0::2], parts[1::2]):
+            if prefix == "e":
+                return target, name
+            if prefix != "r":
+                raise AttributeError(f"Malformed attribute path '{path}'")
+            target = target._read(name)
+            if not isinstance(target, FakeDataObject):
+                raise AttributeError(f"'{name}' in '{path}' is not an object")
+        raise AttributeError(f"Attribute path '{path}' has no 'e:' element")
+
+    def GetAttribute(self, path: str) -> Any:
+        target, name = self._resolve(path)
+        return target._read(name)
+
+    def SetAttribute(self, path: str, value: Any) -> None:
+        target, name = self._resolve(path)
+        target._write(name, value)
+
+    def HasAttribute(self, path: str) -> int:
+        try:
+            self.GetAttribute(path)
+        except AttributeError:
+            return 0
+        return 1
+
+    # -------------------------------------------------------------------------
+    # Object tree
+    # -------------------------------------------------------------------------
+
+    def _ancestor(self, class_name: str) -> Optional["FakeDataObject"]:
+        """Get the nearest containing object of a class."""
+        parent = self._parent
+        while parent is not None:
+            if parent._class_name == class_name:
+                return parent
+            parent = parent._parent
+        return None
+
+    def _application(self) -> Optional["FakeApplication"]:
+        """Get the application whose database contains this object."""
+        root = self
+        while root._parent is not None:
+            root = root._parent
+        return getattr(root, "_owner", None)
+
+    def _iter_descendants(self) -> Iterator["FakeDataObject"]:
+        """Iterate over all contained objects, depth first."""
+        for child in self._children:
+            yield child
+            yield from child._iter_descendants()
+
+    def GetContents(
+        self, pattern: str = "", recursive: Any = False
+    ) -> List["FakeDataObject"]:
+        objects = self._iter_descendants() if recursive else iter(self._children)
+        if not pattern:
+            return list(objects)
+
+        name_pattern, class_pattern = _split_pattern(pattern)
+        return [
+            obj for obj in objects
+            if fnmatch.fnmatchcase(obj._attrs["loc_name"], name_pattern)
+            and fnmatch.fnmatchcase(obj._class_name, class_pattern)
+        ]
+
+    def CreateObject(self, class_name: str, loc_name: str) -> "FakeDataObject":
+        existing = {
+            child._attrs["loc_name"] for child in self._children
+            if child._class_name == class_name
+        }
+        name = loc_name
+        suffix = 1
+        while name in existing:
+            name = f"{loc_name}({suffix})"
+            suffix += 1
+        return FakeDataObject(class_name, name, self)
+
+    def Delete(self) -> int:
+        if self._parent is not None and self in self._parent._children:
+            self._parent._children.remove(self)
+        self._deleted = True
+        return 0
+
+    def Move(self, obj: "FakeDataObject") -> int:
+        if obj is self or self in obj._iter_descendants():
+            return 1
+        if obj._parent is not None and obj in obj._parent._children:
+            obj._parent._children.remove(obj)
+        obj._parent = self
+        self._children.append(obj)
+        return 0
+
+    def Activate(self) -> int:
+        application = self._application() if self._class_name == "IntPrj" else None
+        if application is None:
+            return 1
+        application.activate_project(self)
+        return 0
+
+    def Deactivate(self) -> int:
+        application = self._application() if self._class_name == "IntPrj" else None
+        if application is None or application.GetActiveProject() is not self:
+            return 1
+        application.activate_project(None)
+        return 0
+
+    def IsDeleted(self) -> int:
+        return int(self._deleted)
+
+    def GetParent(self) -> Optional["FakeDataObject"]:
+        return self._parent
+
+    def GetClassName(self) -> str:
+        return self._class_name
+
+    def GetFullName(self, type: int = 0) -> str:
+        names = []
+        obj = self
+        while obj is not None and obj._parent is not None:
+            names.append(f"{obj._attrs['loc_name']}.{obj._class_name}")
+            obj = obj._parent
+        return "\\" + "\\".join(reversed(names))
+
+    def SearchObject(self, full_name: str) -> Optional["FakeDataObject"]:
+        target = self
+        while target._parent is not None:
+            target = target._parent
+
+        for segment in filter(None, full_name.split("\\")):
+            matches = target.GetContents(segment)
+            if not matches:
+                return None
+            target = matches[0]
+        return target
+
+    # -------------------------------------------------------------------------
+    # Network elements
+    # -------------------------------------------------------------------------
+
+    def IsOutOfService(self) -> int:
+        return int(bool(self._attrs.get("outserv", 0)))
+
+    def IsCalcRelevant(self) -> int:
+        return int(self._calc_relevant)
+
+    def IsEnergized(self) -> int:
+        return int(self._energized)
+
+    def GetConnectionCount(self) -> int:
+        if self._class_name in _BRANCH_CLASSES:
+            return 2
+        return 0
+
+    def GetCubicle(self, index: int) -> Optional["FakeDataObject"]:
+        buses = ("bus1", "bus2") if self._class_name != "ElmTr2" else ("bushv", "buslv")
+        if self._class_name not in _BRANCH_CLASSES or not 0 <= index < len(buses):
+            return None
+        return self._attrs.get(buses[index])
+
+    # -------------------------------------------------------------------------
+    # Relay slots
+    # -------------------------------------------------------------------------
+
+    def _build_relay_elements(self) -> None:
+        """
+        Create the relay's elements for its type, as PowerFactory does.
+
+        Each pblk slot whose definition references an element type gets a
+        child element of the slot's filter class (created once, reused on
+        later type changes). CT and VT slots are left empty.
+        """
+        relay_type = self._attrs.get("typ_id")
+        if relay_type is None:
+            self._attrs["pdiselm"] = []
+            return
+
+        slots = []
+        for slot in relay_type._attrs.get("pblk", []):
+            element_type = slot._attrs.get("typ_id")
+            if element_type is None:
+                slots.append(None)
+                continue
+
+            class_name = slot._attrs["filtmod"].split(",")[0].rstrip("*")
+            name = slot._attrs["loc_name"]
+            element = next(
+                (c for c in self._children
+                 if c._attrs["loc_name"] == name and c._class_name == class_name),
+                None,
+            )
+            if element is None:
+                element = FakeDataObject(class_name, name, self)
+            element._write("typ_id", element_type)
+            if class_name == "RelLogdip":
+                inputs = element_type._attrs.get("sInput") or [""]
+                element._attrs["aDipset"] = "0" * len(inputs[0].split(","))
+            slots.append(element)
+
+        self._attrs["pdiselm"] = slots
+
+    def GetSlot(self, slot_name: str) -> Optional["FakeDataObject"]:
+        relay_type = self._attrs.get("typ_id")
+        if relay_type is None:
+            return None
+        slots = self._attrs.get("pdiselm", [])
+        for i, slot in enumerate(relay_type._attrs.get("pblk", [])):
+            if slot._attrs["loc_name"] == slot_name:
+                return slots[i] if i < len(slots) else None
+        return None
+
+    def __str__(self) -> str:
+        return self.GetFullName()
+
+    def __repr__(self) -> str:
+        return f"FakeDataObject({self.GetFullName()!r})"
+
+
+# =============================================================================
+# Application
+# =============================================================================
+
+class FakeApplication:
+    """
+    In-memory PowerFactory application.
+
+    Attributes:
+        database: Root of the object tree
+        output: Messages printed to the output window since it was cleared,
+            as (level, message) tuples
+        commits: Number of WriteChangesToDb calls
+        write_cache_enabled: Current write cache state
+    """
+
+    def __init__(self, echo: bool = False):
+        """
+        Create an application with an empty database.
+
+        Args:
+            echo: If True, also print output window messages to stdout
+        """
+        self.database = FakeDataObject("IntDatabase", "Database")
+        self.database._owner = self
+        self.output: List[Tuple[str, str]] = []
+        self.commits = 0
+        self.write_cache_enabled = False
+        self.echo = echo
+
+        self._current_user: Optional[FakeDataObject] = None
+        self._global_library: Optional[FakeDataObject] = None
+        self._active_project: Optional[FakeDataObject] = None
+
+    # -------------------------------------------------------------------------
+    # Setup
+    # -------------------------------------------------------------------------
+
+    def create_user(self, name: str) -> FakeDataObject:
+        """Create a user folder and make it the current user."""
+        self._current_user = FakeDataObject("IntUser", name, self.database)
+        return self._current_user
+
+    def set_global_library(self, library: FakeDataObject) -> None:
+        """Set the folder returned by GetGlobalLibrary()."""
+        self._global_library = library
+
+    def activate_project(self, project: Optional[FakeDataObject]) -> None:
+        """Set the project returned by GetActiveProject()."""
+        self._active_project = project
+
+    # -------------------------------------------------------------------------
+    # PowerFactory API
+    # -------------------------------------------------------------------------
+
+    def GetActiveProject(self) -> Optional[FakeDataObject]:
+        return self._active_project
+
+    def GetCurrentUser(self) -> Optional[FakeDataObject]:
+        return self._current_user
+
+    def GetGlobalLibrary(self, class_name: str = "") -> Optional[FakeDataObject]:
+        return self._global_library
+
+    def GetProjectFolder(self, folder_type: str) -> Optional[FakeDataObject]:
+        if self._active_project is None:
+            return None
+        # Project folders only nest in project folders, so the network
+        # data itself is never walked
+        folders = [
+            child for child in self._active_project._children
+            if child._class_name == "IntPrjfolder"
+        ]
+        while folders:
+            folder = folders.pop(0)
+            if folder._attrs.get("iopt_typ") == folder_type:
+                return folder
+            folders.extend(
+                child for child in folder._children
+                if child._class_name == "IntPrjfolder"
+            )
+        return None
+
+    def GetLocalLibrary(self, class_name: str = "") -> Optional[FakeDataObject]:
+        return self.GetProjectFolder("equip")
+
+    def SearchObjectByForeignKey(self, foreign_key: str) -> Optional[FakeDataObject]:
+        if self._active_project is None:
+            return None
+        for obj in self._active_project._iter_descendants():
+            if obj._attrs.get("for_name") == foreign_key:
+                return obj
+        return None
+
+    def SetWriteCacheEnabled(self, enabled: int) -> None:
+        self.write_cache_enabled = bool(enabled)
+
+    def WriteChangesToDb(self) -> None:
+        self.commits += 1
+
+    def ClearOutputWindow(self) -> None:
+        self.output.clear()
+
+    def _print(self, level: str, message: Any) -> None:
+        self.output.append((level, str(message)))
+        if self.echo:
+            print(f"{level}: {message}")
+
+    def PrintPlain(self, message: Any) -> None:
+        self._print("plain", message)
+
+    def PrintInfo(self, message: Any) -> None:
+        self._print("info", message)
+
+    def PrintWarn(self, message: Any) -> None:
+        self._print("warn", message)
+
+    def PrintError(self, message: Any) -> None:
+        self._print("error", message)
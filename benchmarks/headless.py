@@ -0,0 +1,234 @@
+"""
+Headless runs of the full main.main flow against synthetic networks.
+
+run_headless() generates a synthetic network, writes its mapping files,
+registers in-memory stand-ins for the modules that are only available on
+PowerFactory hosts and runs main.main in batch mode:
+
+- powerfactory: GetApplication() returns the network's FakeApplication
+- netdashread: get_json_data() serves the network's setting rows
+- assetclasses.corporate_data: get_cached_data() serves the setting ID
+  and instrument transformer reports
+- add_protection_relay_skeletons: main() does nothing (the synthetic
+  Ergon networks already contain their relays)
+
+tenacity must be installed, as it is on PowerFactory hosts.
+
+Mapping, output and cache directories are redirected to the run's work
+directory through IPS_PF_MAPPING_DIR, IPS_PF_OUTPUT_DIR and
+IPS_PF_CACHE_DIR (see config.paths), so they must be set before any
+project module is imported. Run journals and the library and mapping
+caches are then kept with the run instead of in results_log/. Module caches
+such as the setting index are per process, so each scale should run in
+its own process. The command line does this when several scales are
+given.
+
+Usage:
+    python -m benchmarks.headless --region Ergon --scales 10 100 1000
+    python -m benchmarks.headless --region Energex --scales 10 --workdir /tmp/bench
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic_network import (
+    SyntheticNetwork,
+    build_network,
+    write_mapping_files,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_WORKDIR = Path(tempfile.gettempdir()) / "ips_pf_benchmarks"
+
+RESULT_FILE = "result.json"
+
+
+def install_fake_modules(network: SyntheticNetwork) -> None:
+    """
+    Register in-memory stand-ins for the PowerFactory host modules.
+
+    Args:
+        network: The synthetic network the stand-ins serve
+    """
+    powerfactory = types.ModuleType("powerfactory")
+    powerfactory.GetApplication = lambda: network.app
+
+    netdashread = types.ModuleType("netdashread")
+    netdashread.get_json_data = network.get_json_data
+
+    assetclasses = types.ModuleType("assetclasses")
+    corporate_data = types.ModuleType("assetclasses.corporate_data")
+    corporate_data.get_cached_data = network.get_cached_data
+    assetclasses.corporate_data = corporate_data
+
+    skeletons = types.ModuleType("add_protection_relay_skeletons")
+    skeletons.main = lambda app: None
+
+    sys.modules.update({
+        "powerfactory": powerfactory,
+        "netdashread": netdashread,
+        "assetclasses": assetclasses,
+        "assetclasses.corporate_data": corporate_data,
+        "add_protection_relay_skeletons": skeletons,
+    })
+
+
+def set_path_overrides(
+    mapping_dir: Path,
+    output_dir: Path,
+    cache_dir: Optional[Path] = None
+) -> None:
+    """
+    Point config.paths at the run directories.
+
+    Args:
+        mapping_dir: Directory containing the mapping files
+        output_dir: Directory for results CSVs
+        cache_dir: Directory for state kept between runs (defaults to
+            "cache" in the run directory holding mapping_dir)
+
+    Raises:
+        RuntimeError: If config.paths was already imported with other paths
+    """
+    os.environ["IPS_PF_MAPPING_DIR"] = str(mapping_dir)
+    os.environ["IPS_PF_OUTPUT_DIR"] = str(output_dir)
+    os.environ["IPS_PF_CACHE_DIR"] = str(
+        cache_dir or Path(mapping_dir).parent / "cache"
+    )
+
+    paths = sys.modules.get("config.paths")
+    if paths is not None and Path(paths.MAPPING_FILES_BASE) != mapping_dir:
+        raise RuntimeError(
+            "config.paths was imported before the benchmark paths were set; "
+            "run each benchmark in a fresh process"
+        )
+
+
+def _count_result_rows(output_dir: Path) -> int:
+    """Count the result rows written by the run."""
+    rows = 0
+    for result_file in output_dir.glob("*.csv"):
+        with open(result_file, newline="", encoding="utf-8") as f:
+            rows += max(sum(1 for _ in csv.reader(f)) - 1, 0)
+    return rows
+
+
+def run_headless(
+    region: str,
+    scale: int,
+    workdir: Path = DEFAULT_WORKDIR,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run main.main in batch mode against a synthetic network.
+
+    Args:
+        region: "Energex" or "Ergon"
+        scale: Number of substations (about 10 devices each)
+        workdir: Directory for mapping files, output and results
+        seed: Random seed for setting values
+
+    Returns:
+        Dictionary with the run's device count, result count, elapsed
+        seconds, write cache commits and updates flag. It is also written
+        to result.json in the run directory.
+    """
+    run_dir = Path(workdir) / f"{region.lower()}_{scale}"
+    mapping_dir = run_dir / "mapping_files"
+    output_dir = run_dir / "output"
+    shutil.rmtree(output_dir, ignore_errors=True)
+    output_dir.mkdir(parents=True)
+
+    set_path_overrides(mapping_dir, output_dir)
+    write_mapping_files(mapping_dir)
+
+    build_start = time.perf_counter()
+    network = build_network(region, scale, seed)
+    build_seconds = time.perf_counter() - build_start
+    install_fake_modules(network)
+
+    entry = importlib.import_module("main")
+    start = time.perf_counter()
+    updates_applied = entry.main(app=network.app, batch=True, validate=False)
+    seconds = time.perf_counter() - start
+
+    result = {
+        "region": region,
+        "scale": scale,
+        "devices": network.device_count,
+        "results": _count_result_rows(output_dir),
+        "build_seconds": round(build_seconds, 3),
+        "seconds": round(seconds, 3),
+        "commits": network.app.commits,
+        "updates_applied": bool(updates_applied),
+    }
+    with open(run_dir / RESULT_FILE, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def _run_in_subprocess(
+    region: str, scale: int, workdir: Path, seed: int
+) -> Dict[str, Any]:
+    """Run a single scale in a fresh interpreter and read its result."""
+    subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.headless",
+            "--region", region,
+            "--scales", str(scale),
+            "--workdir", str(workdir),
+            "--seed", str(seed),
+        ],
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    result_file = Path(workdir) / f"{region.lower()}_{scale}" / RESULT_FILE
+    with open(result_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run the IPS to PowerFactory transfer against synthetic networks"
+    )
+    parser.add_argument("--region", choices=["Energex", "Ergon"], default="Ergon")
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[10, 100, 1000],
+        help="Number of substations per run (about 10 devices each)",
+    )
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if len(args.scales) == 1:
+        results = [run_headless(args.region, args.scales[0], args.workdir, args.seed)]
+    else:
+        results = [
+            _run_in_subprocess(args.region, scale, args.workdir, args.seed)
+            for scale in args.scales
+        ]
+
+    for result in results:
+        print(
+            f"{result['region']} x{result['scale']}: {result['devices']} devices, "
+            f"{result['results']} results in {result['seconds']:.2f}s "
+            f"({result['commits']} commits)"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+IPS report stand-ins backed by the queries/ CSV extracts.
+
+The queries/ directory holds extracts of the corporate data cache and
+NetDash reports. This module serves them through the same interfaces as
+the host modules:
+
+- get_cached_data(report, max_age): rows of Report-Cache-* and List-*
+  extracts as namedtuples, like assetclasses.corporate_data
+- get_json_data(report, params, timeout): rows of the Protection-* extracts
+  as dictionaries, filtered by setting_id, like netdashread
+
+Values are stripped of the padding in the extracts. The Ergon "active"
+column is converted to an int, as in the synthetic networks. Reports are
+loaded once per process.
+
+set_fixture_dir() serves a different directory of extracts with the same
+report names, e.g. one written by benchmarks.ips_scaler.
+
+Usage:
+    from benchmarks.ips_fixtures import get_cached_data, install_fixture_modules
+
+    rows = get_cached_data("Report-Cache-ProtectionSettingIDs-EX")
+    install_fixture_modules()  # before importing ips_data.query_database
+"""
+
+import csv
+import sys
+import types
+from collections import namedtuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+QUERIES_DIR = Path(__file__).parent.parent / "queries"
+
+# Columns converted from their text form in the extracts
+_INT_COLUMNS = {"active"}
+
+_report_cache: Dict[str, Tuple[Any, ...]] = {}
+
+_fixture_dir = QUERIES_DIR
+
+
+def set_fixture_dir(directory: Path) -> None:
+    """
+    Serve the extracts in another directory.
+
+    Args:
+        directory: Directory of report extracts named like queries/
+    """
+    global _fixture_dir
+    _fixture_dir = Path(directory)
+    _report_cache.clear()
+
+
+def get_fixture_dir() -> Path:
+    """Get the directory the extracts are served from."""
+    return _fixture_dir
+
+
+def report_path(report: str, directory: Optional[Path] = None) -> Path:
+    """Get the extract file for a report."""
+    return Path(directory or _fixture_dir) / f"{report}.csv"
+
+
+def available_reports(directory: Optional[Path] = None) -> List[str]:
+    """Get the names of the reports with an extract in the directory."""
+    return sorted(path.stem for path in Path(directory or _fixture_dir).glob("*.csv"))
+
+
+def _convert(column: str, value: str) -> Any:
+    """Convert a stripped extract value to the type the report returns."""
+    if column in _INT_COLUMNS and value.isdigit():
+        return int(value)
+    return value
+
+
+def load_report(
+    report: str,
+    directory: Optional[Path] = None,
+    cache: bool = True
+) -> Tuple[Any, ...]:
+    """
+    Load the rows of a report extract.
+
+    Args:
+        report: Report name (the extract file name without .csv)
+        directory: Directory containing the extracts (default: the fixture
+            directory)
+        cache: Keep the rows for later calls (disable for one-off reads
+            of large extracts)
+
+    Returns:
+        Tuple of namedtuple rows with the extract's columns
+
+    Raises:
+        FileNotFoundError: If there is no extract for the report
+    """
+    path = report_path(report, directory)
+    cache_key = str(path)
+    if cache_key in _report_cache:
+        return _report_cache[cache_key]
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader)]
+        row_type = namedtuple(report.replace("-", "_"), header)
+        rows = tuple(
+            row_type(*(
+                _convert(column, value.strip())
+                for column, value in zip(header, line)
+            ))
+            for line in reader
+            if len(line) == len(header)
+        )
+
+    if cache:
+        _report_cache[cache_key] = rows
+    return rows
+
+
+def get_cached_data(report: str, max_age: Optional[int] = None) -> Tuple[Any, ...]:
+    """
+    Stand-in for assetclasses.corporate_data.get_cached_data.
+
+    Reports without an extract return no rows, as an empty cache does.
+
+    Args:
+        report: Report name
+        max_age: Ignored (the extracts are static)
+
+    Returns:
+        Tuple of namedtuple rows
+    """
+    try:
+        return load_report(report)
+    except FileNotFoundError:
+        return ()
+
+
+def get_json_data(
+    report: str, params: Dict[str, str], timeout: int = 120
+) -> List[Dict[str, Any]]:
+    """
+    Stand-in for netdashread.get_json_data.
+
+    Args:
+        report: Report name
+        params: Query parameters; setting_id filters by relaysettingid
+        timeout: Ignored
+
+    Returns:
+        List of row dictionaries
+    """
+    setting_id = params.get("setting_id")
+    return [
+        row._asdict()
+        for row in get_cached_data(report)
+        if setting_id is None or row.relaysettingid == setting_id
+    ]
+
+
+def install_fixture_modules() -> None:
+    """
+    Register the extract stand-ins as the IPS host modules.
+
+    This must run before ips_data.query_database is imported. tenacity is
+    not replaced and must be installed.
+    """
+    netdashread = types.ModuleType("netdashread")
+    netdashread.get_json_data = get_json_data
+
+    assetclasses = types.ModuleType("assetclasses")
+    corporate_data = types.ModuleType("assetclasses.corporate_data")
+    corporate_data.get_cached_data = get_cached_data
+    assetclasses.corporate_data = corporate_data
+
+    sys.modules.update({
+        "netdashread": netdashread,
+        "assetclasses": assetclasses,
+        "assetclasses.corporate_data": corporate_data,
+    })
@@ -0,0 +1,464 @@
+"""
+Benchmarks for the ips_data matching layer against the queries/ extracts.
+
+Each case times one stage of matching PowerFactory devices to IPS records,
+using the extracts served by benchmarks.ips_fixtures:
+
+- create_setting_index: building the Energex and Ergon setting indexes
+- get_by_switch_name: Energex switch lookups, with and without the
+  substation code
+- get_by_asset_contains: Ergon lookups of the fuse, recloser and relay CB
+  plant numbers (including the substring fallback for misses)
+- it_association: filtering the Energex instrument transformer report and
+  assigning CT/VT attributes to each device
+- cb_alt_name: resolving switch names through the CB alternate names
+
+Cases are timed repeat times without tracing, then once more under
+tracemalloc for the peak memory. Each case also records how many matches
+it found, so a change in matching behaviour shows up in the comparison.
+
+--fixtures runs the suite against another directory of extracts, such as
+the scaled copies written by benchmarks.ips_scaler.
+
+Results are written as JSON and compared against a stored baseline run
+with the same fixtures and lookup count. A case regresses when it is slower than the
+baseline by more than the tolerance. The exit status is 1 if any case regressed or
+changed its matches.
+
+tenacity must be installed, as it is on PowerFactory hosts. The mapping
+directory is redirected (see benchmarks.headless), so this should run in
+its own process.
+
+Usage:
+    python -m benchmarks.ips_matching
+    python -m benchmarks.ips_matching --lookups 5000 --output results.json
+    python -m benchmarks.ips_matching --save-baseline
+"""
+
+import argparse
+import csv
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.headless import DEFAULT_WORKDIR, set_path_overrides
+from benchmarks.ips_fixtures import (
+    QUERIES_DIR,
+    get_cached_data,
+    install_fixture_modules,
+    set_fixture_dir,
+)
+
+SUITE = "ips_matching"
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / f"{SUITE}.json"
+
+DEFAULT_TOLERANCE = 0.5
+
+# Slowdowns below this are timer noise, whatever the ratio
+MIN_DELTA_SECONDS = 0.002
+
+SETTING_ID_REPORTS = {
+    "Energex": "Report-Cache-ProtectionSettingIDs-EX",
+    "Ergon": "Report-Cache-ProtectionSettingIDs-EE",
+}
+
+# Ergon device lists whose plant numbers are looked up by asset name
+DEVICE_LIST_REPORTS = ["List-Fuses", "List-Reclosers", "List-RelayCBs"]
+
+# Every nth Energex switch gets a CB alternate name
+ALT_NAME_STRIDE = 10
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def measure(
+    name: str,
+    func: Callable[[], int],
+    ops: int,
+    repeat: int
+) -> Dict[str, Any]:
+    """
+    Time a benchmark case and measure its peak memory.
+
+    Args:
+        name: Case name
+        func: Runs the case once and returns its match count
+        ops: Number of operations in one run
+        repeat: Number of timed runs
+
+    Returns:
+        Dictionary of the case's timings, peak memory and matches
+    """
+    timings = []
+    matches = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        "name": name,
+        "ops": ops,
+        "matches": matches,
+        "seconds": round(seconds, 6),
+        "median_seconds": round(statistics.median(timings), 6),
+        "per_op_us": round(seconds / ops * 1e6, 3) if ops else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _sample(items: Sequence[Any], count: int) -> List[Any]:
+    """Take count items spread evenly through a sequence."""
+    if count >= len(items):
+        return list(items)
+    step = len(items) / count
+    return [items[int(i * step)] for i in range(count)]
+
+
+def _fixtures_label(fixtures: Path) -> str:
+    """Get the name results record for a fixture directory."""
+    if Path(fixtures).resolve() == QUERIES_DIR.resolve():
+        return "queries"
+    return str(fixtures)
+
+
+def _ids_dict_list(region: str) -> List[Dict[str, Any]]:
+    """Convert the setting ID report rows as query_database does."""
+    return [dict(row._asdict()) for row in get_cached_data(SETTING_ID_REPORTS[region])]
+
+
+def _substation_code(locationpathenu: str) -> Optional[str]:
+    """Get the substation part of an Energex location path."""
+    parts = locationpathenu.split("/")
+    return parts[2] if len(parts) > 2 else None
+
+
+def write_cb_alt_names(mapping_dir: Path) -> int:
+    """
+    Write a CB alternate name file for the Energex extract.
+
+    Every ALT_NAME_STRIDE-th switch is mapped from a "PF" prefixed name to
+    its IPS name.
+
+    Args:
+        mapping_dir: Mapping files directory
+
+    Returns:
+        Number of alternate names written
+    """
+    alt_dir = Path(mapping_dir) / "cb_alt_names"
+    alt_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = get_cached_data(SETTING_ID_REPORTS["Energex"])[::ALT_NAME_STRIDE]
+    with open(alt_dir / "CB_ALT_NAME.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["PROJECT", "GRID", "SUBSTATION", "CB_NAME", "NEW_NAME"])
+        for row in rows:
+            substation = _substation_code(row.locationpathenu)
+            writer.writerow([
+                "Fixtures", substation, substation, f"PF{row.nameenu}", row.nameenu,
+            ])
+    return len(rows)
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+def run_cases(lookups: int, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every benchmark case.
+
+    The fixture modules and mapping directory must already be in place.
+
+    Args:
+        lookups: Number of lookups (or devices) per lookup case
+        repeat: Number of timed runs per case
+
+    Returns:
+        Dictionary mapping case name to its measurements
+    """
+    from core import ProtectionDevice
+    from ips_data import cb_mapping
+    from ips_data import ex_settings as ex
+    from ips_data import query_database as qd
+    from ips_data.setting_index import create_setting_index
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def add(result: Dict[str, Any]) -> None:
+        results[result["name"]] = result
+
+    # Index construction
+    indexes = {}
+    for region in ("Energex", "Ergon"):
+        ids_dict_list = _ids_dict_list(region)
+        add(measure(
+            f"create_setting_index/{region}",
+            lambda rows=ids_dict_list, region=region: len(
+                create_setting_index(rows, region)
+            ),
+            len(ids_dict_list),
+            repeat,
+        ))
+        indexes[region] = create_setting_index(ids_dict_list, region)
+
+    # Energex switch lookups
+    seq_records = _sample(indexes["Energex"].records, lookups)
+    switch_queries: List[Tuple[str, Optional[str]]] = []
+    for record in seq_records:
+        switch_name = record.nameenu.split("_")[0]
+        switch_queries.append((switch_name, None))
+        switch_queries.append(
+            (switch_name, _substation_code(record.locationpathenu or ""))
+        )
+
+    def switch_lookups() -> int:
+        index = indexes["Energex"]
+        return sum(
+            len(index.get_by_switch_name(name, sub)) for name, sub in switch_queries
+        )
+
+    add(measure(
+        "get_by_switch_name/Energex", switch_lookups, len(switch_queries), repeat
+    ))
+
+    # Ergon asset name lookups
+    plant_numbers = [
+        row.plant_no
+        for report in DEVICE_LIST_REPORTS
+        for row in get_cached_data(report)
+        if row.plant_no
+    ]
+    asset_queries = _sample(plant_numbers, lookups)
+
+    def asset_lookups() -> int:
+        index = indexes["Ergon"]
+        return sum(len(index.get_by_asset_contains(name)) for name in asset_queries)
+
+    add(measure(
+        "get_by_asset_contains/Ergon", asset_lookups, len(asset_queries), repeat
+    ))
+
+    # Energex instrument transformer association
+    set_ids = [record.relaysettingid for record in seq_records]
+
+    def it_association() -> int:
+        it_settings = qd.seq_get_ips_it_details(None, set_ids)
+        associated = 0
+        for record in seq_records:
+            device = ProtectionDevice(
+                None, record.patternname, record.nameenu, record.relaysettingid,
+                record.datesetting, None, record.deviceid,
+            )
+            device.seq_instrument_attributes(it_settings)
+            if hasattr(device, "ct_settingid"):
+                associated += 1
+        return associated
+
+    add(measure("it_association/Energex", it_association, len(seq_records), repeat))
+
+    # CB alternate name resolution
+    cb_mapping.clear_cache()
+    cb_alt_name_list = cb_mapping.get_cb_alt_name_list()
+    switches = []
+    for record in seq_records:
+        substation = types.SimpleNamespace(
+            loc_name=_substation_code(record.locationpathenu or "")
+        )
+        switches.append(types.SimpleNamespace(
+            loc_name=f"PF{record.nameenu}",
+            fold_id=substation,
+            GetClassName=lambda: "ElmCoup",
+        ))
+
+    def alt_name_resolution() -> int:
+        return sum(
+            not ex._get_switch_info(switch, cb_alt_name_list)[0].startswith("PF")
+            for switch in switches
+        )
+
+    add(measure("cb_alt_name/Energex", alt_name_resolution, len(switches), repeat))
+
+    return results
+
+
+def run_suite(
+    lookups: int = 2000,
+    repeat: int = 5,
+    workdir: Path = DEFAULT_WORKDIR,
+    fixtures: Path = QUERIES_DIR
+) -> Dict[str, Any]:
+    """
+    Set up the fixtures and run the suite.
+
+    Args:
+        lookups: Number of lookups (or devices) per lookup case
+        repeat: Number of timed runs per case
+        workdir: Directory for the generated mapping files
+        fixtures: Directory of report extracts (e.g. written by
+            benchmarks.ips_scaler)
+
+    Returns:
+        Suite results with the run parameters and case measurements
+    """
+    set_fixture_dir(fixtures)
+    run_dir = Path(workdir) / SUITE
+    mapping_dir = run_dir / "mapping_files"
+    set_path_overrides(mapping_dir, run_dir / "output")
+    alt_names = write_cb_alt_names(mapping_dir)
+    install_fixture_modules()
+
+    return {
+        "suite": SUITE,
+        "python": platform.python_version(),
+        "fixtures": _fixtures_label(fixtures),
+        "lookups": lookups,
+        "repeat": repeat,
+        "cb_alt_names": alt_names,
+        "cases": run_cases(lookups, repeat),
+    }
+
+
+# =============================================================================
+# Baseline Comparison
+# =============================================================================
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare suite results against a baseline.
+
+    Cases are only compared when both runs used the same fixtures and did
+    the same number of operations, since some cases (e.g. it_association)
+    do not scale linearly with the lookup count. Slowdowns smaller than
+    MIN_DELTA_SECONDS are treated as noise.
+
+    Args:
+        results: Results of this run
+        baseline: Stored baseline results
+        tolerance: Allowed fractional slowdown before a case regresses
+
+    Returns:
+        Dictionary mapping case name to its ratio and status: "ok",
+        "improved", "regressed", "changed" (different matches), "new" or
+        "skipped" (different fixtures or operation count)
+    """
+    same_fixtures = results["fixtures"] == baseline.get("fixtures", "queries")
+    comparison = {}
+    for name, case in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            comparison[name] = {"ratio": None, "status": "new"}
+            continue
+        if not same_fixtures or case["ops"] != base["ops"]:
+            comparison[name] = {"ratio": None, "status": "skipped"}
+            continue
+
+        ratio = case["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        delta = case["seconds"] - base["seconds"]
+        if case["matches"] != base["matches"]:
+            status = "changed"
+        elif ratio > 1 + tolerance and delta > MIN_DELTA_SECONDS:
+            status = "regressed"
+        elif ratio < 1 - tolerance and -delta > MIN_DELTA_SECONDS:
+            status = "improved"
+        else:
+            status = "ok"
+        comparison[name] = {"ratio": round(ratio, 3), "status": status}
+    return comparison
+
+
+def _print_results(
+    results: Dict[str, Any], comparison: Optional[Dict[str, Dict[str, Any]]]
+) -> None:
+    """Print a line per case."""
+    for name, case in results["cases"].items():
+        line = (
+            f"{name:<32} {case['ops']:>7} ops {case['seconds']:>9.4f}s "
+            f"{case['per_op_us']:>10.3f}us/op {case['peak_kib']:>10.1f}KiB "
+            f"{case['matches']:>7} matches"
+        )
+        if comparison:
+            entry = comparison[name]
+            if entry["ratio"] is not None:
+                line += f"  x{entry['ratio']:.2f}"
+            line += f" {entry['status']}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the ips_data matching layer against the queries/ extracts"
+        )
+    )
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR)
+    parser.add_argument(
+        "--fixtures", type=Path, default=QUERIES_DIR,
+        help="Directory of report extracts, e.g. from benchmarks.ips_scaler",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None,
+        help="Results file (default: <workdir>/ips_matching/results.json)",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="Store the results as the new baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.lookups, args.repeat, args.workdir, args.fixtures)
+
+    comparison = None
+    if not args.save_baseline and args.baseline.exists():
+        with open(args.baseline, encoding="utf-8") as f:
+            comparison = compare(results, json.load(f), args.tolerance)
+        results["comparison"] = comparison
+
+    output = args.output or Path(args.workdir) / SUITE / "results.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    _print_results(results, comparison)
+
+    if comparison and any(
+        entry["status"] in ("regressed", "changed") for entry in comparison.values()
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
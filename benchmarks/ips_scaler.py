@@ -0,0 +1,465 @@
+"""
+Scaled copies of the queries/ extracts for stress-testing the matching layer.
+
+The extracts are one snapshot of about 20-25k setting IDs per region. The
+FixtureScaler writes statistically similar extracts at a multiple of that
+size, so SettingIndex and the matching paths can be measured as the fleet
+grows.
+
+The shape of the extracts is kept by copying whole sites rather than
+generating names from scratch:
+
+- Energex rows are grouped by the substation code in locationpathenu,
+  Ergon rows and the List-* device rows by the substation code of the
+  asset name ("ALSTSS-...") or its plant number ("DO-53248")
+- Each copy of a site gets a new code of the same form (alpha codes stay
+  alpha, numeric codes like "T108" and "X100067-B" keep their letters,
+  plant numbers keep their prefix and digit count), applied to every name
+  that starts with it
+- Setting IDs are remapped per copy, and IT and relay setting rows follow
+  their setting ID
+
+This keeps the pattern name distribution, the "A+B" double cable boxes,
+the share of numeric substation codes, the IT rows per setting and the
+overlap between the device lists and the Ergon asset names. Renamed numeric
+substation codes are not in get_substation_mapping, so they behave like
+the unmapped codes in the extracts. A fractional scale copies that
+fraction of the sites in its last copy.
+
+describe() summarises these measures for a directory of extracts, so a
+scaled copy can be checked against the source.
+
+Usage:
+    python -m benchmarks.ips_scaler --scales 2 10 50
+    python -m benchmarks.ips_matching --fixtures /tmp/ips_pf_benchmarks/ips_fixtures/x10
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import math
+import re
+import string
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from benchmarks.headless import DEFAULT_WORKDIR
+from benchmarks.ips_fixtures import QUERIES_DIR, available_reports, load_report
+
+DEFAULT_OUTPUT = DEFAULT_WORKDIR / "ips_fixtures"
+
+ENERGEX_ID_REPORTS = ["Report-Cache-ProtectionSettingIDs-EX", "Protection-Setting-EX"]
+ERGON_ID_REPORTS = ["Report-Cache-ProtectionSettingIDs-EE", "Protection-Setting-EE"]
+
+# Reports keyed by relaysettingid only
+SETTING_ROW_REPORTS = [
+    "Report-Cache-ProtectionITSettings-EX",
+    "Protection-SettingIT-EX",
+    "Protection-SettingRelay-EX",
+    "Protection-SettingRelay-EE",
+]
+
+ERGON_LIST_REPORTS = [
+    "List-Fuses", "List-Reclosers", "List-RelayCBs", "List-GasSwitches",
+]
+
+# List columns holding names that start with the site code
+LIST_NAME_COLUMNS = ("plant_no", "asset_desc")
+
+_ERGON_SUBSTATION = re.compile(r"^([A-Z0-9]{4})SS-")
+_PLANT_NUMBER = re.compile(r"^[A-Z]{2}-\d+")
+_NUMBERED_CODE = re.compile(r"^(\D*)(\d+)(.*)$")
+
+
+def energex_site(row: Any) -> str:
+    """Get the substation code of an Energex setting row ("" if none)."""
+    parts = row.locationpathenu.split("/")
+    return parts[2] if len(parts) > 2 else ""
+
+
+def ergon_site(name: str) -> str:
+    """Get the substation code or plant number an Ergon name starts with."""
+    match = _ERGON_SUBSTATION.match(name)
+    if match:
+        return match.group(1)
+    match = _PLANT_NUMBER.match(name)
+    return match.group(0) if match else ""
+
+
+def _rename_prefix(value: str, site: str, new_site: str) -> str:
+    """Replace the site code at the start of a name."""
+    if site and value.startswith(site):
+        return new_site + value[len(site):]
+    return value
+
+
+# =============================================================================
+# Code Allocation
+# =============================================================================
+
+class CodeAllocator:
+    """
+    Allocates site codes that are not used by any other site.
+
+    Codes keep their form: codes with digits ("T108", "X100067-B") get a
+    new first number with the same prefix and suffix and at least as many
+    digits, anything else gets an
+    uppercase alpha code of the same length (or longer once those run out).
+    """
+
+    def __init__(self, used: Iterable[str]):
+        """
+        Initialize the allocator.
+
+        Args:
+            used: Codes already in use
+        """
+        self._used: Set[str] = set(used)
+        self._alpha: Dict[int, Iterator[Tuple[str, ...]]] = {}
+        self._numbers: Dict[Tuple[str, str, int], int] = {}
+
+    def allocate(self, code: str) -> str:
+        """
+        Allocate a new code of the same form as an existing one.
+
+        Args:
+            code: The existing code
+
+        Returns:
+            An unused code
+        """
+        match = _NUMBERED_CODE.match(code)
+        if match:
+            return self._numbered(match.group(1), match.group(3), len(match.group(2)))
+        return self._alpha_code(len(code))
+
+    def _alpha_code(self, length: int) -> str:
+        """Allocate the next unused alpha code of at least the length."""
+        while True:
+            if length not in self._alpha:
+                self._alpha[length] = itertools.product(
+                    string.ascii_uppercase, repeat=length
+                )
+            for letters in self._alpha[length]:
+                code = "".join(letters)
+                if code not in self._used:
+                    self._used.add(code)
+                    return code
+            length += 1
+
+    def _numbered(self, prefix: str, suffix: str, width: int) -> str:
+        """Allocate the next unused number around the prefix and suffix."""
+        while True:
+            key = (prefix, suffix, width)
+            number = self._numbers.get(key, 10 ** (width - 1) if width > 1 else 0)
+            while number < 10 ** width:
+                code = f"{prefix}{number}{suffix}"
+                number += 1
+                if code not in self._used:
+                    self._numbers[key] = number
+                    self._used.add(code)
+                    return code
+            self._numbers[key] = number
+            width += 1
+
+
+# =============================================================================
+# Scaling
+# =============================================================================
+
+def copy_fractions(scale: float) -> List[Tuple[int, float]]:
+    """
+    Split a scale into copies and the fraction of sites each copies.
+
+    Args:
+        scale: Size of the output relative to the source (at least 1)
+
+    Returns:
+        List of (copy number, fraction) pairs; copy 0 is the source itself
+
+    Raises:
+        ValueError: If scale is less than 1
+    """
+    if scale < 1:
+        raise ValueError(f"Scale must be at least 1, got {scale}")
+    whole = math.floor(scale)
+    fractions = [(copy, 1.0) for copy in range(whole)]
+    if scale > whole:
+        fractions.append((whole, scale - whole))
+    return fractions
+
+
+class FixtureScaler:
+    """
+    Writes scaled copies of a directory of report extracts.
+
+    Example usage:
+        >>> scaler = FixtureScaler()
+        >>> counts = scaler.write(10, Path("/tmp/fixtures/x10"))
+
+    Attributes:
+        source_dir: Directory of the source extracts
+        seed: Seed for the site selection of fractional copies and the
+            remapped setting IDs
+        reports: Source rows by report name
+    """
+
+    def __init__(self, source_dir: Path = QUERIES_DIR, seed: int = 0):
+        """
+        Load the source extracts.
+
+        Args:
+            source_dir: Directory of the source extracts
+            seed: Seed for site selection and setting IDs
+        """
+        self.source_dir = Path(source_dir)
+        self.seed = seed
+        self.reports = {
+            name: load_report(name, self.source_dir)
+            for name in available_reports(self.source_dir)
+        }
+        self._setting_sites = self._index_setting_sites()
+        self._allocator = CodeAllocator(self._source_sites())
+        self._renamed: Dict[Tuple[int, str, str], str] = {}
+
+    def _index_setting_sites(self) -> Dict[str, Tuple[str, str]]:
+        """Map each setting ID to its region and site."""
+        sites = {}
+        for name in ENERGEX_ID_REPORTS:
+            for row in self.reports.get(name, ()):
+                sites[row.relaysettingid] = ("Energex", energex_site(row))
+        for name in ERGON_ID_REPORTS:
+            for row in self.reports.get(name, ()):
+                sites[row.relaysettingid] = ("Ergon", ergon_site(row.assetname))
+        return sites
+
+    def _source_sites(self) -> Set[str]:
+        """Get every site code in the source extracts."""
+        codes = {site for _, site in self._setting_sites.values()}
+        for name in ERGON_LIST_REPORTS:
+            codes.update(ergon_site(row.plant_no) for row in self.reports.get(name, ()))
+        return codes
+
+    def _site_code(self, copy: int, region: str, site: str) -> str:
+        """Get a site's code in a copy."""
+        if copy == 0 or not site:
+            return site
+        key = (copy, region, site)
+        if key not in self._renamed:
+            self._renamed[key] = self._allocator.allocate(site)
+        return self._renamed[key]
+
+    def _included(self, copy: int, region: str, site: str, fraction: float) -> bool:
+        """Check whether a site is in a (possibly partial) copy."""
+        if fraction >= 1:
+            return True
+        digest = hashlib.md5(f"{self.seed}:{copy}:{region}:{site}".encode()).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64 < fraction
+
+    def _setting_id(self, setting_id: str, copy: int) -> str:
+        """Get a setting ID's counterpart in a copy."""
+        if copy == 0:
+            return setting_id
+        digest = hashlib.md5(f"{self.seed}:{copy}:{setting_id}".encode()).digest()
+        return str(uuid.UUID(bytes=digest, version=4)).upper()
+
+    def _copy_row(
+        self, report: str, row: Any, copy: int, fraction: float
+    ) -> Optional[Any]:
+        """
+        Copy a source row into a copy.
+
+        Returns:
+            The renamed row, or None if its site is not in the copy
+        """
+        if report in ENERGEX_ID_REPORTS:
+            site = energex_site(row)
+            if not self._included(copy, "Energex", site, fraction):
+                return None
+            new_site = self._site_code(copy, "Energex", site)
+            nameenu = _rename_prefix(row.nameenu, site, new_site)
+            parts = row.locationpathenu.split("/")
+            if len(parts) > 2:
+                parts[2] = new_site
+            parts = [nameenu if part == row.nameenu else part for part in parts]
+            return row._replace(
+                nameenu=nameenu,
+                locationpathenu="/".join(parts),
+                relaysettingid=self._setting_id(row.relaysettingid, copy),
+            )
+
+        if report in ERGON_ID_REPORTS:
+            site = ergon_site(row.assetname)
+            if not self._included(copy, "Ergon", site, fraction):
+                return None
+            return row._replace(
+                assetname=_rename_prefix(
+                    row.assetname, site, self._site_code(copy, "Ergon", site)
+                ),
+                relaysettingid=self._setting_id(row.relaysettingid, copy),
+            )
+
+        if report in ERGON_LIST_REPORTS:
+            site = ergon_site(row.plant_no)
+            if not self._included(copy, "Ergon", site, fraction):
+                return None
+            new_site = self._site_code(copy, "Ergon", site)
+            return row._replace(**{
+                column: _rename_prefix(getattr(row, column), site, new_site)
+                for column in LIST_NAME_COLUMNS
+                if column in row._fields
+            })
+
+        if report in SETTING_ROW_REPORTS:
+            owner = self._setting_sites.get(row.relaysettingid)
+            if owner is None:
+                # Rows without a setting ID record are only in the source
+                return row if copy == 0 else None
+            if not self._included(copy, *owner, fraction):
+                return None
+            return row._replace(
+                relaysettingid=self._setting_id(row.relaysettingid, copy)
+            )
+
+        # Other extracts are not scaled
+        return row if copy == 0 else None
+
+    def write(self, scale: float, output_dir: Path) -> Dict[str, int]:
+        """
+        Write every extract at a scale.
+
+        Args:
+            scale: Size relative to the source (at least 1)
+            output_dir: Directory for the scaled extracts
+
+        Returns:
+            Dictionary mapping report name to rows written
+
+        Raises:
+            ValueError: If scale is less than 1
+        """
+        fractions = copy_fractions(scale)
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        counts = {}
+        for report, rows in self.reports.items():
+            written = 0
+            with open(
+                output_dir / f"{report}.csv", "w", newline="", encoding="utf-8"
+            ) as f:
+                writer = csv.writer(f)
+                if rows:
+                    writer.writerow(rows[0]._fields)
+                for copy, fraction in fractions:
+                    for row in rows:
+                        new_row = self._copy_row(report, row, copy, fraction)
+                        if new_row is not None:
+                            writer.writerow(new_row)
+                            written += 1
+            counts[report] = written
+        return counts
+
+
+# =============================================================================
+# Shape Summary
+# =============================================================================
+
+def describe(directory: Path = QUERIES_DIR) -> Dict[str, Any]:
+    """
+    Summarise the shape of a directory of extracts.
+
+    Args:
+        directory: Directory of report extracts
+
+    Returns:
+        Dictionary of row counts, site counts and distribution measures
+    """
+    energex = load_report(ENERGEX_ID_REPORTS[0], directory, cache=False)
+    ergon = load_report(ERGON_ID_REPORTS[0], directory, cache=False)
+    it_rows = load_report(SETTING_ROW_REPORTS[0], directory, cache=False)
+
+    energex_sites = Counter(energex_site(row) for row in energex)
+    energex_patterns = Counter(row.patternname for row in energex)
+    ergon_sites = Counter(ergon_site(row.assetname) for row in ergon)
+    ergon_patterns = Counter(row.patternname for row in ergon)
+    it_settings = {row.relaysettingid for row in it_rows}
+
+    def share(count: int, total: int) -> float:
+        return round(count / total, 4) if total else 0.0
+
+    return {
+        "energex_settings": len(energex),
+        "energex_substations": len(energex_sites),
+        "energex_double_cable_boxes": share(
+            sum("+" in row.nameenu for row in energex), len(energex)
+        ),
+        "energex_numeric_substations": share(
+            sum(
+                count
+                for site, count in energex_sites.items()
+                if site and not site.isalpha()
+            ),
+            len(energex),
+        ),
+        "energex_patterns": len(energex_patterns),
+        "energex_top_pattern_share": share(
+            energex_patterns.most_common(1)[0][1] if energex_patterns else 0,
+            len(energex),
+        ),
+        "it_rows_per_setting": (
+            round(len(it_rows) / len(it_settings), 3) if it_settings else 0.0
+        ),
+        "ergon_settings": len(ergon),
+        "ergon_sites": len(ergon_sites),
+        "ergon_substation_assets": share(
+            sum(bool(_ERGON_SUBSTATION.match(row.assetname)) for row in ergon),
+            len(ergon),
+        ),
+        "ergon_patterns": len(ergon_patterns),
+        "ergon_top_pattern_share": share(
+            ergon_patterns.most_common(1)[0][1] if ergon_patterns else 0, len(ergon)
+        ),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[float, Dict[str, Any]]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Write scaled copies of the queries/ extracts"
+    )
+    parser.add_argument(
+        "--scales", type=float, nargs="+", default=[2, 10, 50],
+        help="Sizes relative to the source extracts (at least 1)",
+    )
+    parser.add_argument("--source", type=Path, default=QUERIES_DIR)
+    parser.add_argument(
+        "--output", type=Path, default=DEFAULT_OUTPUT,
+        help="Each scale is written to <output>/x<scale>",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    scaler = FixtureScaler(args.source, args.seed)
+    shapes = {1.0: describe(args.source)}
+    for scale in args.scales:
+        output_dir = args.output / f"x{scale:g}"
+        scaler.write(scale, output_dir)
+        shapes[scale] = describe(output_dir)
+        print(f"Wrote x{scale:g} to {output_dir}")
+
+    columns = sorted(shapes)
+    print(f"{'':<30}" + "".join(f"{f'x{scale:g}':>12}" for scale in columns))
+    for measure in shapes[1.0]:
+        print(
+            f"{measure:<30}"
+            + "".join(f"{shapes[scale][measure]:>12}" for scale in columns)
+        )
+    return shapes
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,643 @@
+"""
+Synthetic SEQ and Ergon networks for offline benchmarking.
+
+build_network() creates a FakeApplication holding a project with `scale`
+substations (about 10 protection devices each), the matching IPS report
+data and the library types the mapping files refer to. With projects=N
+it holds N such projects with different substations, all served by the
+same IPS report data, as the regional models of one network are. The generated
+networks exercise the same paths as production models:
+
+Energex (SEQ):
+    - Feeder CBs (ElmCoup) in substations, matched to IPS by switch name
+    - Bays with two relays (J01/J02), a double cable box ("A+B") record
+      and a CB with no IPS record (failed CB)
+    - Overcurrent and directional patterns, with dip switch logic and
+      CT/VT ratios from the IT settings report
+    - Some relays already exist and are typed
+
+Ergon:
+    - Feeder relays ({SUB}SS-F01) in substation cubicles
+    - Reclosers (RC-nnnnn) on line terminals, some SWER (single phase),
+      with reclosing logic
+    - Line fuses and transformer fuses (fuse size from the transformer)
+    - Devices with no IPS record, an unmapped pattern, a non-protection
+      device and a duplicate ("(1)") device
+
+write_mapping_files() writes the type mapping, relay maps, curve mapping
+and CB alternate name files the generated patterns use.
+
+Usage:
+    from benchmarks.synthetic_network import build_network, write_mapping_files
+
+    write_mapping_files(workdir / "mapping_files")
+    network = build_network("Ergon", scale=100)
+    network.app.GetActiveProject()
+"""
+
+import csv
+import random
+from collections import namedtuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.fake_pf import FakeApplication, FakeDataObject
+
+# =============================================================================
+# Report Names
+# =============================================================================
+
+SETTING_IDS_REPORTS = {
+    "Energex": "Report-Cache-ProtectionSettingIDs-EX",
+    "Ergon": "Report-Cache-ProtectionSettingIDs-EE",
+}
+
+IT_SETTINGS_REPORTS = {
+    "Energex": "Report-Cache-ProtectionITSettings-EX",
+    "Ergon": "Report-Cache-ProtectionITSettings-EE",
+}
+
+SETTING_RELAY_REPORTS = {
+    "Energex": "Protection-SettingRelay-EX",
+    "Ergon": "Protection-SettingRelay-EE",
+}
+
+# Report rows, with the columns of the corporate data cache reports
+SeqSettingId = namedtuple(
+    "SeqSettingId",
+    "patternname nameenu relaysettingid datesetting deviceid assetname locationpathenu",
+)
+RegSettingId = namedtuple(
+    "RegSettingId",
+    "descriptionenu assetname patternname relayversion active sri relaysettingid "
+    "datesetting",
+)
+SeqItSetting = namedtuple("SeqItSetting", "relaysettingid nameenu actualvalue")
+RegItSetting = namedtuple("RegItSetting", "relaysettingid nameenu setting")
+
+# =============================================================================
+# Patterns and Mapping Files
+# =============================================================================
+
+OC_RELAY_TYPE = "Synthetic OC Relay"
+DIR_RELAY_TYPE = "Synthetic DIR Relay"
+RECLOSER_TYPE = "Synthetic Recloser"
+
+# Pattern -> (mapping file, relay type)
+TYPE_MAPPING: Dict[str, Tuple[str, str]] = {
+    "SYN-OC_Energex": ("syn_oc", OC_RELAY_TYPE),
+    "SYN-DIR_Energex": ("syn_dir", DIR_RELAY_TYPE),
+    "SYN-OC": ("syn_oc", OC_RELAY_TYPE),
+    "SYN-RC": ("syn_recloser", RECLOSER_TYPE),
+    "swer_SYN-RC": ("syn_recloser", RECLOSER_TYPE),
+}
+
+# Pattern with no type mapping (devices are put out of service)
+UNMAPPED_PATTERN = "SYN-LEGACY"
+
+# Ergon line fuse pattern
+FUSE_PATTERN = "SYN-FUSE"
+
+MAPPING_HEADER = [
+    "FOLDER", "ELEMENT", "ATTRIBUTE", "BLOCK", "PARAM", "SETTING", "ADJUSTMENT",
+]
+
+_OC_ROWS = [
+    ["Relay Model", "I>", "Ipset", "Phase OC", "I> Pickup", "use_setting", "primary"],
+    ["Relay Model", "I>", "Tpset", "Phase OC", "I> TMS", "use_setting", "None"],
+    ["Relay Model", "I>", "pcharac", "Phase OC", "I> Curve", "use_setting", "None"],
+    ["Relay Model", "I>>", "Ipset", "Phase OC", "I>> Pickup", "use_setting", "primary"],
+    ["Relay Model", "I>>", "Tset", "Phase OC", "I>> Delay", "use_setting", "None"],
+    ["Relay Model", "IE>", "Ipset", "Earth OC", "IE> Pickup", "use_setting", "primary"],
+    ["Relay Model", "IE>", "Tpset", "Earth OC", "IE> TMS", "use_setting", "None"],
+    ["Relay Model", "IE>", "pcharac", "Earth OC", "IE> Curve", "use_setting", "None"],
+    ["Relay Model", "Measurement", "Unom", "None", "", "", ""],
+]
+
+_DIP_ROWS = [
+    [
+        "Relay Model", "Logic_dip", "Dir", "Directional", "Direction",
+        "use_setting", "None", "Forward",
+    ],
+    [
+        "Relay Model", "Logic_dip", "Block", "Directional", "Block Mode",
+        "use_setting", "None", "Enabled",
+    ],
+    [
+        "Relay Model", "Logic_dip", "Reverse", "Directional", "Direction",
+        "use_setting", "None", "Reverse",
+    ],
+]
+
+_RECLOSE_ROWS = [
+    ["Relay Model", "Recloser_logic", "I>", "Reclose", "Trips to Lockout",
+     "use_setting", "None", "ALL", "off", "Y"],
+    ["Relay Model", "Recloser_logic", "IE>", "Reclose", "Trips to Lockout",
+     "use_setting", "None", "ALL", "off", "Y"],
+    ["Relay Model", "Recloser_logic", "I>>", "Reclose", "I>> Lockout",
+     "use_setting", "None", "1", "off", "N"],
+]
+
+RELAY_MAPS: Dict[str, List[List[str]]] = {
+    "syn_oc": _OC_ROWS,
+    "syn_dir": _OC_ROWS + _DIP_ROWS,
+    "syn_recloser": _OC_ROWS + _RECLOSE_ROWS,
+}
+
+# [ips_curve_name, code, pf_curve_name]
+CURVE_MAPPING = [
+    ["IEC Standard Inverse", "SI", "IEC Standard Inverse"],
+    ["IEC Very Inverse", "VI", "IEC Very Inverse"],
+    ["IEC Extremely Inverse", "EI", "IEC Extremely Inverse"],
+    ["Definite Time", "DT", "Definite Time"],
+]
+
+CURVES = [
+    "IEC Standard Inverse", "IEC Very Inverse", "IEC Extremely Inverse",
+    "Definite Time",
+]
+
+# IPS curve settings: full names and codes resolved through the curve mapping
+_CURVE_SETTINGS = ["IEC Standard Inverse", "IEC Very Inverse", "SI", "VI", "EI"]
+
+# Fuse types (TypFuse names end with the curve letter)
+FUSE_RATINGS_K = ["3/10", "6", "10", "16", "25", "40", "65", "100"]
+FUSE_RATINGS_T = ["10", "25", "40", "65"]
+
+CT_RATIOS = [200, 300, 400, 600, 800]
+
+
+def write_mapping_files(directory: Path) -> None:
+    """
+    Write the mapping files used by the synthetic patterns.
+
+    Args:
+        directory: Mapping files base directory (IPS_PF_MAPPING_DIR)
+    """
+    directory = Path(directory)
+    for sub_dir in ("cb_alt_names", "curve_mapping", "relay_maps", "type_mapping"):
+        (directory / sub_dir).mkdir(parents=True, exist_ok=True)
+
+    with open(directory / "type_mapping" / "type_mapping.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        for pattern, (mapping_file, relay_type) in TYPE_MAPPING.items():
+            writer.writerow([pattern, mapping_file, relay_type])
+
+    for mapping_file, rows in RELAY_MAPS.items():
+        with open(
+            directory / "relay_maps" / f"{mapping_file}.csv", "w", newline=""
+        ) as f:
+            writer = csv.writer(f)
+            writer.writerow(MAPPING_HEADER)
+            writer.writerows(rows)
+
+    with open(directory / "curve_mapping" / "curve_mapping.csv", "w", newline="") as f:
+        csv.writer(f).writerows(CURVE_MAPPING)
+
+    with open(directory / "cb_alt_names" / "CB_ALT_NAME.csv", "w", newline="") as f:
+        csv.writer(f).writerow(["PROJECT", "GRID", "SUBSTATION", "CB_NAME", "NEW_NAME"])
+
+
+# =============================================================================
+# Synthetic Network
+# =============================================================================
+
+@dataclass
+class SyntheticNetwork:
+    """
+    A generated network and the IPS data that matches it.
+
+    Attributes:
+        region: "Energex" or "Ergon"
+        scale: Number of substations per project
+        app: FakeApplication with the project activated
+        setting_ids: Setting ID report rows
+        it_settings: Instrument transformer report rows
+        relay_settings: Setting rows per relay setting ID
+        device_count: Number of protection devices the run should process
+    """
+
+    region: str
+    scale: int
+    app: FakeApplication
+    setting_ids: List[Any] = field(default_factory=list)
+    it_settings: List[Any] = field(default_factory=list)
+    relay_settings: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    device_count: int = 0
+
+    def get_cached_data(self, report: str, max_age: int = 3) -> List[Any]:
+        """Stand-in for assetclasses.corporate_data.get_cached_data."""
+        if report == SETTING_IDS_REPORTS[self.region]:
+            return list(self.setting_ids)
+        if report == IT_SETTINGS_REPORTS[self.region]:
+            return list(self.it_settings)
+        return []
+
+    def get_json_data(
+        self,
+        report: str,
+        params: Optional[Dict[str, str]] = None,
+        timeout: int = 0
+    ) -> List[Dict[str, str]]:
+        """Stand-in for netdashread.get_json_data."""
+        if report != SETTING_RELAY_REPORTS[self.region] or not params:
+            return []
+        set_id = params.get("setting_id", "")
+        return [dict(row) for row in self.relay_settings.get(set_id, [])]
+
+
+class _Builder:
+    """Shared state while generating a network."""
+
+    def __init__(self, region: str, scale: int, seed: int):
+        self.rng = random.Random(seed)
+        self.app = FakeApplication()
+        self.network = SyntheticNetwork(region, scale, self.app)
+        self.relay_types: Dict[str, FakeDataObject] = {}
+        self._next_id = 0
+
+        self._build_library()
+
+    # -------------------------------------------------------------------------
+    # Library
+    # -------------------------------------------------------------------------
+
+    def _build_library(self) -> None:
+        """Create the global library with relay, recloser and fuse types."""
+        database = self.app.database
+        library = FakeDataObject("IntFolder", "ErgonLibrary", database)
+        self.app.set_global_library(library)
+
+        protection = FakeDataObject("IntFolder", "Protection", library)
+        relays = FakeDataObject("IntFolder", "Relays", protection)
+        reclosers = FakeDataObject("IntFolder", "Reclosers", protection)
+        fuses = FakeDataObject("IntFolder", "Fuses", protection)
+        elements = FakeDataObject("IntFolder", "Elements", protection)
+
+        toc = FakeDataObject("TypToc", "Synthetic TOC", elements)
+        toc.pcharac = [FakeDataObject("TypChatoc", name, toc) for name in CURVES]
+        ioc = FakeDataObject("TypIoc", "Synthetic IOC", elements)
+        measure = FakeDataObject("TypMeasure", "Synthetic Measurement", elements)
+        logic = FakeDataObject(
+            "TypLogdip", "Synthetic Direction Logic", elements,
+            sInput=["Dir,Block,Reverse"],
+        )
+        recl = FakeDataObject(
+            "TypRecl", "Synthetic Reclosing", elements, blockid=["I>", "I>>", "IE>"]
+        )
+
+        base_slots = [
+            ("I>", "RelToc*", toc),
+            ("I>>", "RelIoc*", ioc),
+            ("IE>", "RelToc*", toc),
+            ("Measurement", "RelMeasure*", measure),
+            ("Ct-3P", "StaCt*", None),
+            ("Vt-3P", "StaVt*", None),
+        ]
+        self._relay_type(relays, OC_RELAY_TYPE, base_slots)
+        self._relay_type(
+            relays, DIR_RELAY_TYPE, base_slots + [("Logic", "RelLogdip*", logic)]
+        )
+        self._relay_type(
+            reclosers, RECLOSER_TYPE, base_slots + [("Recloser", "RelRecl*", recl)]
+        )
+
+        for rating in FUSE_RATINGS_K:
+            FakeDataObject("TypFuse", f"Fuse {rating}A K", fuses)
+        for rating in FUSE_RATINGS_T:
+            FakeDataObject("TypFuse", f"Fuse {rating}A T", fuses)
+
+    def _relay_type(
+        self,
+        folder: FakeDataObject,
+        name: str,
+        slots: List[Tuple[str, str, Optional[FakeDataObject]]]
+    ) -> None:
+        """Create a relay type with its slot definitions."""
+        relay_type = FakeDataObject("TypRelay", name, folder)
+        relay_type.pblk = [
+            FakeDataObject(
+                "BlkSlot", slot_name, relay_type, filtmod=filtmod, typ_id=typ
+            )
+            for slot_name, filtmod, typ in slots
+        ]
+        self.relay_types[name] = relay_type
+
+    # -------------------------------------------------------------------------
+    # Project
+    # -------------------------------------------------------------------------
+
+    def add_project(self, name: str) -> FakeDataObject:
+        """
+        Create a project with its folders and grid.
+
+        Substations built afterwards go into this project's grid.
+
+        Args:
+            name: Project name
+
+        Returns:
+            The IntPrj object
+        """
+        region = self.network.region
+        user = self.app.GetCurrentUser() or self.app.create_user("benchmark")
+        folder_name = "SEQ Models" if region == "Energex" else "Ergon Models"
+        models = user.GetContents(f"{folder_name}.IntFolder")
+        models = models[0] if models else FakeDataObject("IntFolder", folder_name, user)
+        project = FakeDataObject("IntPrj", name, models)
+
+        netmod = FakeDataObject(
+            "IntPrjfolder", "Network Model", project, iopt_typ="netmod"
+        )
+        netdat = FakeDataObject(
+            "IntPrjfolder", "Network Data", netmod, iopt_typ="netdat"
+        )
+        library = FakeDataObject("IntPrjfolder", "Library", project, iopt_typ="lib")
+        self.equipment = FakeDataObject(
+            "IntPrjfolder", "Equipment Type Library", library, iopt_typ="equip"
+        )
+        self.grid = FakeDataObject("ElmNet", f"Synthetic {region} Grid", netdat)
+        self.tx_type = FakeDataObject(
+            "TypTr2", "11/0.433kV 100kVA", self.equipment,
+            nt2ph=3, utrn_h=11.0, strn=0.1,
+        )
+        return project
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def setting_id(self) -> str:
+        """Get the next relay setting ID."""
+        self._next_id += 1
+        prefix = "EX" if self.network.region == "Energex" else "EE"
+        return f"{prefix}{self._next_id:07d}"
+
+    def cubicle(
+        self, terminal: FakeDataObject, name: str, **attributes: Any
+    ) -> FakeDataObject:
+        """Create a cubicle in a terminal."""
+        return FakeDataObject("StaCubic", name, terminal, **attributes)
+
+    def relay(
+        self, cubicle: FakeDataObject, name: str, relay_type: Optional[str] = None
+    ) -> FakeDataObject:
+        """Create a relay, typed if a relay type name is given."""
+        relay = FakeDataObject("ElmRelay", name, cubicle)
+        if relay_type:
+            relay.typ_id = self.relay_types[relay_type]
+        return relay
+
+    def oc_settings(self, set_id: str, directional: bool = False,
+                    reclosing: bool = False) -> None:
+        """Add overcurrent setting rows, with optional dip and reclose rows."""
+        rng = self.rng
+        rows = [
+            ("Phase OC", "I> Pickup", str(rng.choice([240, 300, 360, 480, 600])), "A"),
+            ("Phase OC", "I> TMS", f"{rng.choice([0.05, 0.1, 0.15, 0.2]):.2f}", ""),
+            ("Phase OC", "I> Curve", rng.choice(_CURVE_SETTINGS), ""),
+            ("Phase OC", "I>> Pickup", str(rng.choice([1200, 2000, 3000])), "A"),
+            ("Phase OC", "I>> Delay", str(rng.choice([0, 50, 100])), "ms"),
+            ("Earth OC", "IE> Pickup", str(rng.choice([40, 60, 80, 120])), "A"),
+            ("Earth OC", "IE> TMS", f"{rng.choice([0.1, 0.2, 0.3]):.2f}", ""),
+            ("Earth OC", "IE> Curve", rng.choice(_CURVE_SETTINGS), ""),
+        ]
+        if directional:
+            rows += [
+                ("Directional", "Direction", rng.choice(["Forward", "Reverse"]), ""),
+                ("Directional", "Block Mode", rng.choice(["Enabled", "Disabled"]), ""),
+            ]
+        if reclosing:
+            rows += [
+                ("Reclose", "Trips to Lockout", str(rng.choice([1, 2, 3, 4])), ""),
+                ("Reclose", "I>> Lockout", rng.choice(["On", "off"]), ""),
+            ]
+        self.add_settings(set_id, rows)
+
+    def add_settings(self, set_id: str, rows: List[Tuple[str, str, str, str]]) -> None:
+        """Add setting rows for a relay setting ID."""
+        self.network.relay_settings[set_id] = [
+            {
+                "blockpathenu": block,
+                "paramnameenu": param,
+                "proposedsetting": value,
+                "unitenu": unit,
+                "relaysettingid": set_id,
+            }
+            for block, param, value, unit in rows
+        ]
+
+
+# =============================================================================
+# Region Generators
+# =============================================================================
+
+def _substation_code(index: int, length: int) -> str:
+    """
+    Get an alphabetic substation code for an index.
+
+    Examples:
+        >>> _substation_code(0, 3)
+        'AAA'
+        >>> _substation_code(27, 3)
+        'ABB'
+    """
+    chars = []
+    for _ in range(length):
+        chars.append(chr(ord("A") + index % 26))
+        index //= 26
+    return "".join(reversed(chars))
+
+
+def _build_seq_substation(builder: _Builder, index: int) -> None:
+    """
+    Create an Energex zone substation and its IPS records.
+
+    Bays 1-5 have single-CB feeders (bay 1 with two relays), bay 6 is a
+    double cable box (6A and 6B under one "6A+B" record) and bay 7 has
+    no IPS record.
+    """
+    network = builder.network
+    sub = _substation_code(index, 3)
+    substation = FakeDataObject(
+        "ElmSubstat", sub, builder.grid, sType="Zone Substation"
+    )
+    busbar = FakeDataObject("ElmTerm", f"{sub} 11kV", substation)
+
+    def add_cb(cb_name: str) -> FakeDataObject:
+        cubicle = builder.cubicle(busbar, f"Cub_{cb_name}")
+        return FakeDataObject("ElmCoup", cb_name, substation, bus1=cubicle)
+
+    def add_record(nameenu: str, device_id: str, directional: bool) -> str:
+        set_id = builder.setting_id()
+        pattern = "SYN-DIR_Energex" if directional else "SYN-OC_Energex"
+        network.setting_ids.append(SeqSettingId(
+            pattern, nameenu, set_id, "2024-01-15", device_id,
+            f"{nameenu}-{device_id}", f"Energex/Substations/{sub}/11 kV/{nameenu}/",
+        ))
+        ct_primary = str(builder.rng.choice(CT_RATIOS))
+        network.it_settings += [
+            SeqItSetting(set_id, "Iprim_1", ct_primary),
+            SeqItSetting(set_id, "Isec_1", "1"),
+        ]
+        if directional:
+            network.it_settings += [
+                SeqItSetting(set_id, "Vprim_1", "11000"),
+                SeqItSetting(set_id, "Vsec_1", "110"),
+            ]
+        builder.oc_settings(set_id, directional=directional)
+        return set_id
+
+    for bay in range(1, 6):
+        cb = add_cb(f"{sub}{bay}A")
+        add_record(f"{sub}{bay}A", "J01", directional=bay % 2 == 0)
+        network.device_count += 1
+        if bay == 1:
+            add_record(f"{sub}1A", "J02", directional=True)
+            network.device_count += 1
+        if bay == 2:
+            # Relay from a previous run, already typed
+            builder.relay(cb.bus1, f"{sub}2A_J01", DIR_RELAY_TYPE)
+
+    add_cb(f"{sub}6A")
+    add_cb(f"{sub}6B")
+    add_record(f"{sub}6A+B", "J01", directional=False)
+    network.device_count += 2
+
+    # CB with no IPS record and a stale relay
+    cb = add_cb(f"{sub}7A")
+    FakeDataObject("ElmRelay", f"{sub}7A_J01", cb.bus1)
+
+
+def _build_ergon_substation(builder: _Builder, index: int) -> None:
+    """
+    Create an Ergon zone substation with its feeder line devices.
+
+    The substation has four feeder relays; the line has three reclosers
+    (the last one SWER), two line fuses and a distribution transformer
+    fuse. Some substations also have devices with no IPS record.
+    """
+    network = builder.network
+    rng = builder.rng
+    sub = _substation_code(index, 4)
+    substation = FakeDataObject(
+        "ElmSubstat", sub, builder.grid, sType="Zone Substation"
+    )
+    busbar = FakeDataObject("ElmTerm", f"{sub} 11kV", substation)
+
+    def add_record(asset: str, pattern: str) -> str:
+        set_id = builder.setting_id()
+        network.setting_ids.append(RegSettingId(
+            f"{asset} protection", asset, pattern, "1.0", 1, "", set_id, "2024-01-15",
+        ))
+        return set_id
+
+    def add_ct(set_id: str) -> None:
+        network.it_settings += [
+            RegItSetting(set_id, "CT Primary", str(rng.choice(CT_RATIOS))),
+            RegItSetting(set_id, "CT Secondary", "1"),
+        ]
+
+    # Feeder relays
+    for feeder in range(1, 5):
+        name = f"{sub}SS-F{feeder:02d}"
+        cubicle = builder.cubicle(busbar, f"Cub_F{feeder:02d}")
+        pattern = UNMAPPED_PATTERN if feeder == 4 and index % 5 == 0 else "SYN-OC"
+        builder.relay(cubicle, name, OC_RELAY_TYPE if feeder == 1 else None)
+        set_id = add_record(name, pattern)
+        add_ct(set_id)
+        builder.oc_settings(set_id)
+        network.device_count += 1
+
+    # Reclosers on line terminals (the last one is SWER)
+    for recloser in range(1, 4):
+        plant = f"RC-{index * 10 + recloser:05d}"
+        terminal = FakeDataObject("ElmTerm", f"{sub} Line T{recloser}", builder.grid)
+        cubicle = builder.cubicle(terminal, "Cub_1", nphase=1 if recloser == 3 else 3)
+        builder.relay(cubicle, plant)
+        set_id = add_record(plant, "SYN-RC")
+        add_ct(set_id)
+        builder.oc_settings(set_id, reclosing=True)
+        network.device_count += 1
+
+    # Line fuses
+    for fuse in range(1, 3):
+        plant = f"DO-{index * 10 + fuse:05d}"
+        terminal = FakeDataObject("ElmTerm", f"{sub} Line F{fuse}", builder.grid)
+        line = FakeDataObject("ElmLne", f"{sub} Line {fuse}", builder.grid)
+        cubicle = builder.cubicle(terminal, "Cub_1", obj_id=line)
+        FakeDataObject("RelFuse", plant, cubicle)
+        network.device_count += 1
+        set_id = add_record(plant, FUSE_PATTERN)
+        rating = rng.choice(FUSE_RATINGS_K[1:] if fuse == 1 else FUSE_RATINGS_T)
+        curve = "K" if fuse == 1 else "T"
+        builder.add_settings(
+            set_id, [("Fuse", "Curve", curve, ""), ("Fuse", "MAX", rating, "A")]
+        )
+
+    # Distribution transformer fuse (sized from the transformer)
+    plant = f"DO-{index * 10 + 5:05d}"
+    tx_station = FakeDataObject("ElmTrfstat", f"{sub} TX1", builder.grid, sType="Pole")
+    hv_terminal = FakeDataObject("ElmTerm", "HV", tx_station)
+    switch = FakeDataObject("ElmCoup", f"{plant} Switch", tx_station, aUsage="dct")
+    cubicle = builder.cubicle(hv_terminal, "Cub_1", obj_id=switch)
+    switch.bus1 = cubicle
+    FakeDataObject("RelFuse", plant, cubicle)
+    FakeDataObject(
+        "ElmTr2", f"{sub} TX1", tx_station, typ_id=builder.tx_type, bushv=cubicle
+    )
+    network.device_count += 1
+
+    # Devices with no IPS record, non-protection devices and duplicates
+    if index % 4 == 0:
+        terminal = FakeDataObject("ElmTerm", f"{sub} Line T9", builder.grid)
+        builder.relay(builder.cubicle(terminal, "Cub_1"), f"RC-{90000 + index:05d}")
+        network.device_count += 1
+    if index % 10 == 0:
+        builder.relay(builder.cubicle(busbar, "Cub_Spare"), "Spare Relay")
+    if index == 0:
+        builder.relay(builder.cubicle(busbar, "Cub_Dup"), f"{sub}SS-F01(1)")
+
+
+def build_network(
+    region: str,
+    scale: int,
+    seed: int = 0,
+    projects: int = 1
+) -> SyntheticNetwork:
+    """
+    Generate a synthetic network and its IPS data.
+
+    Args:
+        region: "Energex" or "Ergon"
+        scale: Number of substations per project (about 10 devices each)
+        seed: Random seed for setting values
+        projects: Number of projects ("Synthetic {region} {scale}", or
+            "... #n" when there are several)
+
+    Returns:
+        SyntheticNetwork with the first project activated; device_count
+        covers all projects
+
+    Raises:
+        ValueError: If the region is not recognised
+    """
+    if region not in SETTING_IDS_REPORTS:
+        raise ValueError(f"Unknown region '{region}'")
+
+    builder = _Builder(region, scale, seed)
+    build_substation = (
+        _build_seq_substation if region == "Energex" else _build_ergon_substation
+    )
+    first_project = None
+    for number in range(projects):
+        name = f"Synthetic {region} {scale}"
+        project = builder.add_project(
+            name if projects == 1 else f"{name} #{number + 1}"
+        )
+        first_project = first_project or project
+        for index in range(number * scale, (number + 1) * scale):
+            build_substation(builder, index)
+    builder.app.activate_project(first_project)
+    return builder.network
@@ -52,6 +52,8 @@ from config.paths import (
     # Output paths
     OUTPUT_BATCH_DIR,
     OUTPUT_LOCAL_DIR,
+    CACHE_DIR,
+    JOURNAL_DIR,
     # Path helper functions
     get_output_directory,
     ensure_path_exists,
@@ -59,6 +61,9 @@ from config.paths import (
     get_curve_mapping_file,
     get_type_mapping_file,
     get_relay_map_file,
+    get_journal_file,
+    get_library_catalog_file,
+    get_mapping_bundle_file,
     ensure_mapping_directories_exist,
 )
 
@@ -116,6 +121,8 @@ __all__ = [
     # Output paths
     "OUTPUT_BATCH_DIR",
     "OUTPUT_LOCAL_DIR",
+    "CACHE_DIR",
+    "JOURNAL_DIR",
     # Path helper functions
     "get_output_directory",
     "ensure_path_exists",
@@ -123,6 +130,9 @@ __all__ = [
     "get_curve_mapping_file",
     "get_type_mapping_file",
     "get_relay_map_file",
+    "get_journal_file",
+    "get_library_catalog_file",
+    "get_mapping_bundle_file",
     "ensure_mapping_directories_exist",
     # Relay patterns
     "SINGLE_PHASE_RELAYS",
@@ -15,6 +15,17 @@ Network Paths:
 
 Local Paths:
     Project-relative paths for mapping files and logs.
+
+Environment Overrides:
+    IPS_PF_MAPPING_DIR: Replaces the mapping_files/ base directory
+    IPS_PF_OUTPUT_DIR: Replaces both the batch and local output directories
+    IPS_PF_CACHE_DIR: Replaces the directory for state kept between runs
+        (run journals, library catalog and mapping bundle)
+
+    Overrides are read when this module is first imported, so they must be
+    set before any project module is imported. They are set by the headless
+    batch entry point (batch_main.py) and by offline benchmark runs (see
+    benchmarks/headless.py).
 """
 
 import os
@@ -58,7 +69,9 @@ RELAY_SKELETONS_PATH = os.path.join(
 # =============================================================================
 
 # Base directory for all mapping files (in project root)
-MAPPING_FILES_BASE = PROJECT_ROOT / "mapping_files"
+MAPPING_FILES_BASE = Path(
+    os.environ.get("IPS_PF_MAPPING_DIR") or PROJECT_ROOT / "mapping_files"
+)
 
 # CB alternate names mapping
 CB_ALT_NAMES_DIR = MAPPING_FILES_BASE / "cb_alt_names"
@@ -96,6 +109,17 @@ OUTPUT_BATCH_DIR = os.path.join(
 # Local fallback for output when network is unavailable (Citrix environment)
 OUTPUT_LOCAL_DIR = r"C:\LocalData\PowerFactory Output Folders\IPS Data Transfer"
 
+# Output directory override for offline runs
+_OUTPUT_OVERRIDE = os.environ.get("IPS_PF_OUTPUT_DIR")
+if _OUTPUT_OVERRIDE:
+    OUTPUT_BATCH_DIR = OUTPUT_LOCAL_DIR = _OUTPUT_OVERRIDE
+
+# State kept between runs
+CACHE_DIR = Path(os.environ.get("IPS_PF_CACHE_DIR") or PROJECT_ROOT / "results_log")
+
+# Checkpoint journals for resuming interrupted update runs
+JOURNAL_DIR = CACHE_DIR / "journals"
+
 
 # =============================================================================
 # Helper Functions
@@ -195,6 +219,39 @@ def get_relay_map_file(filename: str) -> Path:
     return RELAY_MAPS_DIR / filename
 
 
+def get_journal_file(name: str) -> Path:
+    """
+    Get the full path to a run journal file.
+
+    Args:
+        name: Journal name (normally the results file name for the project)
+
+    Returns:
+        Path to the journal file
+    """
+    return JOURNAL_DIR / f"{name}.jsonl"
+
+
+def get_library_catalog_file() -> Path:
+    """
+    Get the full path to the library type catalog.
+
+    Returns:
+        Path to library_catalog.json in the cache directory
+    """
+    return CACHE_DIR / "library_catalog.json"
+
+
+def get_mapping_bundle_file() -> Path:
+    """
+    Get the full path to the compiled mapping file bundle.
+
+    Returns:
+        Path to mapping_bundle.json in the cache directory
+    """
+    return CACHE_DIR / "mapping_bundle.json"
+
+
 def get_mapping_file_path(filename: str) -> str:
     """
     Get the full path to a mapping file.
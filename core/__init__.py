@@ -10,9 +10,10 @@ Classes:
     UpdateResult: Represents the result of updating a device
     ProtectionDevice: Represents a protection relay or fuse with its settings
     SettingRecord: Represents a single setting record from IPS
+    SettingTable: A device's IPS settings, parsed once (rows are SettingRow)
 
 Usage:
-    from core import UpdateResult, ProtectionDevice, SettingRecord
+    from core import UpdateResult, ProtectionDevice, SettingRecord, SettingTable
     
     # Create result from device
     result = UpdateResult.from_device(device_object)
@@ -33,8 +34,12 @@ from core.protection_device import ProtectionDevice
 
 from core.setting_record import SettingRecord
 
+from core.setting_table import SettingRow, SettingTable
+
 __all__ = [
     "UpdateResult",
     "ProtectionDevice",
     "SettingRecord",
+    "SettingRow",
+    "SettingTable",
 ]
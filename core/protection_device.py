@@ -10,6 +10,8 @@ the IPS data retrieval layer and the PowerFactory update layer.
 
 from typing import Any, Dict, List, Optional
 
+from core.setting_table import SettingTable
+
 
 class ProtectionDevice:
     """
@@ -35,7 +37,7 @@ class ProtectionDevice:
         multiple: Whether device has multiple settings
         fuse_type: Fuse type (for fuse devices)
         fuse_size: Fuse size (for fuse devices)
-        settings: List of associated settings
+        settings: Table of associated settings, parsed once on ingestion
 
     Example:
         >>> device = ProtectionDevice(
@@ -92,7 +94,7 @@ class ProtectionDevice:
         self.multiple = False
         self.fuse_type = None
         self.fuse_size = None
-        self.settings: List[List[str]] = []
+        self.settings = SettingTable()
 
     def associated_settings(self, all_settings: Dict[str, List[Dict]]) -> None:
         """
@@ -105,27 +107,23 @@ class ProtectionDevice:
         Args:
             all_settings: Dictionary mapping setting IDs to list of setting rows
         """
-        self.settings = []
+        self.settings = SettingTable()
         if not self.setting_id:
             return
 
-        for row in all_settings.get(self.setting_id, []):
-            setting = [
-                row.get("blockpathenu", ""),
-                row.get("paramnameenu", ""),
-                row.get("proposedsetting", ""),
-                row.get("unitenu", ""),
-            ]
-            self.settings.append(setting)
+        self.settings = SettingTable.from_ips_rows(
+            all_settings.get(self.setting_id, [])
+        )
 
-            # Extract CT ratios from settings
+        # Extract CT ratios from settings
+        for setting in self.settings:
             try:
-                param_name = str(row.get("paramnameenu", ""))
+                param_name = str(setting.param_name)
                 if param_name in ["0120", "Iprim", "0A07"]:
-                    self.ct_primary = int(float(row["proposedsetting"]))
+                    self.ct_primary = int(float(setting.setting))
                 elif param_name in ["0121", "In", "0A08"]:
-                    self.ct_secondary = int(float(row["proposedsetting"]))
-            except (ValueError, KeyError, TypeError):
+                    self.ct_secondary = int(float(setting.setting))
+            except (ValueError, TypeError):
                 pass
 
     def seq_instrument_attributes(self, all_settings: List[Any]) -> None:
@@ -0,0 +1,204 @@
+"""
+Typed table of a protection device's IPS settings.
+
+Each IPS setting row (block path, parameter name, proposed setting, unit)
+is parsed once when a ProtectionDevice is given its settings:
+- Block paths, parameter names and units are interned, as the same few
+  hundred names repeat across every device of a pattern
+- The proposed setting is kept as received and also parsed as a number
+- Settings in mA, ms and kA are converted to A, s and A
+
+The table is never changed after it is built, so it can be hashed for the
+setting plan key and shared between devices without copying.
+
+Usage:
+    from core import SettingTable
+
+    table = SettingTable.from_ips_rows(all_settings.get(setting_id, []))
+    for setting in table:
+        if setting.is_converted:
+            value = setting.number
+"""
+
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+# Number of fields of an IPS setting row, which are matched against
+# mapping file columns D to G
+IPS_FIELD_COUNT = 4
+
+# Position of the proposed setting within an IPS setting row
+SETTING_INDEX = 2
+
+# Units converted on ingestion: {unit: (base unit, conversion)}
+UNIT_CONVERSIONS: Dict[str, Tuple[str, Callable[[float], float]]] = {
+    "mA": ("A", lambda value: value / 1000),
+    "ms": ("s", lambda value: value / 1000),
+    "kA": ("A", lambda value: value * 1000),
+}
+
+
+def _intern(value: Any) -> Any:
+    """Intern a string value, leaving other values unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _to_base_unit(value: Any, unit: Any) -> float:
+    """
+    Convert a setting value to the base unit of its IPS unit.
+
+    Raises:
+        ValueError: If the value is not a number
+        TypeError: If the value cannot be converted to a number
+    """
+    conversion = UNIT_CONVERSIONS.get(unit)
+    if conversion is None:
+        return float(value)
+    return conversion[1](float(value))
+
+
+class SettingRow(NamedTuple):
+    """
+    A single IPS setting of a protection device.
+
+    The first IPS_FIELD_COUNT fields are the IPS row as received.
+
+    Attributes:
+        block_path: IPS block path (blockpathenu)
+        param_name: IPS parameter name (paramnameenu)
+        setting: Proposed setting as received (proposedsetting)
+        unit: IPS unit (unitenu)
+        number: Setting as a number in base_unit, or None if not numeric
+        base_unit: Unit of number (unit, or A/s for mA, ms and kA)
+    """
+    block_path: Any
+    param_name: Any
+    setting: Any
+    unit: Any
+    number: Optional[float]
+    base_unit: Any
+
+    @classmethod
+    def from_ips_row(cls, row: Dict[str, Any]) -> "SettingRow":
+        """
+        Parse an IPS setting row.
+
+        Args:
+            row: Setting row dictionary from the IPS query
+
+        Returns:
+            SettingRow with the number and base unit resolved
+        """
+        setting = row.get("proposedsetting", "")
+        unit = _intern(row.get("unitenu", ""))
+        try:
+            number = _to_base_unit(setting, unit)
+        except (ValueError, TypeError):
+            number = None
+        conversion = UNIT_CONVERSIONS.get(unit)
+        return cls(
+            _intern(row.get("blockpathenu", "")),
+            _intern(row.get("paramnameenu", "")),
+            setting,
+            unit,
+            number,
+            conversion[0] if conversion else unit,
+        )
+
+    @property
+    def ips_fields(self) -> Tuple[Any, ...]:
+        """The IPS row as received (block path, name, setting, unit)."""
+        return self[:IPS_FIELD_COUNT]
+
+    @property
+    def is_converted(self) -> bool:
+        """Whether the setting is in a unit converted on ingestion."""
+        return self.unit in UNIT_CONVERSIONS
+
+    def mapped_value(self, index: int) -> Any:
+        """
+        Get an IPS field as applied by a "use_setting" mapping file entry.
+
+        Fields in a converted unit are applied as numbers in the base
+        unit; others are applied as received.
+
+        Args:
+            index: Position of the field within the IPS row
+
+        Returns:
+            The field value
+
+        Raises:
+            ValueError: If the field is in a converted unit but is not a
+                number
+        """
+        if not self.is_converted:
+            return self[index]
+        if index == SETTING_INDEX:
+            if self.number is None:
+                raise ValueError(
+                    f"Setting {self.param_name} is not a number: {self.setting!r}"
+                )
+            return self.number
+        return _to_base_unit(self[index], self.unit)
+
+
+class SettingTable:
+    """
+    Immutable table of a protection device's IPS settings.
+
+    Supports len(), iteration and indexing like the list of setting rows
+    it replaces.
+
+    Example:
+        >>> table = SettingTable.from_ips_rows([
+        ...     {"blockpathenu": "P1", "paramnameenu": "T1",
+        ...      "proposedsetting": "250", "unitenu": "ms"}
+        ... ])
+        >>> table[0].number, table[0].base_unit
+        (0.25, 's')
+    """
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows: Iterable[SettingRow] = ()):
+        """
+        Initialize a SettingTable.
+
+        Args:
+            rows: Parsed setting rows
+        """
+        self._rows: Tuple[SettingRow, ...] = tuple(rows)
+
+    @classmethod
+    def from_ips_rows(cls, rows: Iterable[Dict[str, Any]]) -> "SettingTable":
+        """
+        Parse the IPS setting rows of a setting ID.
+
+        Args:
+            rows: Setting row dictionaries from the IPS query
+
+        Returns:
+            SettingTable of the rows, in order
+        """
+        return cls(SettingRow.from_ips_row(row) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[SettingRow]:
+        return iter(self._rows)
+
+    def __getitem__(self, index: int) -> SettingRow:
+        return self._rows[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SettingTable):
+            return NotImplemented
+        return self._rows == other._rows
+
+    def __hash__(self) -> int:
+        return hash(self._rows)
+
+    def __repr__(self) -> str:
+        return f"SettingTable({len(self._rows)} settings)"
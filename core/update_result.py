@@ -24,6 +24,39 @@ from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Field name to CSV column name, in results file column order
+RESULT_COLUMNS: Dict[str, str] = {
+    'substation': 'SUBSTATION',
+    'plant_number': 'PLANT_NUMBER',
+    'relay_pattern': 'RELAY_PATTERN',
+    'used_pattern': 'USED_PATTERN',
+    'date_setting': 'DATE_SETTING',
+    'result': 'RESULT',
+    'ct_name': 'CT_NAME',
+    'ct_result': 'CT_RESULT',
+    'vt_name': 'VT_NAME',
+    'vt_result': 'VT_RESULT',
+    'cb_name': 'CB_NAME',
+    'error_detail': 'ERROR_DETAIL',
+}
+
+# Prefix of the stage timing columns
+TIMING_COLUMN_PREFIX = 'TIME_'
+
+
+def timing_column(stage_path: str) -> str:
+    """
+    Get the CSV column name of a stage timing.
+
+    Args:
+        stage_path: Profiler stage path (e.g., "relay_settings/update_ct")
+
+    Returns:
+        Column name (e.g., "TIME_RELAY_SETTINGS_UPDATE_CT")
+    """
+    return TIMING_COLUMN_PREFIX + stage_path.upper().replace("/", "_")
+
+
 @dataclass
 class UpdateResult:
     """
@@ -46,6 +79,8 @@ class UpdateResult:
         vt_result: Result of VT configuration
         cb_name: Circuit breaker name (for failed CB records)
         error_detail: Detailed error message if processing failed
+        stage_timings: Optional seconds per processing stage, output as
+            TIME_<STAGE> columns when set
 
     Example:
         >>> result = UpdateResult(
@@ -84,6 +119,9 @@ class UpdateResult:
     # Error handling
     error_detail: Optional[str] = None
 
+    # Optional per-stage timings (stage path -> seconds)
+    stage_timings: Optional[Dict[str, float]] = None
+
     @classmethod
     def from_device(cls, device_object: Any, app: Any = None) -> 'UpdateResult':
         """
@@ -228,28 +266,16 @@ class UpdateResult:
             >>> result.to_dict()
             {'SUBSTATION': 'SUB_A', 'RESULT': 'OK'}
         """
-        # Field name to CSV column name mapping
-        field_mapping = {
-            'substation': 'SUBSTATION',
-            'plant_number': 'PLANT_NUMBER',
-            'relay_pattern': 'RELAY_PATTERN',
-            'used_pattern': 'USED_PATTERN',
-            'date_setting': 'DATE_SETTING',
-            'result': 'RESULT',
-            'ct_name': 'CT_NAME',
-            'ct_result': 'CT_RESULT',
-            'vt_name': 'VT_NAME',
-            'vt_result': 'VT_RESULT',
-            'cb_name': 'CB_NAME',
-            'error_detail': 'ERROR_DETAIL',
-        }
-
         result_dict = {}
-        for field_name, csv_name in field_mapping.items():
+        for field_name, csv_name in RESULT_COLUMNS.items():
             value = getattr(self, field_name)
             if value is not None and value != "":
                 result_dict[csv_name] = str(value)
 
+        if self.stage_timings:
+            for path, seconds in self.stage_timings.items():
+                result_dict[timing_column(path)] = f"{seconds:.4f}"
+
         return result_dict
 
     def set_ct_info(self, name: Optional[str], result: str) -> 'UpdateResult':
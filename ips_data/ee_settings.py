@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Tuple, Any, Union
 
 from core import ProtectionDevice, SettingRecord, UpdateResult
 from utils.pf_utils import determine_fuse_role
+from utils.profiling import stage
 from ips_data import query_database as qd
 from ips_data.setting_index import SettingIndex
 
@@ -109,7 +110,8 @@ def ergon_all_dev_list(
     Returns:
         Tuple of (setting_ids, list_of_devices, data_capture_list)
     """
-    prot_devices = get_all_protection_devices(app)
+    with stage("get_all_protection_devices"):
+        prot_devices = get_all_protection_devices(app)
     list_of_devices: List[ProtectionDevice] = []
     setting_ids: List[str] = []
 
@@ -12,7 +12,6 @@ linear scans through raw setting lists.
 import logging
 import sys
 from typing import List, Tuple, Optional, Dict, Any, Union
-from importlib import reload
 
 # Import paths from config
 from config.paths import RELAY_SKELETONS_PATH
@@ -26,9 +25,7 @@ from ips_data import ee_settings as ee
 from ips_data import ex_settings as ex
 from ips_data.setting_index import SettingIndex
 from utils.pf_utils import get_all_protection_devices
-from ui.device_selection import user_selection
 
-reload(ex)
 
 def get_ips_settings(
     app,
@@ -154,6 +151,9 @@ def _get_user_selected_devices(
     Returns:
         Tuple of (setting_ids or "Batch", device_list, data_capture_list)
     """
+    # The dialog needs tkinter, so it is only imported for interactive runs
+    from ui.device_selection import user_selection
+
     # Get all protection devices in the model
     devices, device_dict = get_all_protection_devices(app)
 
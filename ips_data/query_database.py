@@ -71,6 +71,21 @@ def get_setting_ids(app, region: str) -> SettingIndex:
     return index
 
 
+def set_setting_index(region: str, index: SettingIndex) -> None:
+    """
+    Use an index built elsewhere for a region.
+
+    The batch worker pool builds each region's index once in the parent
+    process and hands it to every worker, so workers never fetch the
+    setting ID report themselves.
+
+    Args:
+        region: "Energex" or "Ergon"
+        index: SettingIndex for the region
+    """
+    _index_cache[f"setting_index_{region}"] = index
+
+
 def _fetch_setting_ids_with_retry(app, region: str, max_attempts: int = 5) -> List[Dict]:
     """
     Fetch setting IDs with retry logic for concurrent access issues.
@@ -12,6 +12,7 @@ O(n*m) to O(n+m).
 """
 
 from collections import defaultdict
+from functools import partial
 from typing import Dict, List, Optional, Any
 
 from core import SettingRecord
@@ -57,9 +58,12 @@ class SettingIndex:
         self._by_asset_prefix: Dict[str, List[SettingRecord]] = defaultdict(list)
         self._by_setting_id: Dict[str, SettingRecord] = {}
 
-        # Energex-specific indexes
+        # Energex-specific indexes (no lambdas, so the index can be
+        # pickled for batch worker processes)
         self._by_switch_name: Dict[str, List[SettingRecord]] = defaultdict(list)
-        self._by_substation_and_switch: Dict[str, Dict[str, List[SettingRecord]]] = defaultdict(lambda: defaultdict(list))
+        self._by_substation_and_switch: Dict[str, Dict[str, List[SettingRecord]]] = (
+            defaultdict(partial(defaultdict, list))
+        )
 
         # Build indexes
         self._build_indexes(ids_dict_list)
@@ -1,11 +1,13 @@
 import powerfactory as pf
+import argparse
 import os
-from tkinter import *  # noqa [F403]
 
 from ips_data import ips_settings as ips
 from update_powerfactory import orchestrator as up
+from update_powerfactory.run_journal import RunJournal
+from update_powerfactory.results_writer import ResultsWriter, read_results
 
-from config.paths import OUTPUT_BATCH_DIR, OUTPUT_LOCAL_DIR
+from config.paths import OUTPUT_BATCH_DIR, OUTPUT_LOCAL_DIR, get_journal_file
 from config.validation import (
     require_valid_config,
     validate_for_batch_mode,
@@ -13,12 +15,11 @@ from config.validation import (
     ValidationLevel,
 )
 from utils.time_utils import Timer, get_current_timestamp
+from utils.pf_proxy import ApiCallCounter, ReadCache
 from utils.file_utils import (
     ensure_directory_exists,
     get_citrix_adjusted_path,
-    write_dict_list_to_csv,
     is_file_recent,
-    safe_file_remove,
 )
 from utils.pf_utils import determine_region, get_all_protection_devices
 from logging_config import setup_logging, get_logger
@@ -28,8 +29,23 @@ setup_logging()
 logger = get_logger(__name__)
 
 
-def main(app=None, batch=False):
-    """This Script Will be used to transfer Settings from IPS to PF."""
+def main(app=None, batch=False, resume=False, count_api_calls=False,
+         cache_reads=False, timing_columns=False, validate=True):
+    """This Script Will be used to transfer Settings from IPS to PF.
+
+    If resume is True, devices committed by an interrupted previous run of
+    the same project are skipped and their journalled results are reused.
+    If count_api_calls is True, PowerFactory API calls are counted by
+    method, class and stage and reported at the end of the run.
+    If cache_reads is True, repeat reads of names, parents, types and
+    grids are served from a per-run cache (implies API call counting).
+    If timing_columns is True, each device's stage timings are added to the
+    results as TIME_<STAGE> columns.
+    If validate is False, configuration validation is skipped. This is only
+    intended for callers that have already validated once for many
+    projects (see batch_main.py) and for offline runs against an in-memory
+    PowerFactory (see benchmarks/headless.py).
+    """
     timer = Timer(name="IPS to PF Transfer", auto_log=True)
     timer.start()
     start_time = get_current_timestamp()
@@ -43,6 +59,11 @@ def main(app=None, batch=False):
     else:
         # If another script is executing this script, it will pass the app argument to it
         called_function = True
+
+    api_counter = None
+    if count_api_calls or cache_reads:
+        api_counter = ApiCallCounter(read_cache=ReadCache() if cache_reads else None)
+        app = api_counter.wrap(app)
     app.ClearOutputWindow()
 
     # ==========================================================================
@@ -52,7 +73,9 @@ def main(app=None, batch=False):
     # This catches issues early with clear error messages rather than
     # failing mid-run with cryptic stack traces.
 
-    if batch or called_function:
+    if not validate:
+        logger.warning("Configuration validation skipped")
+    elif batch or called_function:
         # Batch mode: stricter validation, check database connectivity
         result = validate_for_batch_mode(app)
         if not result.is_valid:
@@ -86,20 +109,44 @@ def main(app=None, batch=False):
 
     logger.info(f"Devices found in IPS: {len(dev_list)}")
 
-    # Update PowerFactory
-    data_capture_list, updates_applied = up.update_pf(app, dev_list, data_capture_list)
+    # Create file to save script information. Results are written to it
+    # as each device completes.
+    save_file = create_save_file(app, prjt, called_function)
+    results_writer = ResultsWriter(save_file) if save_file else None
 
-    logger.info(f"Data capture list entries: {len(data_capture_list)}")
-    logger.info(f"Data capture list: {config_log_result(data_capture_list)}")
+    # Update PowerFactory, journalling progress so an interrupted run can resume
+    journal = RunJournal(
+        get_journal_file(get_project_file_name(app, prjt)), resume=resume
+    )
+    try:
+        data_capture_list, updates_applied = up.update_pf(
+            app, dev_list, data_capture_list, journal=journal,
+            timing_columns=timing_columns, results_writer=results_writer
+        )
+    except Exception:
+        # Keep the results of the devices completed so far
+        if results_writer:
+            results_writer.close()
+        raise
+    finally:
+        journal.close()
+
+    if results_writer:
+        # Results were streamed to the writer rather than held in memory
+        logger.info(f"Data capture list entries: {results_writer.rows}")
+        logger.info(f"Results: {results_writer.result_counts}")
+    else:
+        logger.info(f"Data capture list entries: {len(data_capture_list)}")
+        logger.info(f"Data capture list: {config_log_result(data_capture_list)}")
     logger.info(f"Updates applied: {updates_applied}")
 
-    # Create file to save script information
-    save_file = create_save_file(app, prjt, called_function)
     if not save_file:
+        journal.finalise()
         return
-    write_dict_list_to_csv(data_capture_list, save_file)
+    results_file = results_writer.finalise()
+    journal.finalise()
     if not batch:
-        print_results(app, data_capture_list)
+        print_results(app, read_results(results_file) if results_file else [])
 
     timer.stop()
     stop_time = get_current_timestamp()
@@ -114,19 +161,26 @@ def main(app=None, batch=False):
         logger.info("Script completed with no updated settings")
 
     app.PrintPlain(f"Query Script run time: {timer.formatted}")
+    if api_counter:
+        report_api_calls(app, api_counter)
 
     return updates_applied
 
 
-def create_save_file(app, prjt, called_function):
+def get_project_file_name(app, prjt):
+    """Build the file name used for the project's results and run journal."""
     project_name = prjt.GetAttribute("loc_name")
     current_user = app.GetCurrentUser()
     current_user_name = current_user.GetAttribute("loc_name")
     parent_folder = prjt.GetAttribute("fold_id")
     parent_folder_name = parent_folder.GetAttribute("loc_name")
-    file_name = f"{current_user_name}_{parent_folder_name}_{project_name}".replace(
+    return f"{current_user_name}_{parent_folder_name}_{project_name}".replace(
         "/", "_"
     )
+
+
+def create_save_file(app, prjt, called_function):
+    file_name = get_project_file_name(app, prjt)
     if called_function:
         file_location = OUTPUT_BATCH_DIR
         main_file_name = select_main_file(
@@ -159,9 +213,8 @@ def select_main_file(file_name, location, called_function):
             print("Project had already been studied")
             return None
 
-    # Remove existing file if present
-    safe_file_remove(set_file_name)
-
+    # Any existing file is left in place; ResultsWriter.finalise replaces it
+    # once the new results are complete.
     return set_file_name
 
 
@@ -191,6 +244,26 @@ def print_results(app, data_capture_list):
     app.PrintInfo(print_string)
 
 
+def report_api_calls(app, api_counter):
+    """Log the API call breakdown and print the busiest methods and stages."""
+    report = api_counter.report()
+    logger.info("PowerFactory API call report", extra={"extra_data": report})
+    top_methods = list(report["by_method"].items())[:5]
+    top_stages = list(report["by_stage"].items())[:5]
+    app.PrintPlain(
+        f"PowerFactory API calls: {report['total']}\n"
+        f"  By method: {top_methods}\n"
+        f"  By stage: {top_stages}"
+    )
+    if "read_cache" in report:
+        cache_stats = report["read_cache"]
+        app.PrintPlain(
+            f"  Read cache: {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%}), "
+            f"{cache_stats['invalidations']} invalidations"
+        )
+
+
 def config_log_result(data_capture_list):
     """
     Only log results of interest
@@ -217,4 +290,33 @@ def config_log_result(data_capture_list):
 
 if __name__ == "__main__":
     # Logging is already configured via setup_logging() at module level
-    updates_applied = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description="Transfer IPS settings to PowerFactory"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip devices completed by an interrupted previous run",
+    )
+    parser.add_argument(
+        "--count-api-calls",
+        action="store_true",
+        help="Count PowerFactory API calls by method, class and stage",
+    )
+    parser.add_argument(
+        "--cache-reads",
+        action="store_true",
+        help="Cache repeat reads of immutable PowerFactory attributes",
+    )
+    parser.add_argument(
+        "--timing-columns",
+        action="store_true",
+        help="Add TIME_<STAGE> columns with each device's stage timings to the results",
+    )
+    args, _ = parser.parse_known_args()
+    updates_applied = main(
+        resume=args.resume,
+        count_api_calls=args.count_api_calls,
+        cache_reads=args.cache_reads,
+        timing_columns=args.timing_columns,
+    )
\ No newline at end of file
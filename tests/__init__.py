@@ -0,0 +1 @@
+"""Table-driven tests for the rewritten setting and logic computations."""
@@ -0,0 +1,61 @@
+"""
+Tests for the PowerFactory API call budgets of headless runs.
+
+Each run imports main with the paths of its own work directory, so it is
+made in a fresh interpreter with the benchmarks.api_budget command line.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.api_budget import API_BUDGETS, RESULT_FILE, check_budgets
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def run_budget(region, scale, workdir):
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.api_budget",
+            "--region", region,
+            "--scale", str(scale),
+            "--workdir", str(workdir),
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    result_file = workdir / f"api_{region.lower()}_{scale}" / RESULT_FILE
+    assert result_file.exists(), completed.stderr
+    with open(result_file, encoding="utf-8") as f:
+        return completed.returncode, json.load(f)
+
+
+@pytest.mark.parametrize("region", sorted(API_BUDGETS))
+@pytest.mark.parametrize("scale", [2, 10])
+def test_stage_calls_within_budget(tmp_path, region, scale):
+    pytest.importorskip("tenacity")
+    returncode, result = run_budget(region, scale, tmp_path)
+
+    assert result["devices"] > 0
+    for path, per_device in API_BUDGETS[region].items():
+        assert 0 < result["calls"][path] <= per_device * result["devices"], path
+    assert returncode == 0
+
+
+def test_check_budgets_reports_exceeded_stages():
+    devices = 10
+    calls = {
+        path: per_device * devices for path, per_device in API_BUDGETS["Ergon"].items()
+    }
+    result = {"region": "Ergon", "devices": devices, "calls": calls}
+    assert check_budgets(result) == []
+
+    calls["relay_settings/update_ct"] += 1
+    exceeded = check_budgets(result)
+    assert len(exceeded) == 1
+    assert exceeded[0].startswith("relay_settings/update_ct:")
@@ -0,0 +1,175 @@
+"""
+Equivalence tests for the curve mapping lookup and resolved curve memo.
+
+The expected values are the outputs of the linear scan of the curve
+mapping that the code index replaced (linear_scan below), for the same
+mappings and settings.
+"""
+
+import itertools
+
+import pytest
+
+from benchmarks.fake_pf import FakeDataObject
+from update_powerfactory import mapping_file as mf
+from utils.pf_proxy import ApiCallCounter
+
+
+def linear_scan(curve_mapping, setting_value):
+    """The curve mapping lookup the code index replaced."""
+    for line in curve_mapping:
+        mapping_value = line[1]
+
+        # Handle binary curve codes - pad with leading zeros
+        try:
+            int(mapping_value)
+            while len(mapping_value) < len(setting_value):
+                mapping_value = "0" + mapping_value
+        except ValueError:
+            pass
+
+        if setting_value == mapping_value:
+            return line[2]
+
+    return None
+
+
+def load_curve_mapping(rows):
+    """Load curve mapping rows as if read from curve_mapping.csv."""
+    mf.load_cache_snapshot({
+        "type_mapping": {},
+        "mapping_files": {},
+        "mapping_file_versions": {},
+        "dip_groups": {},
+        "curve_mapping": [list(row) for row in rows],
+        "curve_code_index": None,
+    })
+
+
+@pytest.fixture(autouse=True)
+def _clear_mapping_cache():
+    mf.clear_cache()
+    yield
+    mf.clear_cache()
+
+
+CURVE_MAPPING = [
+    ("IEC SI", "01", "Standard Inverse"),
+    ("IEC VI", "10", "Very Inverse"),
+    ("IEC EI", "0011", "Extremely Inverse"),
+    ("IEC SI dup", "1", "Standard Inverse (dup)"),
+    ("IEC VI dup", "010", "Very Inverse (dup)"),
+    ("Text", "0A", "Text Curve"),
+    ("Text dup", "0A", "Text Curve (dup)"),
+    ("Signed", "-1", "Signed Curve"),
+    ("Definite", "DT", "Definite Time"),
+]
+
+# (setting value, expected PowerFactory curve name)
+FIND_CURVE_CASES = [
+    # Exact codes
+    ("01", "Standard Inverse"),
+    ("10", "Very Inverse"),
+    ("DT", "Definite Time"),
+    # Leading zeros are stripped from numeric codes only
+    ("001", "Standard Inverse"),
+    ("0001", "Standard Inverse"),
+    ("010", "Very Inverse"),
+    ("0010", "Very Inverse"),
+    ("00011", "Extremely Inverse"),
+    ("011", None),
+    ("00A", None),
+    ("00-1", "Signed Curve"),
+    # The earliest row wins when several rows match
+    ("1", "Standard Inverse (dup)"),
+    ("0A", "Text Curve"),
+    # No match
+    ("", None),
+    ("0", None),
+    ("100", None),
+    ("dt", None),
+]
+
+
+@pytest.mark.parametrize("setting_value, expected", FIND_CURVE_CASES)
+def test_find_curve_in_mapping(setting_value, expected):
+    load_curve_mapping(CURVE_MAPPING)
+    assert mf._find_curve_in_mapping(setting_value) == expected
+    assert linear_scan(CURVE_MAPPING, setting_value) == expected
+
+
+def test_index_keeps_the_first_row_of_each_code():
+    index = mf._index_curve_mapping([list(row) for row in CURVE_MAPPING])
+
+    assert index["0A"] == (5, "Text Curve", False)
+    assert index["01"] == (0, "Standard Inverse", True)
+    assert index["-1"] == (7, "Signed Curve", True)
+
+
+CODES = ["1", "01", "001", "10", "010", "0", "00", "A", "0A", "-1", "1e1"]
+SETTINGS = CODES + ["0001", "0010", "00A", "000", "0-1", "00-1", ""]
+
+
+@pytest.mark.parametrize(
+    "codes",
+    list(itertools.permutations(["01", "1", "001", "0A"]))
+    + [tuple(CODES), tuple(reversed(CODES))],
+)
+def test_find_curve_matches_linear_scan(codes):
+    rows = [(f"IPS {i}", code, f"Curve {i}") for i, code in enumerate(codes)]
+    load_curve_mapping(rows)
+
+    for setting_value in SETTINGS:
+        expected = linear_scan(rows, setting_value)
+        assert mf._find_curve_in_mapping(setting_value) == expected, setting_value
+
+
+# =============================================================================
+# Resolved Curve Memo
+# =============================================================================
+
+def relay_type(name, curve_names):
+    """Relay type with pcharac curves, and an element of that type."""
+    typ = FakeDataObject("TypRelay", name)
+    typ.pcharac = [FakeDataObject("TypChatoc", curve) for curve in curve_names]
+    element = FakeDataObject("RelToc", "I>", typ_id=typ)
+    return typ, element
+
+
+def test_curves_are_resolved_once_per_type_and_setting():
+    load_curve_mapping(CURVE_MAPPING)
+    counter = ApiCallCounter(stage_provider=lambda: "")
+    typ, element = relay_type("Type A", ["Standard Inverse", "Very Inverse"])
+    element = counter.wrap(element)
+
+    first = mf.get_pf_curve(None, "10", element)
+    assert first.loc_name == "Very Inverse"
+    reads = counter.calls(method="GetAttribute")
+    assert mf.get_pf_curve(None, "10", element) == first
+    assert counter.calls(method="GetAttribute") == reads
+    assert (typ, "10") in mf._pf_curve_cache
+
+    assert mf.get_pf_curve(None, "01", element).loc_name == "Standard Inverse"
+    assert counter.calls(method="GetAttribute") == reads + 1
+
+
+def test_types_with_the_same_setting_resolve_separately():
+    load_curve_mapping(CURVE_MAPPING)
+    type_a, element_a = relay_type("Type A", ["Standard Inverse", "Very Inverse"])
+    type_b, element_b = relay_type("Type B", ["Very Inverse", "Standard Inverse"])
+
+    curve_a = mf.get_pf_curve(None, "01", element_a)
+    curve_b = mf.get_pf_curve(None, "01", element_b)
+    assert curve_a in type_a.pcharac
+    assert curve_b in type_b.pcharac
+    assert set(mf._pf_curve_cache) == {(type_a, "01"), (type_b, "01")}
+
+
+def test_clear_curve_cache_keeps_the_mapping():
+    load_curve_mapping(CURVE_MAPPING)
+    _, element = relay_type("Type A", ["Standard Inverse"])
+    mf.get_pf_curve(None, "01", element)
+
+    mf.clear_curve_cache()
+    assert mf.get_cache_stats()["curves_resolved"] == 0
+    assert mf._find_curve_in_mapping("001") == "Standard Inverse"
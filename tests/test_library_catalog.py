@@ -0,0 +1,112 @@
+"""
+Tests for creating the type indexes from the library catalog.
+
+Types published inside an existing library folder do not change the
+catalog stamp, so they must still be found by the first run that needs
+them.
+"""
+
+import pytest
+
+from benchmarks.fake_pf import FakeDataObject
+from benchmarks.synthetic_network import OC_RELAY_TYPE, build_network
+from update_powerfactory import library_catalog as lc
+
+
+@pytest.fixture
+def app():
+    return build_network("Ergon", 1).app
+
+
+@pytest.fixture
+def crawls(monkeypatch):
+    """Count the library reads made by load_type_indexes."""
+    counts = {"relay": 0, "fuse": 0}
+
+    def counted(kind, read):
+        def wrapper(app):
+            counts[kind] += 1
+            return read(app)
+        return wrapper
+
+    monkeypatch.setattr(
+        lc, "library_relay_types", counted("relay", lc.library_relay_types)
+    )
+    monkeypatch.setattr(
+        lc, "library_fuse_types", counted("fuse", lc.library_fuse_types)
+    )
+    return counts
+
+
+def _library_folder(app, name):
+    return app.GetGlobalLibrary().SearchObject(
+        rf"\ErgonLibrary\Protection\{name}.IntFolder"
+    )
+
+
+def test_current_catalog_skips_the_library(app, crawls, tmp_path):
+    path = tmp_path / "library_catalog.json"
+    lc.load_type_indexes(app, path)
+    assert crawls == {"relay": 1, "fuse": 1}
+
+    relay_index, fuse_index = lc.load_type_indexes(app, path)
+    assert relay_index.get(OC_RELAY_TYPE).loc_name == OC_RELAY_TYPE
+    assert fuse_index.get_by_curve_and_rating("K", "25A") is not None
+    assert crawls == {"relay": 1, "fuse": 1}
+
+
+def test_type_published_in_existing_folder_is_found(app, crawls, tmp_path):
+    path = tmp_path / "library_catalog.json"
+    lc.load_type_indexes(app, path)
+    stamp = lc.library_stamp(app)
+
+    FakeDataObject("TypRelay", "New Relay", _library_folder(app, "Relays"))
+    FakeDataObject("TypFuse", "Fuse 999A K", _library_folder(app, "Fuses"))
+    assert lc.library_stamp(app) == stamp
+
+    relay_index, fuse_index = lc.load_type_indexes(app, path)
+    assert relay_index.get("New Relay").loc_name == "New Relay"
+    assert fuse_index.get_by_curve_and_rating("K", "999A").loc_name == "Fuse 999A K"
+    assert crawls == {"relay": 2, "fuse": 2}
+
+    # The rewritten catalog has the new types
+    relay_index, fuse_index = lc.load_type_indexes(app, path)
+    assert relay_index.get("New Relay").loc_name == "New Relay"
+    assert fuse_index.get("Fuse 999A K").loc_name == "Fuse 999A K"
+    assert crawls == {"relay": 2, "fuse": 2}
+
+
+def test_exact_rating_preferred_over_nearest_higher(app, crawls, tmp_path):
+    path = tmp_path / "library_catalog.json"
+    lc.load_type_indexes(app, path)
+    FakeDataObject("TypFuse", "Fuse 999A K", _library_folder(app, "Fuses"))
+
+    _, fuse_index = lc.load_type_indexes(app, path)
+    fuse_type = fuse_index.get_by_curve_and_rating("K", "999A", nearest_higher=True)
+    assert fuse_type.loc_name == "Fuse 999A K"
+
+
+def test_misses_rebuild_at_most_once_per_run(app, crawls, tmp_path):
+    path = tmp_path / "library_catalog.json"
+    lc.load_type_indexes(app, path)
+
+    relay_index, fuse_index = lc.load_type_indexes(app, path)
+    assert relay_index.get("Missing Relay") is None
+    assert relay_index.get("Another Missing Relay") is None
+    assert fuse_index.get_by_curve_and_rating("Z", "10A") is None
+    assert fuse_index.get("Missing Fuse") is None
+    assert crawls == {"relay": 2, "fuse": 2}
+
+
+def test_catalog_type_no_longer_found(app, crawls, tmp_path):
+    path = tmp_path / "library_catalog.json"
+    lc.load_type_indexes(app, path)
+
+    relays = _library_folder(app, "Relays")
+    old_type = relays.GetContents(f"{OC_RELAY_TYPE}.TypRelay")[0]
+    old_type.Delete()
+    moved = FakeDataObject("TypRelay", OC_RELAY_TYPE, _library_folder(app, "Reclosers"))
+
+    relay_index, _ = lc.load_type_indexes(app, path)
+    assert relay_index.get(OC_RELAY_TYPE) is moved
+    assert crawls["relay"] == 2
@@ -0,0 +1,96 @@
+"""
+Tests for reading and writing the mapping file bundle.
+
+The bundle lives in a cache directory that may be shared, so it must be
+plain JSON that reads back to the same snapshot the CSVs give.
+"""
+
+import json
+import os
+import pickle
+
+import pytest
+
+from update_powerfactory import mapping_bundle as mb
+
+STAMP = "stamp-1"
+
+SNAPSHOT = {
+    "type_mapping": {"RC01": ("rc01.csv", "Relay Type A")},
+    "mapping_files": {
+        "rc01.csv": [["OC1", "Ipset", "1.0"], ["DIP", "aDipset", "3"]],
+        "missing.csv": None,
+    },
+    "mapping_file_versions": {"rc01.csv": "2"},
+    "dip_groups": {"rc01.csv": {"DIP": (1,)}},
+    "curve_mapping": [["Relay Type A", "1", "SI", "SI"]],
+    "curve_code_index": {"1": (0, "SI", True)},
+}
+
+
+def bundle(**changes):
+    result = {
+        "format": mb.BUNDLE_FORMAT, "stamp": STAMP, "created": 0.0,
+        "mapping": SNAPSHOT,
+    }
+    result.update(changes)
+    return result
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "mapping_bundle.json"
+
+
+def test_round_trip_restores_the_snapshot(path):
+    mb.write_bundle(path, bundle())
+
+    assert mb.read_bundle(path, STAMP)["mapping"] == SNAPSHOT
+    assert json.loads(path.read_text(encoding="utf-8"))["stamp"] == STAMP
+
+
+def test_round_trip_without_curve_index(path):
+    mb.write_bundle(path, bundle(mapping=dict(SNAPSHOT, curve_code_index=None)))
+
+    assert mb.read_bundle(path, STAMP)["mapping"]["curve_code_index"] is None
+
+
+@pytest.mark.parametrize("changes", [
+    {"stamp": "stamp-2"},
+    {"format": mb.BUNDLE_FORMAT - 1},
+    {"mapping": {"type_mapping": {}}},
+    {"mapping": dict(SNAPSHOT, dip_groups={"rc01.csv": [1]})},
+], ids=["stamp", "format", "missing keys", "bad layout"])
+def test_stale_or_malformed_bundles_are_ignored(path, changes):
+    mb.write_bundle(path, bundle(**changes))
+
+    assert mb.read_bundle(path, STAMP) is None
+
+
+def test_unreadable_files_are_ignored(path):
+    assert mb.read_bundle(path, STAMP) is None
+
+    path.write_text('{"format": ', encoding="utf-8")
+    assert mb.read_bundle(path, STAMP) is None
+
+
+def test_pickle_files_are_not_loaded(path):
+    path.write_bytes(pickle.dumps(bundle()))
+
+    assert mb.read_bundle(path, STAMP) is None
+
+
+def test_failed_write_removes_the_temporary_file(path, monkeypatch):
+    def fail(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    mb.write_bundle(path, bundle())
+
+    assert list(path.parent.iterdir()) == []
+
+
+def test_unserialisable_bundle_removes_the_temporary_file(path):
+    mb.write_bundle(path, bundle(created=object()))
+
+    assert list(path.parent.iterdir()) == []
@@ -0,0 +1,149 @@
+"""
+Tests for the read cache of the PowerFactory API proxy.
+
+Every write made through the proxy must be seen by the next read, whether
+it renames, retypes, deletes or moves an object.
+"""
+
+import pytest
+
+from benchmarks.fake_pf import FakeDataObject
+from utils.pf_proxy import ApiCallCounter, ReadCache
+
+
+@pytest.fixture
+def tree():
+    """Two grids, a cubicle with a relay and a fuse in the first."""
+    root = FakeDataObject("IntPrj", "Project")
+    grids = [FakeDataObject("ElmNet", name, root) for name in ("Grid A", "Grid B")]
+    cubicle = FakeDataObject("StaCubic", "Cub_1", grids[0])
+    relay = FakeDataObject("ElmRelay", "RC-1", cubicle)
+    fuse = FakeDataObject("RelFuse", "FU-1", cubicle)
+    types = [FakeDataObject("TypFuse", name, root) for name in ("25K", "40K")]
+    fuse.typ_id = types[0]
+    return {
+        "grids": grids, "cubicle": cubicle, "relay": relay, "fuse": fuse,
+        "types": types,
+    }
+
+
+@pytest.fixture
+def counter():
+    return ApiCallCounter(stage_provider=lambda: "", read_cache=ReadCache())
+
+
+def test_repeat_reads_are_served_from_the_cache(tree, counter):
+    relay = counter.wrap(tree["relay"])
+    for _ in range(3):
+        assert relay.loc_name == "RC-1"
+        assert relay.GetAttribute("r:fold_id:e:loc_name") == "Cub_1"
+        assert relay.GetClassName() == "ElmRelay"
+
+    assert counter.calls() == 2
+    assert counter.calls(method="getattr") == 1
+    assert counter.calls(method="GetAttribute") == 1
+    assert counter.read_cache.get_stats()["misses"] == 2
+
+
+@pytest.mark.parametrize("rename", [
+    lambda obj, name: setattr(obj, "loc_name", name),
+    lambda obj, name: obj.SetAttribute("loc_name", name),
+    lambda obj, name: obj.SetAttribute("e:loc_name", name),
+], ids=["setattr", "SetAttribute", "SetAttribute e:"])
+def test_rename_is_seen(tree, counter, rename):
+    relay = counter.wrap(tree["relay"])
+    assert relay.loc_name == "RC-1"
+    assert relay.GetAttribute("e:loc_name") == "RC-1"
+
+    rename(relay, "RC-2")
+    assert relay.loc_name == "RC-2"
+    assert relay.GetAttribute("e:loc_name") == "RC-2"
+
+
+def test_parent_rename_is_seen_by_chained_reads(tree, counter):
+    relay = counter.wrap(tree["relay"])
+    fuse = counter.wrap(tree["fuse"])
+    assert relay.GetAttribute("r:fold_id:e:loc_name") == "Cub_1"
+    assert fuse.GetAttribute("r:fold_id:e:loc_name") == "Cub_1"
+
+    counter.wrap(tree["cubicle"]).loc_name = "Cub_2"
+    assert relay.GetAttribute("r:fold_id:e:loc_name") == "Cub_2"
+    assert fuse.GetAttribute("r:fold_id:e:loc_name") == "Cub_2"
+
+
+def test_write_through_a_reference_is_seen(tree, counter):
+    relay = counter.wrap(tree["relay"])
+    cubicle = counter.wrap(tree["cubicle"])
+    assert cubicle.loc_name == "Cub_1"
+    assert relay.GetAttribute("r:fold_id:e:loc_name") == "Cub_1"
+
+    relay.SetAttribute("r:fold_id:e:loc_name", "Cub_3")
+    assert cubicle.loc_name == "Cub_3"
+    assert relay.GetAttribute("r:fold_id:e:loc_name") == "Cub_3"
+
+
+@pytest.mark.parametrize("retype", [
+    lambda obj, typ: setattr(obj, "typ_id", typ),
+    lambda obj, typ: obj.SetAttribute("typ_id", typ),
+], ids=["setattr", "SetAttribute"])
+def test_type_change_is_seen(tree, counter, retype):
+    fuse = counter.wrap(tree["fuse"])
+    assert fuse.typ_id == tree["types"][0]
+    assert fuse.GetAttribute("r:typ_id:e:loc_name") == "25K"
+
+    retype(fuse, counter.wrap(tree["types"][1]))
+    assert fuse.typ_id == tree["types"][1]
+    assert fuse.GetAttribute("r:typ_id:e:loc_name") == "40K"
+
+
+def test_delete_drops_the_object_and_chains(tree, counter):
+    relay = counter.wrap(tree["relay"])
+    fuse = counter.wrap(tree["fuse"])
+    assert relay.loc_name == "RC-1"
+    assert fuse.GetAttribute("r:fold_id:e:loc_name") == "Cub_1"
+    reads = counter.calls()
+
+    relay.Delete()
+    assert relay.IsDeleted()
+    assert relay.loc_name == "RC-1"
+    assert fuse.GetAttribute("r:fold_id:e:loc_name") == "Cub_1"
+    # Delete and IsDeleted, then both reads go back to the API
+    assert counter.calls() == reads + 4
+
+
+def test_move_is_seen_by_the_moved_object(tree, counter):
+    relay = counter.wrap(tree["relay"])
+    assert relay.fold_id == tree["cubicle"]
+    assert relay.cpGrid == tree["grids"][0]
+
+    target = FakeDataObject("StaCubic", "Cub_B", tree["grids"][1])
+    assert counter.wrap(target).Move(relay) == 0
+    assert relay.fold_id == target
+    assert relay.cpGrid == tree["grids"][1]
+    assert relay.GetAttribute("r:fold_id:e:loc_name") == "Cub_B"
+
+
+def test_move_is_seen_by_contained_objects(tree, counter):
+    relay = counter.wrap(tree["relay"])
+    assert relay.cpGrid == tree["grids"][0]
+    assert relay.GetAttribute("r:cpGrid:e:loc_name") == "Grid A"
+
+    counter.wrap(tree["grids"][1]).Move(counter.wrap(tree["cubicle"]))
+    assert relay.cpGrid == tree["grids"][1]
+    assert relay.GetAttribute("r:cpGrid:e:loc_name") == "Grid B"
+
+
+def test_reads_match_an_uncached_proxy(tree, counter):
+    uncached = ApiCallCounter(stage_provider=lambda: "")
+    cached_relay = counter.wrap(tree["relay"])
+    plain_relay = uncached.wrap(tree["relay"])
+    paths = ["loc_name", "r:fold_id:e:loc_name", "r:cpGrid:e:loc_name"]
+
+    def reads(relay):
+        attributes = [relay.GetAttribute(path) for path in paths]
+        return attributes + [relay.fold_id, relay.cpGrid]
+
+    assert reads(cached_relay) == reads(plain_relay)
+    cached_relay.loc_name = "RC-9"
+    counter.wrap(tree["grids"][1]).Move(counter.wrap(tree["cubicle"]))
+    assert reads(cached_relay) == reads(plain_relay)
@@ -0,0 +1,242 @@
+"""
+Equivalence tests for the dip switch grouping and string rendering.
+
+The expected values are the outputs of the character-by-character dip
+string builder and the per-element mapping scan that the bitmasks and
+grouped rows replaced (old_dip_set and old_dip_groups below), for the
+same inputs.
+"""
+
+import itertools
+
+import pytest
+
+from benchmarks.fake_pf import FakeDataObject
+from update_powerfactory import relay_logic_elements as rle
+from update_powerfactory.mapping_file import group_dip_rows
+from update_powerfactory.setting_utils import build_setting_key
+
+
+def old_dip_value(setting, line):
+    """The switch state of one mapping line, as "1" or "0"."""
+    try:
+        setting_int = int(setting)
+        if setting_int == 1:
+            return "1"
+        elif setting_int == 0:
+            return "0"
+    except (ValueError, TypeError):
+        pass
+
+    setting_str = str(setting)
+    pattern = str(line[-1]) if line else ""
+    if pattern and pattern in setting_str:
+        return "1"
+    if "32" in setting_str:
+        return "1"
+    return "0"
+
+
+def old_dip_set(element_mapping, setting_dict, existing_dip_set, dip_names):
+    """The dip string builder the bitmasks replaced."""
+    dip_set = list(existing_dip_set.replace("1", "0"))
+    for line in element_mapping:
+        setting = setting_dict.get(build_setting_key(line), 0)
+        dip_index = next(
+            (i for i, name in enumerate(dip_names) if name == line[2]), None
+        )
+        if dip_index is not None:
+            dip_set[dip_index] = old_dip_value(setting, line)
+    return "".join(dip_set)
+
+
+def old_dip_groups(rows):
+    """The rows of each dip element, as the per-element scan found them."""
+    names = dict.fromkeys(row[1] for row in rows if "_dip" in row[1])
+    return {name: [row for row in rows if name in row[1]] for name in names}
+
+
+@pytest.fixture(autouse=True)
+def _clear_dip_cache():
+    rle.clear_cache()
+    yield
+    rle.clear_cache()
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+# (dip base, written bitmask, on bitmask, expected dip string)
+RENDER_CASES = [
+    ("00000", 0b00000, 0b00000, "00000"),
+    ("00000", 0b00101, 0b00001, "10000"),
+    ("00000", 0b11111, 0b10101, "10101"),
+    ("00000", 0b00010, 0b00010, "01000"),
+    # Switches not written keep the base character
+    ("0x0-0", 0b00001, 0b00001, "1x0-0"),
+    ("0x0-0", 0b00010, 0b00010, "010-0"),
+    ("0x0-0", 0b01000, 0b00000, "0x000"),
+    ("ab", 0b00, 0b11, "ab"),
+    ("", 0, 0, ""),
+]
+
+
+@pytest.mark.parametrize("dip_base, written, on, expected", RENDER_CASES)
+def test_render_dip_set(dip_base, written, on, expected):
+    assert rle._render_dip_set(dip_base, written, on) == expected
+
+
+@pytest.mark.parametrize("dip_base, written", [
+    ("000", 0b1000), ("", 0b1), ("0x", 0b110),
+])
+def test_render_dip_set_out_of_range(dip_base, written):
+    with pytest.raises(IndexError):
+        rle._render_dip_set(dip_base, written, written)
+
+
+# =============================================================================
+# Dip Settings
+# =============================================================================
+
+DIP_NAMES = ["S1", "S2", "S3", "S4", "S5"]
+
+
+def dip_line(switch, pattern="ON"):
+    return ["Relay Model", "Logic_dip", switch, "Dip", "Switch", pattern]
+
+
+def setting_key(switch):
+    return build_setting_key(dip_line(switch))
+
+
+SETTINGS = [1, 0, "1", "0", 1.0, "1.0", True, None, "ON", "on", "32A", "x", 7]
+EXISTING = ["00000", "11111", "10110", "1x0-1", "-----", "2z1y0"]
+
+
+# Five consecutive settings, starting at each setting in turn
+SETTING_ROTATIONS = [
+    tuple(itertools.islice(itertools.cycle(SETTINGS), start, start + 5))
+    for start in range(len(SETTINGS))
+]
+
+
+def calculate(mapping, settings, existing, dip_names):
+    """Dip string of the new and the old builder for settings by switch."""
+    setting_dict = {setting_key(name): value for name, value in settings.items()}
+    return (
+        rle._calculate_dip_settings(None, mapping, setting_dict, existing, dip_names),
+        old_dip_set(mapping, setting_dict, existing, dip_names),
+    )
+
+
+@pytest.mark.parametrize(
+    "existing, settings", list(itertools.product(EXISTING, SETTING_ROTATIONS))
+)
+def test_calculate_dip_settings_matches_old_builder(existing, settings):
+    mapping = [dip_line(name) for name in DIP_NAMES]
+    settings = dict(zip(DIP_NAMES, settings))
+
+    new, old = calculate(mapping, settings, existing, DIP_NAMES)
+    assert new == old
+    # Memoised
+    assert calculate(mapping, settings, existing, DIP_NAMES) == (old, old)
+
+
+# (mapping lines, settings by switch, existing dip string, dip names)
+DIP_SETTING_CASES = [
+    # Missing settings default to 0
+    ([dip_line("S1"), dip_line("S2")], {"S1": 1}, "11", ["S1", "S2"]),
+    # A later line for the same switch replaces an earlier one
+    ([dip_line("S1"), dip_line("S1", "X")], {"S1": "ON"}, "00", ["S1", "S2"]),
+    ([dip_line("S1", "X"), dip_line("S1")], {"S1": "ON"}, "00", ["S1", "S2"]),
+    # Switch names the type does not list are skipped
+    ([dip_line("S9"), dip_line("S2")], {"S9": 1, "S2": 1}, "1x", ["S1", "S2"]),
+    # Duplicate names use the first position
+    ([dip_line("S1")], {"S1": 1}, "000", ["S2", "S1", "S1"]),
+    # Lines in a different order to the switches
+    (
+        [dip_line("S3"), dip_line("S1"), dip_line("S2")],
+        {"S1": 1, "S3": "32"}, "0-0", ["S1", "S2", "S3"],
+    ),
+    # Patterns match anywhere in the setting string
+    (
+        [dip_line("S1", "IDMT"), dip_line("S2", "")],
+        {"S1": "IDMT-SI", "S2": "SI"}, "01", ["S1", "S2"],
+    ),
+    # No names from the element type
+    ([dip_line("S1")], {"S1": 1}, "0110", []),
+]
+
+
+@pytest.mark.parametrize("mapping, settings, existing, dip_names", DIP_SETTING_CASES)
+def test_calculate_dip_settings_cases(mapping, settings, existing, dip_names):
+    new, old = calculate(mapping, settings, existing, dip_names)
+    assert new == old
+
+
+def test_calculate_dip_settings_keeps_equal_settings_apart():
+    mapping = [dip_line("S1", "X")]
+    # 1.0 and "1" convert to 1 (ON); "1.0" does not convert and is OFF
+    for value, expected in [(1.0, "1"), ("1.0", "0"), (1, "1"), ("1", "1")]:
+        assert calculate(mapping, {"S1": value}, "0", ["S1"]) == (expected, expected)
+
+
+def test_calculate_dip_settings_switch_beyond_the_string():
+    mapping = [dip_line("S3")]
+    setting_dict = {setting_key("S3"): 1}
+    dip_names = ["S1", "S2", "S3"]
+
+    with pytest.raises(IndexError):
+        old_dip_set(mapping, setting_dict, "00", dip_names)
+    with pytest.raises(IndexError):
+        rle._calculate_dip_settings(None, mapping, setting_dict, "00", dip_names)
+
+
+def test_calculate_dip_settings_reads_names_from_the_type():
+    dip_type = FakeDataObject("TypLogdip", "Dip Type", sInput=["S1,S2,S3"])
+    element = FakeDataObject("RelLogdip", "Logic", typ_id=dip_type)
+    mapping = [dip_line("S2"), dip_line("S3")]
+    setting_dict = {setting_key("S2"): 1}
+
+    assert rle._calculate_dip_settings(element, mapping, setting_dict, "111") == "010"
+
+
+# =============================================================================
+# Grouping
+# =============================================================================
+
+GROUP_ROWS = [
+    ["Relay Model", "I>", "Ipset", "use_setting"],
+    ["Relay Model", "E_dip", "S1", "ON"],
+    ["Relay Model", "OE_dip", "S1", "ON"],
+    ["Relay Model", "E_dip", "S2", "ON"],
+    ["Relay Model", "Logic_dip", "S1", "ON"],
+    ["Relay Model", "Logic_dip_2", "S1", "ON"],
+    ["Relay Model", "Dip", "S1", "ON"],
+]
+
+
+@pytest.mark.parametrize("rows", [
+    GROUP_ROWS,
+    list(reversed(GROUP_ROWS)),
+    [row for row in GROUP_ROWS if "_dip" not in row[1]],
+    [],
+])
+def test_group_dip_rows_matches_old_scan(rows):
+    groups = group_dip_rows(rows)
+
+    assert list(groups) == list(old_dip_groups(rows))
+    assert {
+        name: [rows[position] for position in positions]
+        for name, positions in groups.items()
+    } == old_dip_groups(rows)
+
+
+def test_group_dip_rows_positions():
+    assert group_dip_rows(GROUP_ROWS) == {
+        "E_dip": (1, 2, 3),
+        "OE_dip": (2,),
+        "Logic_dip": (4, 5),
+        "Logic_dip_2": (5,),
+    }
@@ -0,0 +1,141 @@
+"""
+Equivalence tests for the reclosing logic table.
+
+The expected values are the outputs of _build_single_row_logic, the row
+builder logic_table() replaced, for the same inputs.
+"""
+
+import pytest
+
+from update_powerfactory import relay_reclosing as rr
+from update_powerfactory.relay_reclosing import LogicRow, logic_table
+
+NAN = float("nan")
+
+# (setting, trip number, on/off key, reclose flag, trips to lockout,
+#  expected row values)
+LOGIC_ROW_CASES = [
+    # Trips to lockout 0: every row is empty
+    ("off", "ALL", "off", "N", 0, []),
+    ("on", 2, "off", "N", 0, []),
+    (2, "ALL", "off", "Y", 0, []),
+    (NAN, "ALL", "off", "Y", 0, []),
+    ("x", 1, "off", "Y", 0, []),
+
+    # Trips to lockout 1
+    ("off", "ALL", "off", "N", 1, [0.0]),
+    ("OFF", "ALL", "off", "N", 1, [0.0]),
+    ("on", "ALL", "off", "N", 1, [2.0]),
+    (1, "ALL", "1", "N", 1, [0.0]),
+    ("off", 2, "off", "N", 1, [0.0]),
+    ("on", 2, "off", "N", 1, [0.0]),
+    ("None", "ALL", "off", "Y", 1, [2.0]),
+    (2, "ALL", "off", "Y", 1, [2.0]),
+    ("3", "ALL", "off", "Y", 1, [2.0]),
+    (2.5, "ALL", "off", "Y", 1, [2.0]),
+    (0, "ALL", "off", "Y", 1, [2.0]),
+    (NAN, "ALL", "off", "Y", 1, [2.0]),
+    ("nan", "ALL", "off", "Y", 1, [2.0]),
+    # The setting is not parsed with a single trip
+    ("x", "ALL", "off", "Y", 1, [2.0]),
+    ("x", 1, "off", "Y", 1, [2.0]),
+    ("x", 2, "off", "Y", 1, [0.0]),
+
+    # Trips to lockout 4
+    ("off", "ALL", "off", "N", 4, [0.0, 0.0, 0.0, 0.0]),
+    ("OFF", "ALL", "off", "N", 4, [0.0, 0.0, 0.0, 0.0]),
+    ("on", "ALL", "off", "N", 4, [2.0, 2.0, 2.0, 2.0]),
+    (1, "ALL", "1", "N", 4, [0.0, 0.0, 0.0, 0.0]),
+    ("off", 2, "off", "N", 4, [0.0, 0.0, 0.0, 0.0]),
+    ("on", 2, "off", "N", 4, [0.0, 2.0, 0.0, 0.0]),
+    ("on", 4, "off", "N", 4, [0.0, 0.0, 0.0, 2.0]),
+    ("None", "ALL", "off", "Y", 4, [2.0, 0.0, 0.0, 2.0]),
+    (2, "ALL", "off", "Y", 4, [1.0, 2.0, 0.0, 2.0]),
+    ("3", "ALL", "off", "Y", 4, [1.0, 1.0, 2.0, 2.0]),
+    (2.5, "ALL", "off", "Y", 4, [1.0, 1.0, 0.0, 2.0]),
+    (4, "ALL", "off", "Y", 4, [1.0, 1.0, 1.0, 2.0]),
+    (6, "ALL", "off", "Y", 4, [1.0, 1.0, 1.0, 2.0]),
+    (0, "ALL", "off", "Y", 4, [0.0, 0.0, 0.0, 2.0]),
+    # A NaN setting leaves only the lockout trip in the row
+    (NAN, "ALL", "off", "Y", 4, [2.0]),
+    ("nan", "ALL", "off", "Y", 4, [2.0]),
+    ("x", 1, "off", "Y", 4, [1.0, 0.0, 0.0, 0.0]),
+    ("x", 2, "off", "Y", 4, [0.0, 1.0, 0.0, 0.0]),
+    ("x", 4, "off", "Y", 4, [0.0, 0.0, 0.0, 2.0]),
+    ("x", 5, "off", "Y", 4, [0.0, 0.0, 0.0, 0.0]),
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_table_cache():
+    rr.clear_cache()
+    yield
+    rr.clear_cache()
+
+
+@pytest.mark.parametrize(
+    "setting, trip_num, on_off_key, recl, op_to_lockout, expected",
+    LOGIC_ROW_CASES,
+)
+def test_logic_table_row(setting, trip_num, on_off_key, recl, op_to_lockout, expected):
+    row = LogicRow("I>", setting, trip_num, on_off_key, recl)
+    assert list(logic_table((row,), op_to_lockout)["I>"]) == expected
+
+
+def test_logic_table_unparseable_setting():
+    row = LogicRow("I>", "x", "ALL", "off", "Y")
+    with pytest.raises(ValueError):
+        logic_table((row,), 4)
+
+
+def test_logic_table_later_row_replaces_earlier():
+    rows = (
+        LogicRow("I>", 2, "ALL", "off", "Y"),
+        LogicRow("IE>", "on", 1, "off", "N"),
+        LogicRow("I>", "x", 3, "off", "Y"),
+    )
+    assert logic_table(rows, 4) == {
+        "I>": (0.0, 0.0, 1.0, 0.0),
+        "IE>": (2.0, 0.0, 0.0, 0.0),
+    }
+
+
+RECLOSE_ROWS = [
+    ["Relay Model", "Recloser_logic", "I>", "Reclose", "Trips to Lockout",
+     "use_setting", "None", "ALL", "off", "Y"],
+    ["Relay Model", "Recloser_logic", "IE>", "Reclose", "Trips to Lockout",
+     "use_setting", "None", "ALL", "off", "Y"],
+    ["Relay Model", "Recloser_logic", "I>>", "Reclose", "I>> Lockout",
+     "use_setting", "None", "1", "off", "N"],
+    ["Relay Model", "Recloser", "Trips", "Reclose", "Trips to Lockout",
+     "use_setting", "None", "ALL", "off", "Y"],
+]
+
+
+def test_build_logic_rows_shares_memoised_tables():
+    settings = {
+        "Relay ModelRecloser_logicI>": 2,
+        "Relay ModelRecloser_logicIE>": "3",
+        "Relay ModelRecloser_logicI>>": "on",
+    }
+    expected = {
+        "I>": [1.0, 2.0, 0.0, 2.0],
+        "IE>": [1.0, 1.0, 2.0, 2.0],
+        "I>>": [2.0, 0.0, 0.0, 0.0],
+    }
+
+    first = rr._build_logic_rows(None, RECLOSE_ROWS, settings, None, 4, 4)
+    assert first == expected
+    assert len(rr._table_cache) == 1
+
+    # A caller changing its rows does not change the memoised table
+    first["I>"][0] = 9.0
+    second = rr._build_logic_rows(None, RECLOSE_ROWS, dict(settings), None, 4, 4)
+    assert second == expected
+    assert len(rr._table_cache) == 1
+
+    # 2 and "2" compare differently against the off value, so are not
+    # shared
+    settings["Relay ModelRecloser_logicI>"] = "2"
+    rr._build_logic_rows(None, RECLOSE_ROWS, settings, None, 4, 4)
+    assert len(rr._table_cache) == 2
@@ -0,0 +1,129 @@
+"""
+Tests for the streaming results file writer.
+
+The finalised file must read back as if every row had been written in
+one pass at the end of the run, with a header listing every column.
+"""
+
+import csv
+
+import pytest
+
+from update_powerfactory.results_writer import ResultsWriter, read_results
+
+COLUMNS = ("SUBSTATION", "PLANT_NUMBER", "RESULT")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "results.csv"
+
+
+def read_rows(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_finalise_sorts_rows_by_position(path):
+    writer = ResultsWriter(path, COLUMNS)
+    writer.write({"PLANT_NUMBER": "C"}, position=2)
+    writer.write({"PLANT_NUMBER": "A"}, position=0)
+    writer.write({"PLANT_NUMBER": "B"}, position=1)
+    writer.write({"PLANT_NUMBER": "A2"}, position=0)
+
+    assert writer.finalise() == path
+    assert [row[1] for row in read_rows(path)[1:]] == ["A", "A2", "B", "C"]
+    assert not writer.partial_path.exists()
+
+
+def test_write_all_positions_follow_the_first(path):
+    writer = ResultsWriter(path, COLUMNS)
+    writer.write({"PLANT_NUMBER": "D"}, position=3)
+    writer.write_all([{"PLANT_NUMBER": "A"}, {"PLANT_NUMBER": "B"}])
+    writer.finalise()
+
+    assert [row[1] for row in read_rows(path)[1:]] == ["A", "B", "D"]
+
+
+def test_added_columns_pad_earlier_rows(path):
+    writer = ResultsWriter(path, COLUMNS)
+    writer.write({"PLANT_NUMBER": "A", "TIME_TOTAL": "1.0"})
+    writer.add_columns(["TIME_TOTAL", "RESULT"])
+    writer.write({"PLANT_NUMBER": "B", "TIME_TOTAL": "2.0"})
+    writer.finalise()
+
+    assert read_rows(path) == [
+        ["SUBSTATION", "PLANT_NUMBER", "RESULT", "TIME_TOTAL"],
+        ["", "A", "", ""],
+        ["", "B", "", "2.0"],
+    ]
+
+
+@pytest.mark.parametrize("value", [
+    'Relay "A", bay 1',
+    "line one\nline two",
+    "comma, quote \" and\r\nCRLF",
+])
+def test_quoted_and_multiline_fields_round_trip(path, value):
+    writer = ResultsWriter(path, COLUMNS)
+    writer.write({"PLANT_NUMBER": "B", "RESULT": value}, position=1)
+    writer.write({"PLANT_NUMBER": "A", "RESULT": value}, position=0)
+    writer.add_columns(["ERROR_DETAIL"])
+    writer.write({"PLANT_NUMBER": "C", "ERROR_DETAIL": value}, position=2)
+    writer.finalise()
+
+    assert list(read_results(path)) == [
+        {"PLANT_NUMBER": "A", "RESULT": value},
+        {"PLANT_NUMBER": "B", "RESULT": value},
+        {"PLANT_NUMBER": "C", "ERROR_DETAIL": value},
+    ]
+
+
+def test_close_keeps_the_partial_file(path):
+    writer = ResultsWriter(path, COLUMNS, sync_every=1)
+    writer.write({"PLANT_NUMBER": "B"}, position=1)
+    writer.write({"PLANT_NUMBER": "A"}, position=0)
+    writer.close()
+    writer.close()
+
+    assert not path.exists()
+    assert read_rows(writer.partial_path) == [
+        list(COLUMNS), ["", "B", ""], ["", "A", ""],
+    ]
+
+
+def test_no_rows_creates_no_file(path):
+    writer = ResultsWriter(path, COLUMNS)
+
+    assert writer.finalise() is None
+    assert not path.exists()
+    assert not writer.partial_path.exists()
+
+
+def test_earlier_file_kept_until_finalise(path):
+    path.write_text("old results\n", encoding="utf-8")
+    writer = ResultsWriter(path, COLUMNS)
+    writer.write({"PLANT_NUMBER": "A"})
+
+    assert path.read_text(encoding="utf-8") == "old results\n"
+    writer.finalise()
+    assert read_rows(path) == [list(COLUMNS), ["", "A", ""]]
+
+
+def test_no_rows_removes_earlier_file(path):
+    path.write_text("old results\n", encoding="utf-8")
+    writer = ResultsWriter(path, COLUMNS)
+
+    assert writer.finalise() is None
+    assert not path.exists()
+
+
+def test_result_counts(path):
+    writer = ResultsWriter(path, COLUMNS)
+    for result in ["Updated", "Updated", "Not in PF", ""]:
+        writer.write({"PLANT_NUMBER": "A", "RESULT": result})
+    writer.write({"PLANT_NUMBER": "B"})
+    writer.close()
+
+    assert writer.rows == 5
+    assert writer.result_counts == {"Updated": 2, "Not in PF": 1, "": 2}
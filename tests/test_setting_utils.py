@@ -0,0 +1,265 @@
+"""
+Equivalence tests for the binary setting evaluation and setting adjustment.
+
+The expected values are the outputs of the string-indexing versions of
+convert_binary and determine_on_off that the integer bit operations
+replaced, and of the per-line setting_adjustment that adjust_settings
+replaced, for the same inputs.
+"""
+
+import math
+
+import pytest
+
+from update_powerfactory import setting_utils as su
+
+# (setting value, bit positions, expected bits)
+CONVERT_BINARY_CASES = [
+    (5, "123", "101"),
+    (5, "012", "010"),
+    ("5", "321", "101"),
+    (5.9, "1", "1"),
+    (0, "1", "0"),
+    (0, "21", "00"),
+    (True, "12", "10"),
+    (1023, "0000", "0000"),
+    # Negative values: the position just past the highest bit is the sign
+    (-5, "1234", "101-"),
+    (-5, "4", "-"),
+    (-1, "123", "1-0"),
+    (-8, "45", "1-"),
+    # Positions beyond the padded binary string extract "0"
+    (8191, "9", "1"),
+    (8192, "9", "0"),
+    (-4096, "9", "0"),
+    (-8192, "9", "0"),
+    (1048576, "9", "0"),
+    # Values that are not integers
+    ("abc", "1", "0"),
+    (None, "1", "0"),
+    ("1.5", "1", "0"),
+]
+
+# (setting value, disable condition, expected on/off)
+DETERMINE_ON_OFF_CASES = [
+    # Integer conditions index the binary string from the left
+    ("101", 0, 0),
+    ("101", 1, 1),
+    ("101", 2, 0),
+    ("101", "1", 1),
+    ("101", "2", 0),
+    (101, 0, 0),
+    (11, 1, 0),
+    (0, "1", 1),
+    # Negative conditions index from the right
+    ("101", -1, 0),
+    ("101", -3, 0),
+    # Out of range positions are enabled
+    ("101", 3, 1),
+    ("101", -4, 1),
+    # Exponent strings are padded to the exponent plus one digits
+    ("1.1e5", 0, 0),
+    ("1.1e5", 1, 0),
+    ("1.1e5", 2, 1),
+    ("1.1e5", 5, 1),
+    ("1.1e5", 6, 1),
+    ("1.0e3", 3, 1),
+    ("1e2", 0, 0),
+    ("1e2", 2, 1),
+    ("1e2", 3, 1),
+    ("1.1e", 0, 0),
+    ("1.1ex", 1, 0),
+    (101.0, 0, 0),
+    (110000.0, 0, 0),
+    # Values that are not binary strings are enabled
+    ("102", 0, 1),
+    ("-101", 0, 1),
+    # List conditions
+    ("ON", "[on, off]", 1),
+    ("off", "[on, off]", 1),
+    ("Auto", "[on, off]", 0),
+    ("auto", "[On, Auto]", 1),
+    # Single conditions
+    ("on", "on", 1),
+    ("ON", "On", 1),
+    ("on", "off", 0),
+    (1, "x", 0),
+    (True, "true", 1),
+    (1.0, "1.0", 1),
+    # Empty settings
+    ("", "ON", 0),
+    (None, "OFF", 1),
+    (0, "on", 0),
+    ("", "xyz", 1),
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    su.clear_cache()
+    yield
+    su.clear_cache()
+
+
+@pytest.mark.parametrize("setting_value, positions, expected", CONVERT_BINARY_CASES)
+def test_convert_binary(setting_value, positions, expected):
+    assert (
+        su.convert_binary(None, setting_value, ["Relay Model", positions, "None"])
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "setting_value, disable_cond, expected", DETERMINE_ON_OFF_CASES
+)
+def test_determine_on_off(setting_value, disable_cond, expected):
+    assert su.determine_on_off(None, setting_value, disable_cond) == expected
+
+
+@pytest.mark.parametrize(
+    "setting_value, disable_cond, expected", DETERMINE_ON_OFF_CASES
+)
+def test_determine_on_off_memoised(setting_value, disable_cond, expected):
+    su.determine_on_off(None, setting_value, disable_cond)
+    assert su.determine_on_off(None, setting_value, disable_cond) == expected
+
+
+def test_determine_on_off_typed_values():
+    # 1, 1.0 and True are equal but their strings differ
+    assert su.determine_on_off(None, 1, "[1, 2]") == 1
+    assert su.determine_on_off(None, 1.0, "[1, 2]") == 0
+    assert su.determine_on_off(None, True, "[1, 2]") == 0
+
+
+def test_determine_on_off_unhashable_condition():
+    assert su.determine_on_off(None, "on", ["on"]) == 1
+
+
+@pytest.mark.parametrize(
+    "setting_str, expected",
+    [
+        ("101", (3, 0b101)),
+        ("1.1e5", (6, 0b110000)),
+        ("", (0, 0)),
+        ("-101", None),
+        ("12", None),
+    ],
+)
+def test_binary_digits(setting_str, expected):
+    assert su._binary_digits(setting_str) == expected
+
+
+# Mapping file lines by name: CT adjustments in the last column, or an
+# operator at [6] and operand at [7]
+ADJUSTMENT_LINES = {
+    name: ["Relay Model", "I>", "Ipset", "Phase OC", "Pickup", "use_setting"] + columns
+    for name, columns in {
+        "primary": ["primary"],
+        "secondary": ["secondary"],
+        "ctr": ["ctr"],
+        "perc_pu": ["perc_pu"],
+        "plus": ["+", "2.5"],
+        "minus": ["-", "2"],
+        "times": ["*", "3"],
+        "divide": ["/", "4"],
+        "divide by zero": ["/", "0"],
+        "unknown operator": ["^", "2"],
+        "bad operand": ["+", "x"],
+        "no operand": ["+"],
+        "on/off list": ["[on, off]", "1"],
+        "bit": ["1", "2"],
+    }.items()
+}
+
+ADJUSTMENT_KEY = "Relay ModelI>Ipset"
+
+# Setting value standing for a setting missing from the dictionary
+MISSING = object()
+
+# (line name, setting value, CT primary, CT secondary, expected value)
+SETTING_ADJUSTMENT_CASES = [
+    ("primary", "120", 400, 1, 0.3),
+    ("primary", 120, 400, 1, 0.3),
+    ("primary", "120", 0, 5, None),
+    ("primary", "on", 400, 1, 0),
+    ("primary", None, 400, 1, 1),
+    ("primary", MISSING, 400, 1, 0.0),
+    ("primary", MISSING, 0, 5, None),
+    ("secondary", "120", 400, 5, 24.0),
+    ("secondary", "120", 400, 0, None),
+    ("secondary", "1e2", 400, 5, 20.0),
+    ("ctr", "120", 400, 5, 1.5),
+    ("ctr", "120", 0, 5, None),
+    ("ctr", "0.5", 400, 1, 0.00125),
+    ("perc_pu", "120", 400, 5, 6.0),
+    ("perc_pu", "-3", 400, 5, -0.15),
+    ("perc_pu", "120", 0, 0, 0.0),
+    ("plus", "120", 400, 1, 122.5),
+    ("plus", -3, 400, 1, -0.5),
+    ("plus", MISSING, 400, 1, 2.5),
+    ("plus", "nan", 400, 1, float("nan")),
+    ("minus", "120", 400, 1, 118.0),
+    ("times", "0.5", 400, 1, 1.5),
+    ("divide", "120", 400, 1, 30.0),
+    ("divide by zero", "120", 400, 1, 0),
+    ("unknown operator", "120", 400, 1, 120.0),
+    ("bad operand", "120", 400, 1, 120.0),
+    ("no operand", "120", 400, 1, 120.0),
+    # Values that are not numbers are evaluated against column G
+    ("on/off list", "on", 400, 1, 1),
+    ("on/off list", "Auto", 400, 1, 0),
+    ("on/off list", "120", 400, 1, 120.0),
+    ("on/off list", "", 400, 1, 1),
+    ("bit", "101", 400, 1, 101.0),
+    ("bit", "Auto", 400, 1, 1),
+    ("bit", "on", 400, 1, 1),
+    ("bit", None, 400, 1, 1),
+]
+
+
+class CtDevice:
+    """ProtectionDevice stand-in with CT ratios."""
+
+    def __init__(self, ct_primary, ct_secondary):
+        self.ct_primary = ct_primary
+        self.ct_secondary = ct_secondary
+
+
+def same_value(actual, expected):
+    if isinstance(expected, float) and math.isnan(expected):
+        return isinstance(actual, float) and math.isnan(actual)
+    return actual == expected and type(actual) is type(expected)
+
+
+@pytest.mark.parametrize(
+    "line_name, setting_value, primary, secondary, expected", SETTING_ADJUSTMENT_CASES
+)
+def test_setting_adjustment(line_name, setting_value, primary, secondary, expected):
+    settings = {} if setting_value is MISSING else {ADJUSTMENT_KEY: setting_value}
+    adjusted = su.setting_adjustment(
+        None, ADJUSTMENT_LINES[line_name], settings, CtDevice(primary, secondary)
+    )
+    assert same_value(adjusted, expected)
+
+
+@pytest.mark.parametrize("primary, secondary", sorted({
+    (primary, secondary) for _, _, primary, secondary, _ in SETTING_ADJUSTMENT_CASES
+}))
+def test_adjust_settings_batch(primary, secondary):
+    cases = [
+        (ADJUSTMENT_LINES[line_name], setting_value, expected)
+        for line_name, setting_value, case_primary, case_secondary, expected
+        in SETTING_ADJUSTMENT_CASES
+        if (case_primary, case_secondary) == (primary, secondary)
+        and setting_value is not MISSING
+    ]
+    adjusted = su.adjust_settings(
+        None,
+        [line for line, _, _ in cases],
+        [setting_value for _, setting_value, _ in cases],
+        CtDevice(primary, secondary),
+    )
+
+    assert len(adjusted) == len(cases)
+    for (line, setting_value, expected), value in zip(cases, adjusted):
+        assert same_value(value, expected), (line, setting_value)
@@ -13,19 +13,33 @@ Package Structure:
     fuse_settings.py      - Fuse configuration
     ct_settings.py        - Current transformer configuration
     vt_settings.py        - Voltage transformer configuration
+    slot_layout.py        - CT/VT slot layouts cached per relay type
     mapping_file.py       - Settings mapping file handling
     type_index.py         - Relay/fuse type indexes for O(1) lookups
+    library_catalog.py    - Persisted catalog of library types for the indexes
+    mapping_bundle.py     - Compiled bundle of the mapping files
+    setting_plan.py       - Memoised setting plans shared by identical devices
+    run_journal.py        - Checkpoint/resume journal for long update runs
+    results_writer.py     - Streaming results file writer
+    commit_scheduler.py   - Write cache commit scheduling
+    device_order.py       - Locality-aware device ordering
 
 Main entry points:
     update_pf(): Main function to update all devices
     RelayTypeIndex: Indexed relay type lookups
     FuseTypeIndex: Indexed fuse type lookups
+    InstrumentTypeIndex: Indexed CT/VT type lookups with create-on-miss
 
 Performance optimizations in this version:
     - O(1) relay type lookups via RelayTypeIndex
     - O(1) fuse type lookups via FuseTypeIndex
+    - O(1) CT/VT type lookups via InstrumentTypeIndex
+    - Type indexes created from a persisted library catalog
     - Write caching during batch updates
     - Mapping file caching
+    - Setting plan memoisation across identical devices
+    - Periodic commits with a resumable run journal
+    - Devices processed in (pattern, substation, cubicle) order
 
 Usage:
     from update_powerfactory.orchestrator import update_pf
@@ -50,6 +64,7 @@ from core import UpdateResult
 from update_powerfactory.type_index import (
     RelayTypeIndex,
     FuseTypeIndex,
+    InstrumentTypeIndex,
     build_type_indexes,
 )
 
@@ -59,6 +74,7 @@ from update_powerfactory.setting_utils import (
     determine_on_off,
     convert_binary,
     setting_adjustment,
+    adjust_settings,
     convert_string_to_list,
 )
 
@@ -68,11 +84,13 @@ __all__ = [
     # Type indexes
     "RelayTypeIndex",
     "FuseTypeIndex",
+    "InstrumentTypeIndex",
     "build_type_indexes",
     # Utility functions
     "build_setting_key",
     "determine_on_off",
     "convert_binary",
     "setting_adjustment",
+    "adjust_settings",
     "convert_string_to_list",
 ]
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+Write cache commit scheduling for update runs.
+
+update_pf enables the PowerFactory write cache for the device loop. Holding
+every change until the end of a large project grows the PowerFactory
+process memory throughout the run, while committing after every device
+makes the run slow. The CommitScheduler flushes the write cache according
+to a CommitPolicy:
+- Every N devices
+- Every M seconds
+- At substation boundaries (before the first device of a new substation)
+
+Each flush records its trigger, the number of devices it committed and
+its latency. If psutil is installed, the process memory is also sampled
+after each flush. PowerFactory does not expose the write cache size, so
+the pending device count is the cache size measure. get_stats() summarises
+these figures for tuning the policy.
+
+Usage:
+    from update_powerfactory.commit_scheduler import CommitScheduler, CommitPolicy
+
+    scheduler = CommitScheduler(app, CommitPolicy(every_devices=200), journal)
+    for device_object in devices:
+        scheduler.before_device(device_object)
+        ...
+        scheduler.device_completed()
+    scheduler.flush("end")
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from update_powerfactory.run_journal import RunJournal
+from logging_config import get_logger
+from utils.profiling import stage
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CommitPolicy:
+    """
+    When to flush the write cache during an update run.
+
+    A trigger set to 0 (or False) is disabled. With every trigger disabled,
+    changes are committed once at the end of the run.
+
+    Attributes:
+        every_devices: Flush after this many devices
+        every_seconds: Flush when this many seconds have passed since the
+            last flush
+        at_substation_boundary: Flush before the first device of a new
+            substation
+    """
+
+    every_devices: int = 200
+    every_seconds: float = 0.0
+    at_substation_boundary: bool = False
+
+
+# Default policy used by update_pf
+DEFAULT_COMMIT_POLICY = CommitPolicy()
+
+
+@dataclass
+class FlushRecord:
+    """
+    Measurements for a single write cache flush.
+
+    Attributes:
+        reason: Trigger that caused the flush
+        devices: Number of devices committed by the flush
+        latency: Seconds spent in WriteChangesToDb
+        memory_mb: Process memory after the flush, if psutil is available
+    """
+
+    reason: str
+    devices: int
+    latency: float
+    memory_mb: Optional[float] = None
+
+
+def _process_memory_mb() -> Optional[float]:
+    """Get the resident memory of this process in MB, if measurable."""
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except (OSError, psutil.Error):
+        return None
+
+
+class CommitScheduler:
+    """
+    Flushes the PowerFactory write cache according to a CommitPolicy.
+
+    Attributes:
+        policy: The commit policy in use
+        flushes: FlushRecord for every flush that committed devices
+    """
+
+    def __init__(
+        self,
+        app,
+        policy: Optional[CommitPolicy] = None,
+        journal: Optional[RunJournal] = None
+    ):
+        """
+        Create a scheduler for an update run.
+
+        Args:
+            app: PowerFactory application object
+            policy: Commit policy (defaults to DEFAULT_COMMIT_POLICY)
+            journal: Optional run journal to checkpoint after each flush
+        """
+        self.app = app
+        self.policy = policy or DEFAULT_COMMIT_POLICY
+        self.journal = journal
+        self.flushes: List[FlushRecord] = []
+
+        self._pending = 0
+        self._last_flush = time.perf_counter()
+        self._substation: Optional[str] = None
+
+    def before_device(self, device_object: Any) -> None:
+        """
+        Flush before a device if it starts a new substation.
+
+        The substation is only read from PowerFactory when the substation
+        boundary trigger is enabled.
+
+        Args:
+            device_object: The ProtectionDevice about to be processed
+        """
+        if not self.policy.at_substation_boundary:
+            return
+
+        try:
+            substation = device_object.pf_obj.GetAttribute("r:cpGrid:e:loc_name")
+        except AttributeError:
+            return
+
+        if self._substation is not None and substation != self._substation:
+            self.flush("substation")
+        self._substation = substation
+
+    def device_completed(self) -> None:
+        """Count a completed device and flush if a trigger is due."""
+        self._pending += 1
+
+        if self.policy.every_devices and self._pending >= self.policy.every_devices:
+            self.flush("devices")
+        elif (
+            self.policy.every_seconds
+            and time.perf_counter() - self._last_flush >= self.policy.every_seconds
+        ):
+            self.flush("time")
+
+    def flush(self, reason: str) -> None:
+        """
+        Commit the write cache and checkpoint the journal.
+
+        Args:
+            reason: Trigger name recorded with the flush
+        """
+        start = time.perf_counter()
+        with stage("commit"):
+            self.app.WriteChangesToDb()
+        latency = time.perf_counter() - start
+
+        if self.journal:
+            self.journal.mark_committed()
+
+        if self._pending:
+            self.flushes.append(
+                FlushRecord(reason, self._pending, latency, _process_memory_mb())
+            )
+            logger.debug(
+                f"Committed {self._pending} devices ({reason}) in {latency:.3f}s"
+            )
+
+        self._pending = 0
+        self._last_flush = time.perf_counter()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Summarise flush measurements for the run summary.
+
+        Returns:
+            Dictionary with flush counts, latency and memory figures
+        """
+        latencies = [f.latency for f in self.flushes]
+        memory = [f.memory_mb for f in self.flushes if f.memory_mb is not None]
+        by_reason: Dict[str, int] = {}
+        for f in self.flushes:
+            by_reason[f.reason] = by_reason.get(f.reason, 0) + 1
+
+        return {
+            "flushes": len(self.flushes),
+            "by_reason": by_reason,
+            "max_devices_per_flush": max((f.devices for f in self.flushes), default=0),
+            "total_latency": round(sum(latencies), 3),
+            "mean_latency": (
+                round(sum(latencies) / len(latencies), 3) if latencies else 0.0
+            ),
+            "max_latency": round(max(latencies, default=0.0), 3),
+            "peak_memory_mb": round(max(memory), 1) if memory else None,
+        }
@@ -6,20 +6,22 @@ protection relays in PowerFactory using settings from the IPS database.
 
 It includes:
 - CT slot assignment and update
-- CT type selection and creation
+- CT type selection and creation (through InstrumentTypeIndex)
 - Measurement element configuration
 """
 
 from typing import Any, Optional
 
-from utils.pf_utils import all_relevant_objects
+from update_powerfactory.slot_layout import get_slot_layout
+from update_powerfactory.type_index import InstrumentTypeIndex
 from core import UpdateResult
 
 
 def update_ct(
         app,
         device_object: Any,
-        result: UpdateResult
+        result: UpdateResult,
+        instrument_index: Optional[InstrumentTypeIndex] = None
 ) -> UpdateResult:
     """
     Update CT configuration for a protection device.
@@ -32,6 +34,8 @@ def update_ct(
         app: PowerFactory application object
         device_object: The ProtectionDevice to configure
         result: UpdateResult to update with CT information
+        instrument_index: Per-run CT/VT type index (a new one is created
+            for this call if not given)
 
     Returns:
         Updated UpdateResult with CT configuration status
@@ -39,22 +43,15 @@ def update_ct(
     # At this point the script needs to update the appropriate primary and
     # secondary turns. This means that the type needs to contain the appropriate
     # attributes.
-    ct_library = all_relevant_objects(
-        app, [app.GetLocalLibrary()], "Current Transformers.IntFolder"
-    )
-    if not ct_library:
-        ct_library = app.GetLocalLibrary().CreateObject(
-            "IntFolder", "Current Transformers"
-        )
-    else:
-        ct_library = ct_library[0]
+    if instrument_index is None:
+        instrument_index = InstrumentTypeIndex(app)
 
     if device_object.pf_obj.typ_id.fold_id.loc_name == "Reclosers":
         current_trans = update_ct_slots(app, device_object)
         # Check the type
         ct_type = current_trans.GetAttribute("e:typ_id")
         if not ct_type:
-            ct_type = select_ct_type(app, ct_library, 1, 1)
+            ct_type = instrument_index.get_ct_type(1, 1)
             current_trans.SetAttribute("e:typ_id", ct_type)
         if "swer_" in device_object.device:
             # Only need to reconfigure the CT if it was configured
@@ -70,17 +67,16 @@ def update_ct(
         # This indicates that there was not a CT linked in IPS
         # The following code clears the CT slot
         slot_objs = device_object.pf_obj.GetAttribute("pdiselm")
-        for i, item in enumerate(device_object.pf_obj.GetAttribute("r:typ_id:e:pblk")):
-            if item.GetAttribute("filtmod") == "StaCt*":
-                slot_objs[i] = None
-                break
+        layout = get_slot_layout(device_object.pf_obj.GetAttribute("typ_id"))
+        if layout.unlinked_ct_slot is not None:
+            slot_objs[layout.unlinked_ct_slot] = None
         device_object.pf_obj.SetAttribute("pdiselm", slot_objs)
         result.ct_result = "No CT Linked"
         return result
 
     secondary = int(float(device_object.ct_secondary))
     current_trans = update_ct_slots(app, device_object)
-    required_ct_type = select_ct_type(app, ct_library, primary, secondary)
+    required_ct_type = instrument_index.get_ct_type(primary, secondary)
 
     try:
         if required_ct_type.loc_name != current_trans.GetAttribute(
@@ -155,7 +151,7 @@ def update_ct_slots(app, device_object: Any) -> Any:
     pf_device = device_object.pf_obj
     cubical = pf_device.fold_id
     slot_objs = pf_device.GetAttribute("pdiselm")
-    remote_ct_slot_names = ["Ct-3P(remote)", "Winding 2 Ct"]
+    layout = get_slot_layout(pf_device.GetAttribute("typ_id"))
 
     if not device_object.ct_op_id:
         ct_name = "{}_CT".format(pf_device.loc_name)
@@ -164,53 +160,47 @@ def update_ct_slots(app, device_object: Any) -> Any:
 
     current_trans = None
 
-    for i, item in enumerate(pf_device.GetAttribute("typ_id").GetAttribute("pblk")):
-        if not item:
-            continue
-
-        filtmod = item.GetAttribute("filtmod")
-        if filtmod == "StaCt*" or filtmod == "StaCt*,StaCombi":
-            if item.loc_name in remote_ct_slot_names:
-                # Clear the remote CT slots. These get automatically populated
-                slot_objs[i] = None
-                continue
-
-            ct_obj = pf_device.GetSlot(item.GetAttribute("loc_name"))
-            if not ct_obj:
-                ct_obj_name = "Not Configured"
-            else:
-                ct_obj_name = ct_obj.loc_name
-
-            if ct_obj_name == ct_name:
-                current_trans = ct_obj
+    for i in layout.remote_ct_slots:
+        # Clear the remote CT slots. These get automatically populated
+        slot_objs[i] = None
+
+    for i, slot_name in layout.ct_slots:
+        ct_obj = pf_device.GetSlot(slot_name)
+        if not ct_obj:
+            ct_obj_name = "Not Configured"
+        else:
+            ct_obj_name = ct_obj.loc_name
+
+        if ct_obj_name == ct_name:
+            current_trans = ct_obj
+        else:
+            for obj in cubical.GetContents("*.StaCt"):
+                if not obj:
+                    continue
+                obj_name = obj.loc_name
+
+                if obj_name == ct_name:
+                    slot_objs[i] = obj
+                    current_trans = obj
+                    break
+
+                if (
+                        obj.ptapset == device_object.ct_primary
+                        and obj.stapset == device_object.ct_secondary
+                        and not device_object.ct_op_id
+                ):
+                    new_name = str()
+                    for char in device_object.pf_obj.loc_name:
+                        if char == "_":
+                            break
+                        new_name = new_name + char
+                    obj.loc_name = f"{new_name}_CT"
+                    slot_objs[i] = obj
+                    current_trans = obj
+                    break
             else:
-                for obj in cubical.GetContents("*.StaCt"):
-                    if not obj:
-                        continue
-                    obj_name = obj.loc_name
-
-                    if obj_name == ct_name:
-                        slot_objs[i] = obj
-                        current_trans = obj
-                        break
-
-                    if (
-                            obj.ptapset == device_object.ct_primary
-                            and obj.stapset == device_object.ct_secondary
-                            and not device_object.ct_op_id
-                    ):
-                        new_name = str()
-                        for char in device_object.pf_obj.loc_name:
-                            if char == "_":
-                                break
-                            new_name = new_name + char
-                        obj.loc_name = f"{new_name}_CT"
-                        slot_objs[i] = obj
-                        current_trans = obj
-                        break
-                else:
-                    current_trans = cubical.CreateObject("StaCt", ct_name)
-                    slot_objs[i] = current_trans
+                current_trans = cubical.CreateObject("StaCt", ct_name)
+                slot_objs[i] = current_trans
 
     pf_device.SetAttribute("pdiselm", slot_objs)
     return current_trans
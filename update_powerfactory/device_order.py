@@ -0,0 +1,81 @@
+"""
+Locality-aware ordering of devices for update runs.
+
+Devices reach update_pf in the order the IPS region modules produced them.
+Consecutive devices then alternate between relay patterns, substations and
+cubicles, so each device starts with cold mapping plans, relay type
+lookups, CT/VT library folders and cubicle contents.
+
+order_devices() schedules the device list by (pattern, substation, cubicle)
+so devices that share these inputs are processed together. Each scheduled
+device keeps its original index, so results can be restored to the
+original order with restore_order().
+
+Usage:
+    from update_powerfactory.device_order import order_devices, restore_order
+
+    schedule = order_devices(devices)
+    indexed_results = [(index, process(device)) for index, device in schedule]
+    results = restore_order(indexed_results)
+"""
+
+from typing import Any, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def locality_key(device_object: Any) -> Tuple[str, str, str]:
+    """
+    Get the (pattern, substation, cubicle) sort key of a device.
+
+    Args:
+        device_object: The ProtectionDevice to be processed
+
+    Returns:
+        Sort key tuple. Devices without a PowerFactory object sort
+        with empty substation and cubicle names.
+    """
+    pattern = device_object.device or device_object.fuse_type or ""
+    substation = ""
+    cubicle = ""
+
+    pf_obj = device_object.pf_obj
+    if pf_obj:
+        try:
+            substation = pf_obj.GetAttribute("r:cpGrid:e:loc_name") or ""
+            cubicle = pf_obj.GetAttribute("r:fold_id:e:loc_name") or ""
+        except AttributeError:
+            pass
+
+    return str(pattern), str(substation), str(cubicle)
+
+
+def order_devices(devices: Sequence[Any]) -> List[Tuple[int, Any]]:
+    """
+    Order devices by (pattern, substation, cubicle).
+
+    The sort is stable, so devices with equal keys keep their original
+    relative order.
+
+    Args:
+        devices: List of ProtectionDevice objects
+
+    Returns:
+        List of (original_index, device_object) tuples in processing order
+    """
+    keys = [locality_key(device_object) for device_object in devices]
+    order = sorted(range(len(devices)), key=keys.__getitem__)
+    return [(index, devices[index]) for index in order]
+
+
+def restore_order(indexed_items: List[Tuple[int, T]]) -> List[T]:
+    """
+    Restore items produced in scheduled order to the original device order.
+
+    Args:
+        indexed_items: List of (original_index, item) tuples
+
+    Returns:
+        Items sorted by original index
+    """
+    return [item for _, item in sorted(indexed_items, key=lambda pair: pair[0])]
@@ -8,20 +8,24 @@ using settings from the IPS database. It supports:
 - Automatic fuse type matching by curve and rating
 
 Performance optimizations:
-- Uses FuseTypeIndex for O(1) fuse type lookups
+- Uses FuseTypeIndex for O(1) fuse type lookups on parsed
+  (curve, rating, dual rating) keys
+- Fuse matching is timed as a stage span (utils.profiling)
 """
 
 from typing import Dict, List, Optional, Any, Union, Tuple
 
 from update_powerfactory.type_index import FuseTypeIndex
-from core import UpdateResult
+from core import SettingTable, UpdateResult
+from utils.profiling import stage
 
 
 
 def fuse_setting(
     app,
     device_object: Any,
-    fuse_index: Union[FuseTypeIndex, List]
+    fuse_index: Union[FuseTypeIndex, List],
+    nearest_higher: bool = False
 ) -> UpdateResult:
     """
     Configure a fuse device with settings from IPS.
@@ -33,6 +37,8 @@ def fuse_setting(
         app: PowerFactory application object
         device_object: The ProtectionDevice to configure
         fuse_index: FuseTypeIndex for O(1) lookups, or list for backward compatibility
+        nearest_higher: If no fuse type has the IPS rating, use the next
+            higher rating of the same curve (FuseTypeIndex only)
 
     Returns:
         UpdateResult with update status
@@ -59,9 +65,10 @@ def fuse_setting(
             return result
 
     # Find matching fuse type
-    fuse = _find_matching_fuse(
-        fuse_index, curve_type, rating, device_object.fuse_size
-    )
+    with stage("fuse_matching"):
+        fuse = _find_matching_fuse(
+            fuse_index, curve_type, rating, device_object.fuse_size, nearest_higher
+        )
 
     if not fuse:
         result.relay_pattern = device_object.device
@@ -76,13 +83,13 @@ def fuse_setting(
 
 
 def _extract_fuse_parameters(
-    settings: List[List]
+    settings: SettingTable
 ) -> Tuple[str, str, bool]:
     """
     Extract curve type and rating from IPS settings.
 
     Args:
-        settings: List of IPS setting rows
+        settings: The device's IPS settings
 
     Returns:
         Tuple of (curve_type, rating, extraction_failed)
@@ -124,7 +131,8 @@ def _find_matching_fuse(
     fuse_index: Union[FuseTypeIndex, List],
     curve_type: str,
     rating: str,
-    fuse_size: Optional[str]
+    fuse_size: Optional[str],
+    nearest_higher: bool = False
 ) -> Optional[Any]:
     """
     Find a matching fuse type using available criteria.
@@ -137,25 +145,17 @@ def _find_matching_fuse(
         curve_type: The curve type letter (e.g., "K", "T")
         rating: The rating string (e.g., " 100A")
         fuse_size: Optional fuse size for Tx fuses (e.g., "100K")
+        nearest_higher: Select the next higher rating when no fuse type
+            has the requested one (indexed lookup only)
 
     Returns:
         The matching PowerFactory TypFuse object, or None if not found
     """
     # Use indexed lookup if available (O(1))
     if isinstance(fuse_index, FuseTypeIndex):
-        # Try curve + rating first
-        if curve_type and rating:
-            fuse = fuse_index.get_by_curve_and_rating(curve_type, rating)
-            if fuse:
-                return fuse
-
-        # Fall back to fuse size
-        if fuse_size:
-            fuse = fuse_index.get_by_fuse_size(fuse_size)
-            if fuse:
-                return fuse
-
-        return None
+        return fuse_index.find_matching_fuse(
+            curve_type, rating, fuse_size, nearest_higher
+        )
 
     # Fall back to linear search for backward compatibility (O(n))
     for fuse in fuse_index:
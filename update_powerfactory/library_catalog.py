@@ -0,0 +1,219 @@
+"""
+Persisted catalog of the library relay and fuse types.
+
+RelayTypeIndex.build walks the ErgonLibrary Protection folder and the
+DIgSILENT ProtRelay library on every run, one GetContents call per folder,
+and FuseTypeIndex.build reads the ErgonLibrary Fuses folder. The libraries
+change rarely, so the names and full names of their types are saved in a
+catalog file under the cache directory and the indexes are created from it.
+Types are resolved to PowerFactory objects only when a device uses them.
+
+The catalog is keyed by a library change stamp: a digest of the full names
+of the library root folders and the names of the folders directly below
+them. A catalog is used only if its stamp matches and it is less than
+MAX_CATALOG_AGE_HOURS old. Changes below the top folder level do not
+change the stamp, so the indexes also fall back to the libraries: the
+first lookup in a run that misses, or finds a catalog type that can no
+longer be found by its full name, rebuilds that index from the libraries
+for the rest of the run and rewrites the catalog. A type published
+inside an existing folder is therefore found on the first run that needs
+it. Each index is rebuilt at most once per run, so a run with misses
+costs no more than reading the libraries did before the catalog.
+
+Local relay types (the current user's Protection folder) are never
+catalogued; they differ per user and are always read.
+
+Catalog format (JSON):
+    {"format": 1, "stamp": ..., "created": <epoch seconds>,
+     "relay_types": [[name, full_name], ...],
+     "fuse_types": [[name, full_name], ...]}
+
+Usage:
+    from update_powerfactory.library_catalog import load_type_indexes
+
+    relay_index, fuse_index = load_type_indexes(app)
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.paths import get_library_catalog_file
+from logging_config import get_logger
+from update_powerfactory.type_index import (
+    FuseTypeIndex,
+    RelayTypeIndex,
+    library_fuse_types,
+    library_relay_types,
+)
+
+logger = get_logger(__name__)
+
+# Version of the catalog file layout
+CATALOG_FORMAT = 1
+
+# Rebuild the catalog at least this often, for changes the stamp misses
+MAX_CATALOG_AGE_HOURS = 24
+
+
+# =============================================================================
+# Change Stamp
+# =============================================================================
+
+def _library_roots(app) -> List[Any]:
+    """Get the library folders the type indexes are built from."""
+    global_library = app.GetGlobalLibrary()
+    roots = list(global_library.GetContents("Protection") or [])
+    try:
+        dig_lib = global_library.fold_id.GetContents("Lib")[0]
+        roots.extend(dig_lib.GetContents("Prot")[0].GetContents("ProtRelay") or [])
+    except (IndexError, AttributeError):
+        pass
+    return roots
+
+
+def library_stamp(app) -> str:
+    """
+    Compute the change stamp of the relay and fuse libraries.
+
+    Args:
+        app: PowerFactory application object
+
+    Returns:
+        Hex digest of the root folders and the folders directly below them
+    """
+    parts = []
+    for root in _library_roots(app):
+        parts.append(root.GetFullName())
+        parts.extend(
+            sorted(folder.loc_name for folder in root.GetContents("*.IntFolder", 0))
+        )
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Catalog File
+# =============================================================================
+
+def _entries(types: List[Any]) -> List[Tuple[str, str]]:
+    """Get (name, full name) for each type, keeping the first of each name."""
+    entries: Dict[str, str] = {}
+    for pf_type in types:
+        entries.setdefault(pf_type.loc_name, pf_type.GetFullName())
+    return list(entries.items())
+
+
+def read_catalog(path: Path, stamp: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a catalog if it is current.
+
+    Args:
+        path: Catalog file
+        stamp: The libraries' current change stamp
+
+    Returns:
+        The catalog, or None if it is missing, unreadable, too old or for
+        a different stamp
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(catalog, dict)
+        or catalog.get("format") != CATALOG_FORMAT
+        or catalog.get("stamp") != stamp
+        or time.time() - catalog.get("created", 0) > MAX_CATALOG_AGE_HOURS * 3600
+    ):
+        return None
+    return catalog
+
+
+def write_catalog(path: Path, catalog: Dict[str, Any]) -> None:
+    """
+    Write a catalog, replacing any existing file in one step.
+
+    Batch workers share the cache directory, so the catalog is written to
+    a temporary file first. Failures are logged and otherwise ignored.
+
+    Args:
+        path: Catalog file
+        catalog: Catalog to write
+    """
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write library catalog {path}: {e}")
+
+
+# =============================================================================
+# Index Creation
+# =============================================================================
+
+def load_type_indexes(
+    app,
+    path: Optional[Path] = None
+) -> Tuple[RelayTypeIndex, FuseTypeIndex]:
+    """
+    Create the relay and fuse type indexes, from the catalog if current.
+
+    Args:
+        app: PowerFactory application object
+        path: Catalog file (default: library_catalog.json in the cache
+            directory)
+
+    Returns:
+        Tuple of (RelayTypeIndex, FuseTypeIndex)
+    """
+    path = Path(path or get_library_catalog_file())
+    stamp = library_stamp(app)
+    catalog = read_catalog(path, stamp)
+
+    if catalog is None:
+        relay_types = library_relay_types(app)
+        fuse_types = library_fuse_types(app)
+        catalog = {
+            "format": CATALOG_FORMAT,
+            "stamp": stamp,
+            "created": time.time(),
+            "relay_types": _entries(relay_types),
+            "fuse_types": _entries(fuse_types),
+        }
+        write_catalog(path, catalog)
+        logger.info(
+            f"Library catalog rebuilt: {len(catalog['relay_types'])} relay types, "
+            f"{len(catalog['fuse_types'])} fuse types"
+        )
+        return (
+            RelayTypeIndex.build(app, relay_types),
+            FuseTypeIndex.build(app, fuse_types),
+        )
+
+    def rebuild_relays() -> RelayTypeIndex:
+        logger.info("Relay type not found from the library catalog; rebuilding")
+        relay_types = library_relay_types(app)
+        catalog.update(relay_types=_entries(relay_types), created=time.time())
+        write_catalog(path, catalog)
+        return RelayTypeIndex.build(app, relay_types)
+
+    def rebuild_fuses() -> FuseTypeIndex:
+        logger.info("Fuse type not found from the library catalog; rebuilding")
+        fuse_types = library_fuse_types(app)
+        catalog.update(fuse_types=_entries(fuse_types), created=time.time())
+        write_catalog(path, catalog)
+        return FuseTypeIndex.build(app, fuse_types)
+
+    logger.info("Type indexes created from the library catalog")
+    return (
+        RelayTypeIndex.from_catalog(app, catalog["relay_types"], rebuild_relays),
+        FuseTypeIndex.from_catalog(app, catalog["fuse_types"], rebuild_fuses),
+    )
@@ -0,0 +1,278 @@
+"""
+Compiled bundle of the mapping files.
+
+The type mapping, curve mapping and relay maps are dozens of small CSV
+files, usually read from the network share with one open() per file as
+devices first need them. The bundle holds all of them already parsed,
+with the indexes derived from them (mapping file versions, dip switch
+groups and the curve code index), in one JSON file under the cache
+directory. Loading it is one local read. The cache directory may be
+shared by several users, so the bundle is plain data: it is decoded
+field by field and nothing in it is executed.
+
+The bundle is keyed by a stamp of the mapping files: the name, size and
+modification time of the type mapping, the curve mapping and every CSV in
+the relay maps directory, taken from one directory listing. A bundle with
+a different stamp is stale; the mapping files are then read from the CSVs
+and the bundle is rebuilt for the next run.
+
+The CB alternate names (CB_ALT_NAME.csv) are read by ips_data and are not
+part of the bundle.
+
+Bundle format (JSON):
+    {"format": 2, "stamp": ..., "created": <epoch seconds>,
+     "mapping": mapping_file.get_cache_snapshot()}
+
+    Tuples in the snapshot are stored as JSON arrays and restored by
+    read_bundle().
+
+Usage:
+    from update_powerfactory.mapping_bundle import load_mapping_bundle
+
+    load_mapping_bundle()  # Before the first mapping file lookup
+
+    # Build step, e.g. after publishing new mapping files:
+    python -m update_powerfactory.mapping_bundle
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.paths import (
+    RELAY_MAPS_DIR,
+    get_curve_mapping_file,
+    get_mapping_bundle_file,
+    get_type_mapping_file,
+)
+from logging_config import get_logger
+from update_powerfactory import mapping_file
+
+logger = get_logger(__name__)
+
+# Version of the bundle layout
+BUNDLE_FORMAT = 2
+
+
+# =============================================================================
+# Change Stamp
+# =============================================================================
+
+def _file_stamp(name: str, stat: Optional[os.stat_result]) -> str:
+    """Describe a file by name, size and modification time."""
+    if stat is None:
+        return f"{name}|missing"
+    return f"{name}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def mapping_stamp() -> str:
+    """
+    Compute the change stamp of the mapping files.
+
+    Returns:
+        Hex digest of the type mapping, the curve mapping and the relay
+        map files
+    """
+    parts = []
+    for path in (get_type_mapping_file(), get_curve_mapping_file()):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        parts.append(_file_stamp(str(path), stat))
+
+    parts.append(str(RELAY_MAPS_DIR))
+    try:
+        with os.scandir(RELAY_MAPS_DIR) as entries:
+            relay_maps = sorted(
+                (entry.name, entry.stat())
+                for entry in entries
+                if entry.name.endswith(".csv") and entry.is_file()
+            )
+    except OSError:
+        relay_maps = []
+    parts.extend(_file_stamp(name, stat) for name, stat in relay_maps)
+
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Bundle File
+# =============================================================================
+
+def _decode_mapping(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Restore the tuples of a mapping snapshot read from JSON.
+
+    Args:
+        mapping: The bundle's "mapping" entry
+
+    Returns:
+        The snapshot as returned by mapping_file.get_cache_snapshot()
+
+    Raises:
+        KeyError, TypeError, ValueError, AttributeError: If the snapshot
+            does not have the expected layout
+    """
+    curve_code_index = mapping["curve_code_index"]
+    return {
+        "type_mapping": {
+            pattern: tuple(info) for pattern, info in mapping["type_mapping"].items()
+        },
+        "mapping_files": dict(mapping["mapping_files"]),
+        "mapping_file_versions": dict(mapping["mapping_file_versions"]),
+        "dip_groups": {
+            filename: {name: tuple(rows) for name, rows in groups.items()}
+            for filename, groups in mapping["dip_groups"].items()
+        },
+        "curve_mapping": mapping["curve_mapping"],
+        "curve_code_index": None if curve_code_index is None else {
+            code: tuple(entry) for code, entry in curve_code_index.items()
+        },
+    }
+
+
+def read_bundle(path: Path, stamp: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a bundle if it is current.
+
+    Args:
+        path: Bundle file
+        stamp: The mapping files' current change stamp
+
+    Returns:
+        The bundle, or None if it is missing, unreadable or for a
+        different format or stamp
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            bundle = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(bundle, dict)
+        or bundle.get("format") != BUNDLE_FORMAT
+        or bundle.get("stamp") != stamp
+    ):
+        return None
+    try:
+        bundle["mapping"] = _decode_mapping(bundle["mapping"])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return bundle
+
+
+def write_bundle(path: Path, bundle: Dict[str, Any]) -> None:
+    """
+    Write a bundle, replacing any existing file in one step.
+
+    Batch workers share the cache directory, so the bundle is written to
+    a temporary file first. Failures are logged and otherwise ignored, and
+    the temporary file is removed.
+
+    Args:
+        path: Bundle file
+        bundle: Bundle to write
+    """
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(bundle, f)
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write mapping bundle {path}: {e}")
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+# =============================================================================
+# Build and Load
+# =============================================================================
+
+def build_mapping_bundle(
+    path: Optional[Path] = None,
+    stamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Read every mapping file from the CSVs and write the bundle.
+
+    The mapping file caches are left holding the data that was bundled.
+
+    Args:
+        path: Bundle file (default: mapping_bundle.json in the cache
+            directory)
+        stamp: Change stamp taken before the files were read (computed
+            if not given)
+
+    Returns:
+        The bundle
+    """
+    path = Path(path or get_mapping_bundle_file())
+    if stamp is None:
+        stamp = mapping_stamp()
+
+    mapping_file.clear_cache()
+    mapping_file.preload_cache(all_mapping_files=True)
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "stamp": stamp,
+        "created": time.time(),
+        "mapping": mapping_file.get_cache_snapshot(),
+    }
+    write_bundle(path, bundle)
+    logger.info(
+        f"Mapping bundle rebuilt: {len(bundle['mapping']['mapping_files'])} relay maps"
+    )
+    return bundle
+
+
+def load_mapping_bundle(path: Optional[Path] = None) -> bool:
+    """
+    Load the mapping files from the bundle, rebuilding it if stale.
+
+    Args:
+        path: Bundle file (default: mapping_bundle.json in the cache
+            directory)
+
+    Returns:
+        True if the bundle was current, False if the mapping files were
+        read from the CSVs
+    """
+    path = Path(path or get_mapping_bundle_file())
+    stamp = mapping_stamp()
+    bundle = read_bundle(path, stamp)
+
+    if bundle is None:
+        build_mapping_bundle(path, stamp)
+        return False
+
+    mapping_file.load_cache_snapshot(bundle["mapping"])
+    logger.info("Mapping files loaded from the mapping bundle")
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: build the bundle from the CSVs."""
+    parser = argparse.ArgumentParser(
+        description="Compile the mapping files into the mapping bundle"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Bundle file")
+    args = parser.parse_args(argv)
+
+    bundle = build_mapping_bundle(args.output)
+    print(
+        f"Bundled {len(bundle['mapping']['mapping_files'])} relay maps "
+        f"into {args.output or get_mapping_bundle_file()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
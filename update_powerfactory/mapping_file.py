@@ -10,7 +10,9 @@ are mapped to PowerFactory relay attributes. It provides:
 Performance optimizations:
 - Type mapping is loaded once and cached
 - Individual mapping files are cached after first read
-- Curve mapping is loaded once and cached
+- Dip switch rows are grouped by dip element when a mapping file loads
+- Curve mapping is loaded once, cached and indexed by code
+- Curves are resolved once per (relay type, IPS curve setting)
 - Cache can be cleared if files are updated during runtime
 
 Cache Statistics:
@@ -24,6 +26,7 @@ File Locations:
 """
 
 import csv
+import hashlib
 import os
 from typing import Dict, List, Optional, Tuple, Any
 
@@ -46,9 +49,25 @@ _type_mapping_cache: Optional[Dict[str, Tuple[str, str]]] = None
 # Individual mapping file cache: {filename: list_of_rows}
 _mapping_file_cache: Dict[str, List[List[str]]] = {}
 
+# Mapping file versions: {filename: "filename:content_digest"}
+_mapping_file_versions: Dict[str, str] = {}
+
+# Dip switch rows of each mapping file:
+# {filename: {dip_element_name: positions in read_mapping_file() rows}}
+_dip_group_cache: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+
 # Curve mapping cache: list of [ips_name, code, pf_name] rows
 _curve_mapping_cache: Optional[List[List[str]]] = None
 
+# Curve mapping by code: {code: (row position, pf_name, numeric code)}
+_curve_code_index: Optional[Dict[str, Tuple[int, str, bool]]] = None
+
+# Resolved curves: {(relay type, setting_value): PowerFactory curve}
+_pf_curve_cache: Dict[Tuple[Any, str], Any] = {}
+
+# Upper bound on the number of resolved curves held at once
+MAX_CACHED_CURVES = 5000
+
 # Cache statistics for monitoring
 _cache_stats = {
     "type_mapping_hits": 0,
@@ -72,9 +91,24 @@ def clear_cache() -> None:
     and you need to reload them.
     """
     global _type_mapping_cache, _mapping_file_cache, _curve_mapping_cache
+    global _curve_code_index
     _type_mapping_cache = None
     _mapping_file_cache.clear()
+    _mapping_file_versions.clear()
+    _dip_group_cache.clear()
     _curve_mapping_cache = None
+    _curve_code_index = None
+    _pf_curve_cache.clear()
+
+
+def clear_curve_cache() -> None:
+    """
+    Clear the resolved PowerFactory curves, keeping the mapping data.
+
+    Resolved curves are keyed by relay type objects of the active project,
+    so they are cleared at the start of each update run.
+    """
+    _pf_curve_cache.clear()
 
 
 def get_cache_stats() -> Dict[str, Any]:
@@ -89,20 +123,66 @@ def get_cache_stats() -> Dict[str, Any]:
         "type_mapping_loaded": _type_mapping_cache is not None,
         "mapping_files_cached": len(_mapping_file_cache),
         "curve_mapping_loaded": _curve_mapping_cache is not None,
+        "curves_resolved": len(_pf_curve_cache),
     }
 
 
-def preload_cache() -> None:
+def preload_cache(all_mapping_files: bool = False) -> None:
     """
     Preload all caches at startup.
 
     Call this during initialization to front-load all file I/O
     rather than incurring it during device processing.
+
+    Args:
+        all_mapping_files: Also load every relay map named in the type
+            mapping. Individual mapping files are otherwise loaded
+            on-demand, since a single run may not need all of them.
+    """
+    type_mapping = _load_type_mapping()
+    _get_curve_code_index()
+    if all_mapping_files:
+        for mapping_filename, _ in type_mapping.values():
+            _load_mapping_file(mapping_filename)
+
+
+def get_cache_snapshot() -> Dict[str, Any]:
+    """
+    Get the loaded mapping data.
+
+    The batch worker pool reads the mapping files once in the parent
+    process and loads this snapshot into each worker.
+
+    Returns:
+        Dictionary of the type mapping, mapping files, their versions and
+        dip switch groups, and the curve mapping and its index (plain
+        data, so it can be pickled)
     """
-    _load_type_mapping()
-    _load_curve_mapping()
-    # Note: Individual mapping files are loaded on-demand since
-    # we may not need all of them for a given run
+    return {
+        "type_mapping": _type_mapping_cache,
+        "mapping_files": dict(_mapping_file_cache),
+        "mapping_file_versions": dict(_mapping_file_versions),
+        "dip_groups": dict(_dip_group_cache),
+        "curve_mapping": _curve_mapping_cache,
+        "curve_code_index": _curve_code_index,
+    }
+
+
+def load_cache_snapshot(snapshot: Dict[str, Any]) -> None:
+    """
+    Replace the cached mapping data with a snapshot.
+
+    Args:
+        snapshot: Dictionary returned by get_cache_snapshot()
+    """
+    global _type_mapping_cache, _curve_mapping_cache, _curve_code_index
+    clear_cache()
+    _type_mapping_cache = snapshot["type_mapping"]
+    _mapping_file_cache.update(snapshot["mapping_files"])
+    _mapping_file_versions.update(snapshot["mapping_file_versions"])
+    _dip_group_cache.update(snapshot["dip_groups"])
+    _curve_mapping_cache = snapshot["curve_mapping"]
+    _curve_code_index = snapshot["curve_code_index"]
 
 
 # =============================================================================
@@ -196,6 +276,8 @@ def _load_mapping_file(filename: str) -> Optional[List[List[str]]]:
                 rows.append(row)
 
             _mapping_file_cache[filename] = rows
+            _mapping_file_versions[filename] = _compute_version(filename, rows)
+            _dip_group_cache[filename] = _group_raw_dip_rows(rows)
             return rows
 
     except FileNotFoundError:
@@ -204,6 +286,105 @@ def _load_mapping_file(filename: str) -> Optional[List[List[str]]]:
         return None
 
 
+def _compute_version(filename: str, rows: List[List[str]]) -> str:
+    """
+    Compute a version string from the content of a mapping file.
+
+    Args:
+        filename: The mapping file name
+        rows: Parsed rows of the mapping file
+
+    Returns:
+        Version string in the form "filename:digest"
+    """
+    digest = hashlib.sha1(repr(rows).encode("utf-8")).hexdigest()[:16]
+    return f"{filename}:{digest}"
+
+
+def get_mapping_version(rel_pattern: str) -> Optional[str]:
+    """
+    Get the content version of the mapping file used by a relay pattern.
+
+    The version changes whenever the mapping file content changes, so it
+    can be used as part of a cache key for results derived from the file.
+
+    Args:
+        rel_pattern: The IPS relay pattern name
+
+    Returns:
+        Version string, or None if the pattern or file is not available
+    """
+    type_info = get_type_mapping(rel_pattern)
+    if not type_info:
+        return None
+
+    mapping_filename = type_info[0]
+    if _load_mapping_file(mapping_filename) is None:
+        return None
+    return _mapping_file_versions.get(mapping_filename)
+
+
+def group_dip_rows(rows: List[List[str]]) -> Dict[str, Tuple[int, ...]]:
+    """
+    Group mapping file rows by the dip element they configure.
+
+    Dip elements are the element names containing "_dip", in order of
+    first appearance. The rows of an element are those whose element name
+    contains it.
+
+    Args:
+        rows: Mapping file rows as returned by read_mapping_file()
+
+    Returns:
+        Dictionary mapping each dip element name to the positions of its
+        rows
+    """
+    dip_rows = [
+        (position, row[1])
+        for position, row in enumerate(rows)
+        if "_dip" in row[1]
+    ]
+    # Use dict.fromkeys to preserve order while deduplicating
+    element_names = dict.fromkeys(element for _, element in dip_rows)
+    return {
+        name: tuple(position for position, element in dip_rows if name in element)
+        for name in element_names
+    }
+
+
+def _group_raw_dip_rows(raw_rows: List[List[str]]) -> Dict[str, Tuple[int, ...]]:
+    """Group the rows of a loaded mapping file that read_mapping_file keeps."""
+    return group_dip_rows([row for row in raw_rows if _is_mapped_row(row)])
+
+
+def get_dip_groups(rel_pattern: str) -> Optional[Dict[str, Tuple[int, ...]]]:
+    """
+    Get the dip switch rows of the mapping file used by a relay pattern.
+
+    The grouping is computed once per mapping file, when it is loaded.
+
+    Args:
+        rel_pattern: The IPS relay pattern name
+
+    Returns:
+        Dictionary mapping each dip element name to the positions of its
+        rows in the rows returned by read_mapping_file(), or None if the
+        pattern or file is not available
+    """
+    type_info = get_type_mapping(rel_pattern)
+    if not type_info:
+        return None
+
+    mapping_filename = type_info[0]
+    raw_rows = _load_mapping_file(mapping_filename)
+    if raw_rows is None:
+        return None
+    if mapping_filename not in _dip_group_cache:
+        # Mapping files loaded from a cache snapshot are grouped on first use
+        _dip_group_cache[mapping_filename] = _group_raw_dip_rows(raw_rows)
+    return _dip_group_cache[mapping_filename]
+
+
 # =============================================================================
 # Curve Mapping
 # =============================================================================
@@ -240,33 +421,65 @@ def _load_curve_mapping() -> List[List[str]]:
     return _curve_mapping_cache
 
 
+def _index_curve_mapping(
+    curve_mapping: List[List[str]]
+) -> Dict[str, Tuple[int, str, bool]]:
+    """
+    Index the curve mapping rows by code.
+
+    Args:
+        curve_mapping: Rows from _load_curve_mapping()
+
+    Returns:
+        Dictionary of code to (row position, PF curve name, whether the
+        code is numeric), keeping the first row of each code
+    """
+    index: Dict[str, Tuple[int, str, bool]] = {}
+    for position, line in enumerate(curve_mapping):
+        code = line[1]
+        try:
+            int(code)
+            numeric = True
+        except ValueError:
+            numeric = False
+        index.setdefault(code, (position, line[2], numeric))
+    return index
+
+
+def _get_curve_code_index() -> Dict[str, Tuple[int, str, bool]]:
+    """Get the curve mapping index, loading and indexing it once."""
+    global _curve_code_index
+
+    if _curve_code_index is None:
+        _curve_code_index = _index_curve_mapping(_load_curve_mapping())
+    return _curve_code_index
+
+
 def _find_curve_in_mapping(setting_value: str) -> Optional[str]:
     """
     Look up a curve name in the curve mapping.
 
+    Numeric (binary) curve codes also match setting values that have
+    extra leading zeros. If several rows match, the first row wins.
+
     Args:
         setting_value: The IPS curve setting value
 
     Returns:
         The PowerFactory curve name, or None if not found
     """
-    curve_mapping = _load_curve_mapping()
+    curve_code_index = _get_curve_code_index()
+    match = curve_code_index.get(setting_value)
 
-    for line in curve_mapping:
-        mapping_value = line[1]
+    # Numeric codes padded with leading zeros to the setting's length
+    for start in range(1, len(setting_value)):
+        if setting_value[start - 1] != "0":
+            break
+        entry = curve_code_index.get(setting_value[start:])
+        if entry is not None and entry[2] and (match is None or entry[0] < match[0]):
+            match = entry
 
-        # Handle binary curve codes - pad with leading zeros
-        try:
-            int(mapping_value)
-            while len(mapping_value) < len(setting_value):
-                mapping_value = "0" + mapping_value
-        except ValueError:
-            pass
-
-        if setting_value == mapping_value:
-            return line[2]  # Return PF curve name
-
-    return None
+    return match[1] if match is not None else None
 
 
 # =============================================================================
@@ -290,6 +503,34 @@ def get_pf_curve(app, setting_value: str, element) -> Any:
         The PowerFactory curve object
     """
     idmt_type = element.typ_id
+
+    # Relays of the same type resolve the same setting to the same curve
+    try:
+        return _pf_curve_cache[(idmt_type, setting_value)]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable setting value
+        return _resolve_pf_curve(idmt_type, setting_value)
+
+    curve = _resolve_pf_curve(idmt_type, setting_value)
+    if len(_pf_curve_cache) >= MAX_CACHED_CURVES:
+        del _pf_curve_cache[next(iter(_pf_curve_cache))]
+    _pf_curve_cache[(idmt_type, setting_value)] = curve
+    return curve
+
+
+def _resolve_pf_curve(idmt_type, setting_value: str) -> Any:
+    """
+    Find the curve of a relay type that matches an IPS curve setting.
+
+    Args:
+        idmt_type: The relay element's type (with pcharac)
+        setting_value: The curve name/code from IPS
+
+    Returns:
+        The PowerFactory curve object, or None if the type has no curves
+    """
     curves = idmt_type.GetAttribute("e:pcharac")
 
     # Try exact match first
@@ -384,16 +625,9 @@ def read_mapping_file(
 
     for row in raw_rows:
         # Skip rows without meaningful data
-        if len(row) < 4:
+        if not _is_mapped_row(row):
             continue
 
-        if row[3] == "None" and "_dip" not in row[1]:
-            if len(row) > 4:
-                if not row[4]:
-                    continue
-            else:
-                continue
-
         # Create a copy of the row to avoid modifying the cache
         processed_row = list(row)
 
@@ -410,6 +644,15 @@ def read_mapping_file(
     return mapping_file, relay_type
 
 
+def _is_mapped_row(row: List[str]) -> bool:
+    """Check whether read_mapping_file keeps a mapping file row."""
+    if len(row) < 4:
+        return False
+    if row[3] == "None" and "_dip" not in row[1]:
+        return len(row) > 4 and bool(row[4])
+    return True
+
+
 # =============================================================================
 # Utility Functions
 # =============================================================================
@@ -8,22 +8,59 @@ with settings from the IPS database. It handles:
 - Collecting update results and error handling
 
 Performance optimizations:
-- RelayTypeIndex and FuseTypeIndex provide O(1) type lookups
-- Write caching is enabled during batch updates
+- Mapping files are loaded from the compiled mapping bundle when the
+  CSVs have not changed (one read instead of one per file)
+- RelayTypeIndex and FuseTypeIndex provide O(1) type lookups, created
+  from the persisted library catalog when the libraries have not changed
+- CT and VT types are indexed by ratio once per run (InstrumentTypeIndex);
+  missing types are created once and reused
+- Write caching is enabled during batch updates, with the cache flushed
+  by a CommitScheduler (every N devices, M seconds or substation)
+- Setting plans are memoised across identical devices (hit rates are
+  reported in the run summary, per run)
+- Caches keyed by PowerFactory objects of the active project (slot
+  layouts, transformer fuse sizes, resolved curves) are cleared at the
+  start of each run
+- Devices are processed in (pattern, substation, cubicle) order so
+  caches stay hot; results are restored to the original order
 - Progress reporting every 10 devices
+- Per-device stage timings are aggregated into a per-pattern report
+  (p50/p95/max) and emitted as JSON Lines through the logger
+
+Checkpointing:
+    When a RunJournal is passed, each completed device is journalled and
+    checkpointed whenever the write cache is committed. Devices
+    already committed in a previous run are skipped and their journalled
+    results are carried into the output.
 
 Usage:
     from update_powerfactory import update_powerfactory as up
     results, has_updates = up.update_pf(app, device_list, data_capture_list)
 """
 
-from typing import List, Dict, Tuple, Any, Union
+from typing import List, Dict, Tuple, Any, Union, Optional
 
 from update_powerfactory import relay_settings as rs
 from update_powerfactory import fuse_settings as fs
-from update_powerfactory.type_index import RelayTypeIndex, FuseTypeIndex
+from update_powerfactory import setting_plan as sp
+from update_powerfactory import mapping_file as mf
+from update_powerfactory import slot_layout
+from update_powerfactory.run_journal import RunJournal, device_key
+from update_powerfactory.commit_scheduler import CommitScheduler, CommitPolicy
+from update_powerfactory.device_order import order_devices, restore_order
+from update_powerfactory.type_index import (
+    RelayTypeIndex,
+    FuseTypeIndex,
+    InstrumentTypeIndex,
+)
+from update_powerfactory.library_catalog import load_type_indexes
+from update_powerfactory.mapping_bundle import load_mapping_bundle
+from update_powerfactory.results_writer import ResultsWriter
 from core import UpdateResult
+from core.update_result import timing_column
 from config.relay_patterns import RELAYS_OOS
+from utils.pf_utils import clear_tx_fuse_size_cache
+from utils.profiling import get_profiler, stage
 from logging_config import get_logger, log_device_atts
 
 logger = get_logger(__name__)
@@ -32,8 +69,14 @@ logger = get_logger(__name__)
 def update_pf(
         app,
         lst_of_devs: List[Any],
-        data_capture_list: List[Union[Dict[str, str], UpdateResult]]
-) -> Tuple[List[Dict[str, str]], bool]:
+        data_capture_list: List[Union[Dict[str, str], UpdateResult]],
+        journal: Optional[RunJournal] = None,
+        commit_policy: Optional[CommitPolicy] = None,
+        locality_order: bool = True,
+        timing_columns: bool = False,
+        nearest_fuse_rating: bool = False,
+        results_writer: Optional[ResultsWriter] = None
+) -> Tuple[Optional[List[Dict[str, str]]], bool]:
     """
     Update PowerFactory relays and fuses with data from IPS.
 
@@ -45,27 +88,74 @@ def update_pf(
         app: PowerFactory application object
         lst_of_devs: List of ProtectionDevice objects to update
         data_capture_list: List to append update result records to
+        journal: Optional run journal for checkpoint and resume
+        commit_policy: When to flush the write cache during the run
+            (defaults to DEFAULT_COMMIT_POLICY)
+        locality_order: If True, process devices grouped by pattern,
+            substation and cubicle. Results are returned in the original
+            device order either way.
+        timing_columns: If True, add TIME_<STAGE> columns with each
+            device's stage timings to the results
+        nearest_fuse_rating: If True, fuses whose IPS rating has no
+            matching fuse type get the next higher rating of their curve
+        results_writer: Optional writer the results are streamed to as
+            each device completes, in the original device order once
+            finalised. TIME_<STAGE> columns are added to it as their
+            stages are first timed. The results are then not held in
+            memory or returned.
 
     Returns:
-        Tuple of (updated data_capture_list as dicts, has_updates flag)
+        Tuple of (updated data_capture_list as dicts, or None if the
+        results were streamed to results_writer; has_updates flag)
     """
+    _clear_run_caches()
+
+    # Records made before the update (e.g. devices not found in IPS) come
+    # first in the results
+    if results_writer:
+        earlier_results = _convert_results_to_dicts(data_capture_list)
+        results_writer.write_all(earlier_results, -len(earlier_results))
+
     if not lst_of_devs:
         logger.warning("No devices to update")
+        if results_writer:
+            return None, False
         return _convert_results_to_dicts(data_capture_list), False
 
-    # Build type indexes once for O(1) lookups
+    profiler = get_profiler()
+    profiler.reset()
+
+    # Load all mapping files at once, unless already loaded (e.g. by a
+    # batch worker from the shared snapshot)
+    if not mf.get_cache_stats()["type_mapping_loaded"]:
+        with stage("load_mapping_bundle"):
+            load_mapping_bundle()
+
+    # Build type indexes once for O(1) lookups (from the library catalog
+    # when it is current)
     app.PrintInfo("Creating indexed database of PowerFactory Fuse and Relay Types")
-    relay_index = RelayTypeIndex.build(app)
-    fuse_index = FuseTypeIndex.build(app)
+    with stage("build_type_index"):
+        relay_index, fuse_index = load_type_indexes(app)
+    instrument_index = InstrumentTypeIndex(app)
 
     updates = False
-    results: List[UpdateResult] = []
+
+    # (device index, result), kept only when the results are returned
+    results: List[Tuple[int, Union[UpdateResult, Dict[str, str]]]] = []
+
+    if locality_order:
+        schedule = order_devices(lst_of_devs)
+    else:
+        schedule = list(enumerate(lst_of_devs))
+
+    scheduler = CommitScheduler(app, commit_policy, journal)
+    skipped = 0
 
     # Enable write caching for better performance during batch updates
     app.SetWriteCacheEnabled(1)
 
     try:
-        for i, device_object in enumerate(lst_of_devs):
+        for i, (index, device_object) in enumerate(schedule):
             # Progress reporting
             if i % 10 == 0:
                 app.PrintInfo(f"Device {i} of {len(lst_of_devs)} is being updated")
@@ -74,49 +164,105 @@ def update_pf(
             if not device_object.pf_obj:
                 continue
 
-            # Handle devices not found in IPS
-            if not device_object.setting_id and not device_object.fuse_type:
-                result = UpdateResult.not_in_ips(device_object)
-                results.append(result)
+            # Skip devices committed in a previous run
+            key = device_key(device_object) if journal else None
+            if journal and journal.is_completed(key):
+                completed = journal.completed_result(key)
+                if results_writer:
+                    results_writer.write(completed, index)
+                else:
+                    results.append((index, completed))
+                skipped += 1
                 continue
 
-            # Process device based on type
-            try:
-                result, updates = _process_device(
-                    app,
-                    device_object,
-                    relay_index,
-                    fuse_index,
-                    updates
-                )
-            except Exception as e:
-                result = _handle_device_error(app, device_object, e)
-
-            results.append(result)
-
-            # Check if relay should be switched OOS
-            _switch_relay_oos(RELAYS_OOS, device_object)
-
-        # Commit all changes
-        app.WriteChangesToDb()
+            scheduler.before_device(device_object)
+
+            with profiler.device(device_object.name) as span:
+                # Handle devices not found in IPS
+                if not device_object.setting_id and not device_object.fuse_type:
+                    result = UpdateResult.not_in_ips(device_object)
+                else:
+                    # Process device based on type
+                    try:
+                        result, updates = _process_device(
+                            app,
+                            device_object,
+                            relay_index,
+                            fuse_index,
+                            updates,
+                            nearest_fuse_rating,
+                            instrument_index
+                        )
+                    except Exception as e:
+                        result = _handle_device_error(app, device_object, e)
+
+                    # Check if relay should be switched OOS
+                    _switch_relay_oos(RELAYS_OOS, device_object)
+
+                if span:
+                    # Report under the pattern after device classification
+                    span.pattern = device_object.device or device_object.fuse_type or ""
+
+            if timing_columns and span:
+                result.stage_timings = dict(span.timings)
+                if results_writer:
+                    results_writer.add_columns(map(timing_column, span.timings))
+
+            if results_writer:
+                results_writer.write(result, index)
+            else:
+                results.append((index, result))
+            if journal:
+                journal.record(key, result)
+
+            scheduler.device_completed()
+
+        # Commit remaining changes
+        scheduler.flush("end")
 
     finally:
         # Always disable write cache when done
         app.SetWriteCacheEnabled(0)
 
+    if skipped:
+        app.PrintInfo(f"{skipped} devices were already updated in a previous run")
+        logger.info(f"Resumed run skipped {skipped} journalled devices")
+
+    _report_run_summary(app, scheduler)
+
+    if results_writer:
+        return None, updates
+
     # Convert any existing dict entries and new results to dicts for output
     final_results = _convert_results_to_dicts(data_capture_list)
-    final_results.extend([r.to_dict() for r in results])
+    final_results.extend(_convert_results_to_dicts(restore_order(results)))
 
     return final_results, updates
 
 
+def _clear_run_caches() -> None:
+    """
+    Clear the caches that must not outlive an update run.
+
+    Slot layouts, transformer fuse sizes and resolved curves are keyed by
+    PowerFactory type objects of the active project; a batch run in one
+    process activates project after project. Setting plans are cleared so
+    each run reports its own hit rates.
+    """
+    slot_layout.clear_cache()
+    clear_tx_fuse_size_cache()
+    mf.clear_curve_cache()
+    sp.clear_cache()
+
+
 def _process_device(
         app,
         device_object: Any,
         relay_index: RelayTypeIndex,
         fuse_index: FuseTypeIndex,
-        updates: bool
+        updates: bool,
+        nearest_fuse_rating: bool = False,
+        instrument_index: Optional[InstrumentTypeIndex] = None
 ) -> Tuple[UpdateResult, bool]:
     """
     Process a single device based on its type.
@@ -130,16 +276,23 @@ def _process_device(
         relay_index: Indexed relay types for O(1) lookup
         fuse_index: Indexed fuse types for O(1) lookup
         updates: Current updates flag
+        nearest_fuse_rating: Use the next higher fuse rating when there
+            is no exact match
+        instrument_index: Indexed CT/VT types, shared across the run
 
     Returns:
         Tuple of (UpdateResult, updated updates flag)
     """
     if device_object.pf_obj.GetClassName() == "ElmRelay":
-        return rs.relay_settings(
-            app, device_object, relay_index, updates
-        )
+        with stage("relay_settings"):
+            return rs.relay_settings(
+                app, device_object, relay_index, updates, instrument_index
+            )
     else:
-        result = fs.fuse_setting(app, device_object, fuse_index)
+        with stage("fuse_settings"):
+            result = fs.fuse_setting(
+                app, device_object, fuse_index, nearest_fuse_rating
+            )
         return result, updates
 
 
@@ -199,6 +352,62 @@ def _switch_relay_oos(relays_oos: List[str], device_object: Any) -> None:
         pass
 
 
+def _report_run_summary(app, scheduler: CommitScheduler) -> None:
+    """
+    Report cache, commit and stage timing statistics for the run.
+
+    Args:
+        app: PowerFactory application object
+        scheduler: The run's commit scheduler
+    """
+    plan_stats = sp.get_cache_stats()
+    logger.info(f"Setting plan cache: {plan_stats}")
+    app.PrintInfo(
+        "Setting plan cache hit rates: "
+        f"settings {plan_stats['setting_dict_hit_rate']:.0%}, "
+        f"reclosing {plan_stats['reclosing_hit_rate']:.0%}, "
+        f"dip switches {plan_stats['dip_hit_rate']:.0%} "
+        f"({plan_stats['plans_cached']} plans cached)"
+    )
+
+    _report_stage_timings(app)
+
+    commit_stats = scheduler.get_stats()
+    logger.info(f"Write cache commits: {commit_stats}")
+    app.PrintInfo(
+        f"Write cache committed {commit_stats['flushes']} times, "
+        f"max latency {commit_stats['max_latency']:.2f}s, "
+        f"total {commit_stats['total_latency']:.2f}s"
+    )
+
+
+def _report_stage_timings(app) -> None:
+    """
+    Report per-pattern stage timings for the run.
+
+    The full report (every stage path) is logged as a JSON record. The
+    output window shows total device time per pattern.
+
+    Args:
+        app: PowerFactory application object
+    """
+    report = get_profiler().report()
+    logger.info("Stage timing report", extra={"extra_data": report})
+
+    lines = []
+    for pattern, stages in sorted(report.items()):
+        total = stages.get("total")
+        if not total:
+            continue
+        lines.append(
+            f"{pattern}: {total['count']} devices, "
+            f"p50 {total['p50']:.3f}s, p95 {total['p95']:.3f}s, "
+            f"max {total['max']:.3f}s"
+        )
+    if lines:
+        app.PrintInfo("Device update times by pattern:\n" + "\n".join(lines))
+
+
 def _convert_results_to_dicts(
     results: List[Union[Dict[str, str], UpdateResult]]
 ) -> List[Dict[str, str]]:
@@ -10,6 +10,11 @@ switch positions in the relay's logic element. The resulting configuration
 is a binary string (e.g., "10110") where each position represents a
 switch state.
 
+The mapping lines of each dip element are grouped once per mapping file
+(mapping_file.get_dip_groups), so a relay with several dip banks reads
+each line once. Switch states are collected as integer bitmasks and the
+resulting strings are memoised by the element's relevant settings.
+
 This module was extracted from relay_settings.py to:
 - Isolate dip switch logic from general relay settings
 - Fix mutation issues in the original implementation
@@ -19,13 +24,16 @@ Usage:
     from update_powerfactory.relay_logic_elements import update_logic_elements
 
     update_logic_elements(
-        app, pf_device, mapping_file, setting_dict, find_element
+        app, pf_device, mapping_file, setting_dict, find_element,
+        plan_key, mf.get_dip_groups(pattern)
     )
 """
 
 import logging
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from update_powerfactory import mapping_file as mf
+from update_powerfactory import setting_plan as sp
 from update_powerfactory.setting_utils import build_setting_key
 
 logger = logging.getLogger(__name__)
@@ -34,13 +42,22 @@ logger = logging.getLogger(__name__)
 # Type alias for the find_element function signature
 FindElementFunc = Callable[[Any, Any, List], Optional[Any]]
 
+# Upper bound on the number of memoised dip strings. The oldest strings
+# are evicted first.
+MAX_CACHED_DIP_STRINGS = 5000
+
+# Dip strings by (dip base, ((switch, pattern, setting repr), ...))
+_dip_string_cache: Dict[Tuple[Any, ...], str] = {}
+
 
 def update_logic_elements(
     app,
     pf_device: Any,
     mapping_file: List[List],
     setting_dict: Dict[str, Any],
-    find_element_func: FindElementFunc
+    find_element_func: FindElementFunc,
+    plan_key: Optional[str] = None,
+    dip_groups: Optional[Dict[str, Sequence[int]]] = None
 ) -> None:
     """
     Update logic elements with dip switch configurations.
@@ -56,65 +73,52 @@ def update_logic_elements(
         setting_dict: Dictionary of all settings
         find_element_func: Function to find PF elements (dependency injection
             to avoid circular imports)
+        plan_key: Optional setting plan key used to reuse dip switch
+            strings computed for an identical device
+        dip_groups: Positions of each dip element's rows in mapping_file,
+            from mapping_file.get_dip_groups() (grouped here if not given)
     """
-    dip_elements = _get_dip_element_names(mapping_file)
-
-    if not dip_elements:
-        return
+    if dip_groups is None:
+        dip_groups = mf.group_dip_rows(mapping_file)
 
-    for element_name in dip_elements:
+    for element_name, positions in dip_groups.items():
+        element_mapping = [mapping_file[position] for position in positions]
         _process_dip_element(
-            app, pf_device, element_name, mapping_file,
-            setting_dict, find_element_func
+            app, pf_device, element_name, element_mapping,
+            setting_dict, find_element_func, plan_key
         )
 
 
-def _get_dip_element_names(mapping_file: List[List]) -> List[str]:
-    """
-    Extract unique element names that have dip switch configurations.
-
-    Scans the mapping file for entries containing "_dip" in the element
-    name and returns unique names in order of first appearance.
-
-    Args:
-        mapping_file: List of mapping file rows
-
-    Returns:
-        List of unique element names containing "_dip"
-    """
-    # Use dict.fromkeys to preserve order while deduplicating (Python 3.7+)
-    dip_elements = dict.fromkeys(
-        line[1] for line in mapping_file if "_dip" in line[1]
-    )
-    return list(dip_elements.keys())
-
-
 def _process_dip_element(
     app,
     pf_device: Any,
     element_name: str,
-    mapping_file: List[List],
+    element_mapping: List[List],
     setting_dict: Dict[str, Any],
-    find_element_func: FindElementFunc
+    find_element_func: FindElementFunc,
+    plan_key: Optional[str] = None
 ) -> None:
     """
     Process a single dip switch element.
 
-    Finds the PowerFactory element, collects relevant mapping lines,
-    and applies the calculated dip switch settings.
+    Finds the PowerFactory element and applies the dip switch settings
+    calculated from its mapping lines.
 
     Args:
         app: PowerFactory application object
         pf_device: The PowerFactory relay object
         element_name: Name of the dip element (e.g., "SomeElement_dip")
-        mapping_file: List of mapping file rows
+        element_mapping: Mapping file lines for this element
         setting_dict: Dictionary of all settings
         find_element_func: Function to find PF elements
+        plan_key: Optional setting plan key for dip string reuse
     """
-    # Find the PowerFactory element and collect relevant mapping lines
-    pf_element, element_mapping = _find_dip_element_and_mappings(
-        app, pf_device, element_name, mapping_file, find_element_func
-    )
+    # Find the PowerFactory element from the first line that resolves
+    pf_element = None
+    for line in element_mapping:
+        pf_element = _find_pf_dip_element(app, pf_device, line, find_element_func)
+        if pf_element is not None:
+            break
 
     if not pf_element:
         app.PrintError(f"Element - {element_name} could not be found")
@@ -133,57 +137,21 @@ def _process_dip_element(
         return
 
     # Calculate and apply new dip switch settings
-    new_dip_set = _calculate_dip_settings(
-        pf_element, element_mapping, setting_dict, existing_dip_set
-    )
+    dip_names = _get_dip_names(pf_element)
+    dip_base = existing_dip_set.replace("1", "0")
+    new_dip_set = sp.get_dip_setting(plan_key, element_name, dip_names, dip_base)
+    if new_dip_set is None:
+        new_dip_set = _calculate_dip_settings(
+            pf_element, element_mapping, setting_dict, existing_dip_set,
+            dip_names
+        )
+        sp.store_dip_setting(
+            plan_key, element_name, dip_names, dip_base, new_dip_set
+        )
 
     pf_element.SetAttribute("e:aDipset", new_dip_set)
 
 
-def _find_dip_element_and_mappings(
-    app,
-    pf_device: Any,
-    element_name: str,
-    mapping_file: List[List],
-    find_element_func: FindElementFunc
-) -> Tuple[Optional[Any], List[List]]:
-    """
-    Find the PowerFactory dip element and collect its mapping lines.
-
-    Searches for the RelLogdip element corresponding to the element name
-    and gathers all mapping file lines that apply to it.
-
-    IMPORTANT: This function creates copies of mapping lines when searching
-    to avoid mutating the original mapping file data.
-
-    Args:
-        app: PowerFactory application object
-        pf_device: The PowerFactory relay object
-        element_name: Name of the dip element
-        mapping_file: List of mapping file rows
-        find_element_func: Function to find PF elements
-
-    Returns:
-        Tuple of (PowerFactory element or None, list of mapping lines)
-    """
-    element_mapping = []
-    pf_element = None
-
-    for line in mapping_file:
-        if element_name not in line[1]:
-            continue
-
-        element_mapping.append(line)
-
-        # Only search for the PF element once
-        if pf_element is None:
-            pf_element = _find_pf_dip_element(
-                app, pf_device, line, find_element_func
-            )
-
-    return pf_element, element_mapping
-
-
 def _find_pf_dip_element(
     app,
     pf_device: Any,
@@ -222,44 +190,103 @@ def _calculate_dip_settings(
     pf_element: Any,
     element_mapping: List[List],
     setting_dict: Dict[str, Any],
-    existing_dip_set: str
+    existing_dip_set: str,
+    dip_names: Optional[List[str]] = None
 ) -> str:
     """
     Calculate the new dip switch settings based on IPS values.
 
-    Processes each mapping line to determine the appropriate dip switch
-    state (0 or 1) and builds the complete dip switch string.
+    The switch states are collected as two bitmasks in one pass over the
+    mapping lines: the switches a line sets, and which of those are ON.
+    A later line for the same switch replaces an earlier one. Switches no
+    line sets keep the existing value with every switch OFF.
+
+    Dip strings are memoised by the existing string and, for each line,
+    the switch, match pattern and setting value, so elements with the
+    same relevant settings share a string whatever the rest of the
+    device's settings.
 
     Args:
         pf_element: The PowerFactory RelLogdip element
         element_mapping: List of mapping lines for this element
         setting_dict: Dictionary of all settings
         existing_dip_set: Current dip switch string (e.g., "10110")
+        dip_names: Dip switch names from the element type, if already read
 
     Returns:
         New dip switch string with updated values
     """
     # Start with all switches OFF
-    dip_set = list(existing_dip_set.replace("1", "0"))
+    dip_base = existing_dip_set.replace("1", "0")
 
     # Get the dip switch names from the element type
-    dip_names = _get_dip_names(pf_element)
+    if dip_names is None:
+        dip_names = _get_dip_names(pf_element)
+    positions: Dict[str, int] = {}
+    for i, name in enumerate(dip_names):
+        positions.setdefault(name, i)
 
+    inputs = []
     for line in element_mapping:
-        dip_set_name = line[2]
-        key = build_setting_key(line)
+        position = positions.get(line[2])
+        if position is not None:
+            # Get setting value, default to 0
+            setting = setting_dict.get(build_setting_key(line), 0)
+            inputs.append((position, str(line[-1]) if line else "", setting))
+
+    # Settings are keyed by repr so that values which compare equal but
+    # convert differently (1.0 and "1.0") stay distinct
+    key = (
+        dip_base,
+        tuple((pos, pattern, repr(setting)) for pos, pattern, setting in inputs),
+    )
+    dip_set = _dip_string_cache.get(key)
+    if dip_set is None:
+        written = 0
+        on = 0
+        for position, pattern, setting in inputs:
+            bit = 1 << position
+            written |= bit
+            if _dip_switch_on(setting, pattern):
+                on |= bit
+            else:
+                on &= ~bit
+        dip_set = _render_dip_set(dip_base, written, on)
+        if len(_dip_string_cache) >= MAX_CACHED_DIP_STRINGS:
+            del _dip_string_cache[next(iter(_dip_string_cache))]
+        _dip_string_cache[key] = dip_set
+
+    return dip_set
+
+
+def _render_dip_set(dip_base: str, written: int, on: int) -> str:
+    """
+    Render switch bitmasks as a dip string.
 
-        # Get setting value, default to 0
-        setting = setting_dict.get(key, 0)
+    Args:
+        dip_base: The element's dip string with every switch OFF
+        written: Bitmask of the switches set by the mapping
+        on: Bitmask of the switches set ON
 
-        # Find the index of this dip switch
-        dip_index = _find_dip_index(dip_names, dip_set_name)
+    Returns:
+        Dip string with the written switches replaced
+
+    Raises:
+        IndexError: If a switch is beyond the end of the dip string
+    """
+    if written >> len(dip_base):
+        raise IndexError(
+            f"Dip switch {written.bit_length() - 1} is beyond {dip_base!r}"
+        )
+    return "".join(
+        ("1" if on >> i & 1 else "0") if written >> i & 1 else char
+        for i, char in enumerate(dip_base)
+    )
 
-        if dip_index is not None:
-            logic_value = _determine_dip_logic_value(setting, line)
-            dip_set[dip_index] = logic_value
 
-    return "".join(dip_set)
+def clear_cache() -> None:
+    """Clear the memoised dip strings."""
+    _dip_string_cache.clear()
 
 
 def _get_dip_names(pf_element: Any) -> List[str]:
@@ -282,61 +309,40 @@ def _get_dip_names(pf_element: Any) -> List[str]:
     return []
 
 
-def _find_dip_index(dip_names: List[str], target_name: str) -> Optional[int]:
-    """
-    Find the index of a dip switch by name.
-
-    Args:
-        dip_names: List of dip switch names from the element type
-        target_name: Name of the dip switch to find
-
-    Returns:
-        Index of the dip switch, or None if not found
+def _dip_switch_on(setting: Any, pattern: str) -> bool:
     """
-    for i, name in enumerate(dip_names):
-        if name == target_name:
-            return i
-    return None
-
-
-def _determine_dip_logic_value(setting: Any, line: List) -> str:
-    """
-    Determine the logic value (0 or 1) for a dip switch.
+    Determine whether a dip switch is ON.
 
     The logic for determining switch state:
     1. If setting is integer 1, switch is ON
     2. If setting is integer 0, switch is OFF
-    3. If mapping line pattern matches setting string, switch is ON
+    3. If the mapping line pattern matches setting string, switch is ON
     4. If "32" appears in setting string (special case), switch is ON
     5. Otherwise, switch is OFF
 
     Args:
         setting: The IPS setting value
-        line: The mapping file line (last element may contain match pattern)
+        pattern: Match pattern from the last column of the mapping line
 
     Returns:
-        "1" for ON, "0" for OFF
+        True for ON, False for OFF
     """
     # Try to convert to integer for direct comparison
     try:
         setting_int = int(setting)
         if setting_int == 1:
-            return "1"
+            return True
         elif setting_int == 0:
-            return "0"
+            return False
     except (ValueError, TypeError):
         pass
 
     # Check if line's pattern matches the setting
     setting_str = str(setting)
-    pattern = str(line[-1]) if line else ""
 
     if pattern and pattern in setting_str:
-        return "1"
+        return True
 
     # Special case: check for "32" in setting
     # (This appears to be a legacy convention for certain relay types)
-    if "32" in setting_str:
-        return "1"
-
-    return "0"
\ No newline at end of file
+    return "32" in setting_str
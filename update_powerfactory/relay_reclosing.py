@@ -14,6 +14,12 @@ Logic table values:
 - 1.0: Reclose (continue reclosing sequence)
 - 2.0: Lockout (stop reclosing sequence)
 
+The table is computed from the resolved rows (LogicRow) by logic_table()
+and memoised by trips to lockout and row settings, so devices with the
+same reclosing configuration share one table even when their setting
+plans differ. Row names in the element's block IDs are replaced in one
+pass through a dictionary lookup.
+
 This module was extracted from relay_settings.py to:
 - Isolate complex reclosing logic
 - Improve maintainability
@@ -26,19 +32,30 @@ Usage:
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+from update_powerfactory import setting_plan as sp
 from update_powerfactory.setting_utils import build_setting_key, setting_adjustment
 from config.relay_patterns import NOJA_RECLOSERS
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the number of memoised logic tables. The oldest tables
+# are evicted first.
+MAX_CACHED_TABLES = 1024
+
+# Logic tables by (op_to_lockout, resolved rows), shared by devices whose
+# rows resolve identically even when their setting plans differ
+_table_cache: Dict[Tuple[int, Tuple[str, ...]], Dict[str, Tuple[float, ...]]] = {}
+
 
 def update_reclosing_logic(
     app,
     device_object: Any,
     mapping_file: List[List],
-    setting_dictionary: Dict[str, Any]
+    setting_dictionary: Dict[str, Any],
+    plan_key: Optional[str] = None
 ) -> None:
     """
     Update reclosing element logic based on trip settings.
@@ -52,6 +69,8 @@ def update_reclosing_logic(
         device_object: The ProtectionDevice being configured
         mapping_file: List of mapping file rows
         setting_dictionary: Dictionary of all settings
+        plan_key: Optional setting plan key used to reuse logic rows
+            computed for an identical device
     """
     pf_device = device_object.pf_obj
     device_type = device_object.device
@@ -69,16 +88,19 @@ def update_reclosing_logic(
         return
 
     op_to_lockout = element.GetAttribute("e:oplockout")
-    trip_setting = get_trip_num(app, mapping_file, setting_dictionary)
 
-    row_dict = _build_logic_rows(
-        app,
-        mapping_file,
-        setting_dictionary,
-        device_object,
-        op_to_lockout,
-        trip_setting
-    )
+    row_dict = sp.get_reclosing_rows(plan_key, op_to_lockout)
+    if row_dict is None:
+        trip_setting = get_trip_num(app, mapping_file, setting_dictionary)
+        row_dict = _build_logic_rows(
+            app,
+            mapping_file,
+            setting_dictionary,
+            device_object,
+            op_to_lockout,
+            trip_setting
+        )
+        sp.store_reclosing_rows(plan_key, op_to_lockout, row_dict)
 
     _apply_logic_to_element(element, row_dict)
 
@@ -210,6 +232,15 @@ def _find_element_by_name(
     return _find_element_in_relay(app, pf_device, line)
 
 
+class LogicRow(NamedTuple):
+    """Resolved inputs of one row of the reclosing logic table."""
+    name: str
+    setting: Any
+    trip_num: Any
+    on_off_key: str
+    recl: str
+
+
 def _build_logic_rows(
     app,
     mapping_file: List[List],
@@ -235,14 +266,47 @@ def _build_logic_rows(
     Returns:
         Dictionary mapping row names to lists of logic values
     """
-    row_dict = {}
+    rows = _resolve_logic_rows(
+        app, mapping_file, setting_dictionary, device_object, trip_setting
+    )
+    # Settings are keyed by repr so that 1, 1.0 and "1" stay distinct
+    # (they differ in the on/off comparison) and unhashable values work
+    key = (op_to_lockout, tuple(repr(row) for row in rows))
+    table = _table_cache.get(key)
+    if table is None:
+        table = logic_table(rows, op_to_lockout)
+        if len(_table_cache) >= MAX_CACHED_TABLES:
+            del _table_cache[next(iter(_table_cache))]
+        _table_cache[key] = table
+    return {name: list(values) for name, values in table.items()}
+
+
+def _resolve_logic_rows(
+    app,
+    mapping_file: List[List],
+    setting_dictionary: Dict[str, Any],
+    device_object: Any,
+    trip_setting: int
+) -> Tuple[LogicRow, ...]:
+    """
+    Resolve the setting, trip number and reclose flag of each logic row.
+
+    Args:
+        app: PowerFactory application object
+        mapping_file: List of mapping file rows
+        setting_dictionary: Dictionary of all settings
+        device_object: The ProtectionDevice being configured
+        trip_setting: Trip-to-lockout setting value
+
+    Returns:
+        LogicRow for each "_logic" mapping row, in mapping file order
+    """
+    rows = []
 
     for mapped_set in mapping_file:
         if "_logic" not in mapped_set[1]:
             continue
 
-        row_name = mapped_set[2]
-
         # Parse trip number from mapping
         try:
             trip_num = int(mapped_set[-3])
@@ -272,81 +336,80 @@ def _build_logic_rows(
                 trip_num = "ALL"
                 on_off_key = "off"
 
-        # Build the logic string for this row
-        logic_str = _build_single_row_logic(
-            setting, trip_num, on_off_key, recl, op_to_lockout
-        )
-
-        row_dict[row_name] = logic_str
+        rows.append(LogicRow(mapped_set[2], setting, trip_num, on_off_key, recl))
 
-    return row_dict
+    return tuple(rows)
 
 
-def _build_single_row_logic(
-    setting: Any,
-    trip_num: Any,
-    on_off_key: str,
-    recl: str,
+def logic_table(
+    rows: Tuple[LogicRow, ...],
     op_to_lockout: int
-) -> List[float]:
+) -> Dict[str, Tuple[float, ...]]:
     """
-    Build the logic values for a single row.
+    Compute the reclosing logic table.
+
+    Row values for trips 1 to op_to_lockout:
+    - No reclosing ("N"): 0.0 if the setting is the off value, otherwise
+      2.0, on every trip ("ALL") or only on the row's trip
+    - All trips: 1.0 before both the lockout and the setting's trip,
+      2.0 on either of them and 0.0 after the setting's trip
+    - A specific trip: 1.0 on that trip, or 2.0 if it is the lockout
+      trip, and 0.0 on every other trip
 
     Args:
-        setting: The setting value
-        trip_num: Trip number (int) or "ALL"
-        on_off_key: Key indicating on/off state
-        recl: "N" for no reclosing, otherwise allows reclosing
+        rows: Resolved logic rows (a later row replaces an earlier row
+            with the same name)
         op_to_lockout: Number of operations to lockout
 
     Returns:
-        List of logic values [trip1, trip2, ..., tripN]
+        Dictionary mapping row names to logic values
     """
-    logic_str = []
+    trips = range(1, op_to_lockout + 1)
+    table = {}
 
-    # Check if element allows reclosing
-    if recl == "N":
-        # No reclosing - determine if disabled or lockout
-        if str(setting).lower() == on_off_key.lower():
-            set_log = 0.0  # Disabled
-        else:
-            set_log = 2.0  # Lockout
+    for row in rows:
+        trip_num = row.trip_num
 
-        for i in range(op_to_lockout):
-            if trip_num == "ALL":
-                logic_str.append(set_log)
-            elif i + 1 == trip_num:
-                logic_str.append(set_log)
+        if row.recl == "N":
+            # No reclosing - determine if disabled or lockout
+            if str(row.setting).lower() == row.on_off_key.lower():
+                set_log = 0.0  # Disabled
             else:
-                logic_str.append(0.0)
-
-        return logic_str
-
-    # Check if it applies to all trips
-    if trip_num == "ALL":
-        if setting == "None":
-            setting = 1
+                set_log = 2.0  # Lockout
+            values = tuple(
+                set_log if trip_num == "ALL" or trip == trip_num else 0.0
+                for trip in trips
+            )
+        elif trip_num == "ALL":
+            # With a single trip it is the lockout trip whatever the setting
+            if op_to_lockout > 1:
+                last = float(1 if row.setting == "None" else row.setting)
+            else:
+                last = 0.0
+            values = tuple(
+                1.0 if trip < op_to_lockout and trip < last        # Reclose
+                else 2.0 if trip == op_to_lockout or trip == last  # Lockout
+                else 0.0                                           # Disabled
+                for trip in trips
+                # A NaN setting leaves only the lockout trip in the row
+                if trip == op_to_lockout or not math.isnan(last)
+            )
+        else:
+            # Row is associated with a specific trip
+            lockout = 2.0 if trip_num == op_to_lockout else 1.0
+            values = tuple(
+                lockout if trip == trip_num else 0.0
+                for trip in trips
+            )
 
-        for i in range(op_to_lockout):
-            if i + 1 < op_to_lockout and i + 1 < float(setting):
-                logic_str.append(1.0)  # Reclose
-            elif i + 1 == op_to_lockout or i + 1 == float(setting):
-                logic_str.append(2.0)  # Lockout
-            elif i + 1 > float(setting):
-                logic_str.append(0.0)  # Disabled
+        table[row.name] = values
 
-        return logic_str
+    return table
 
-    # Row is associated with a specific trip
-    for i in range(op_to_lockout):
-        if i + 1 != trip_num:
-            logic_str.append(0.0)  # Disabled
-        elif i + 1 == trip_num and trip_num < op_to_lockout:
-            logic_str.append(1.0)  # Reclose
-        elif i + 1 == trip_num and trip_num == op_to_lockout:
-            logic_str.append(2.0)  # Lockout
 
-    return logic_str
+def clear_cache() -> None:
+    """Clear the memoised reclosing logic tables."""
+    _table_cache.clear()
 
 
 def _apply_logic_to_element(
@@ -365,14 +428,11 @@ def _apply_logic_to_element(
     if not element:
         return
 
-    block_ids = element.GetAttribute("r:typ_id:e:blockid")
-
-    # Replace row names with their logic values
-    for row_name, logic_values in row_dict.items():
-        block_ids = [
-            logic_values if x == row_name else x
-            for x in block_ids
-        ]
+    # Replace row names with their logic values in one pass
+    block_ids = [
+        row_dict.get(block_id, block_id)
+        for block_id in element.GetAttribute("r:typ_id:e:blockid")
+    ]
 
     element.SetAttribute("e:ilogic", block_ids)
 
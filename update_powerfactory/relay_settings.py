@@ -17,7 +17,10 @@ Sub-modules handle specialized functionality:
 
 Performance optimizations:
 - Uses RelayTypeIndex for O(1) relay type lookups
+- CT/VT types come from a per-run InstrumentTypeIndex
 - Mapping file results are cached in mapping_file.py
+- Setting plans are memoised across identical devices in setting_plan.py
+- Each configuration step is timed as a stage span (utils.profiling)
 
 Usage:
     from update_powerfactory import relay_settings as rs
@@ -31,17 +34,20 @@ from typing import Dict, List, Tuple, Optional, Any, Union
 from update_powerfactory import mapping_file as mf
 from update_powerfactory import ct_settings as cs
 from update_powerfactory import vt_settings as vs
-from update_powerfactory.type_index import RelayTypeIndex
+from update_powerfactory import setting_plan as sp
+from update_powerfactory.type_index import InstrumentTypeIndex, RelayTypeIndex
 from update_powerfactory.setting_utils import (
     build_setting_key,
     determine_on_off,
     convert_binary,
     setting_adjustment,
+    adjust_settings,
 )
 from update_powerfactory.relay_reclosing import update_reclosing_logic
 from update_powerfactory.relay_logic_elements import update_logic_elements
-from core import UpdateResult
+from core import SettingTable, UpdateResult
 from config.relay_patterns import SINGLE_PHASE_RELAYS, MULTI_PHASE_RELAYS
+from utils.profiling import stage
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +77,8 @@ def relay_settings(
     app,
     device_object: Any,
     relay_index: Union[RelayTypeIndex, List],
-    updates: bool
+    updates: bool,
+    instrument_index: Optional[InstrumentTypeIndex] = None
 ) -> Tuple[UpdateResult, bool]:
     """
     Configure a relay device with settings from IPS.
@@ -91,6 +98,7 @@ def relay_settings(
         relay_index: RelayTypeIndex for O(1) lookups, or list for backward
             compatibility
         updates: Current updates flag
+        instrument_index: Per-run CT/VT type index shared across devices
 
     Returns:
         Tuple of (UpdateResult, updated updates flag)
@@ -104,14 +112,16 @@ def relay_settings(
     result.used_pattern = device_object.device
 
     # Load mapping file for this relay pattern
-    mapping_file, mapping_type = mf.read_mapping_file(
-        app, device_object.device, device_object.pf_obj
-    )
+    with stage("mapping_lookup"):
+        mapping_file, mapping_type = mf.read_mapping_file(
+            app, device_object.device, device_object.pf_obj
+        )
 
     # Validate and update relay type if needed
-    result = check_relay_type(
-        app, device_object, mapping_type, relay_index, result
-    )
+    with stage("check_relay_type"):
+        result = check_relay_type(
+            app, device_object, mapping_type, relay_index, result
+        )
 
     # Configure phase for single-phase relays
     phase = determine_phase(app, device_object)
@@ -121,9 +131,14 @@ def relay_settings(
 
     # Build setting dictionary and apply settings
     if mapping_file:
-        setting_dict = create_setting_dictionary(
-            app, device_object.settings, mapping_file, device_object.pf_obj
-        )
+        with stage("setting_dictionary"):
+            plan_key = _compute_plan_key(device_object, phase)
+            setting_dict = sp.get_setting_dictionary(plan_key, mapping_file)
+            if setting_dict is None:
+                setting_dict = create_setting_dictionary(
+                    app, device_object.settings, mapping_file, device_object.pf_obj
+                )
+                sp.store_setting_dictionary(plan_key, mapping_file, setting_dict)
         result.date_setting = device_object.date
         device_object.pf_obj.SetAttribute("e:sernum", str(device_object.date))
     else:
@@ -132,17 +147,27 @@ def relay_settings(
         return result, updates
 
     # Apply settings from mapping file
-    updates = apply_settings(app, device_object, mapping_file, setting_dict, updates)
+    with stage("apply_settings"):
+        updates = apply_settings(
+            app, device_object, mapping_file, setting_dict, updates
+        )
 
     # Delegate specialized configuration to sub-modules
-    update_reclosing_logic(app, device_object, mapping_file, setting_dict)
-    update_logic_elements(
-        app, device_object.pf_obj, mapping_file, setting_dict, find_element
-    )
+    with stage("reclosing"):
+        update_reclosing_logic(
+            app, device_object, mapping_file, setting_dict, plan_key
+        )
+    with stage("dip_logic"):
+        update_logic_elements(
+            app, device_object.pf_obj, mapping_file, setting_dict, find_element,
+            plan_key, mf.get_dip_groups(device_object.device)
+        )
 
     # Update CT and VT settings
-    result = cs.update_ct(app, device_object, result)
-    result = vs.update_vt(app, device_object, result)
+    with stage("update_ct"):
+        result = cs.update_ct(app, device_object, result, instrument_index)
+    with stage("update_vt"):
+        result = vs.update_vt(app, device_object, result, instrument_index)
 
     return result, updates
 
@@ -328,9 +353,39 @@ def determine_phase(app, device_object: Any) -> Optional[int]:
 # Setting Dictionary Creation
 # =============================================================================
 
+def _compute_plan_key(device_object: Any, phase: Optional[int]) -> Optional[str]:
+    """
+    Compute the setting plan key for a device.
+
+    Args:
+        device_object: The ProtectionDevice being configured
+        phase: Phase index from determine_phase, or None
+
+    Returns:
+        The plan key, or None if the mapping version is unavailable
+    """
+    mapping_version = mf.get_mapping_version(device_object.device)
+    if mapping_version is None:
+        return None
+
+    ratios = (
+        device_object.ct_primary,
+        device_object.ct_secondary,
+        device_object.vt_primary,
+        device_object.vt_secondary,
+    )
+    return sp.compute_plan_key(
+        device_object.device,
+        mapping_version,
+        device_object.settings,
+        ratios,
+        phase,
+    )
+
+
 def create_setting_dictionary(
     app,
-    settings: List[List],
+    settings: SettingTable,
     mapping_file: List[List],
     pf_device: Any
 ) -> Dict[str, Any]:
@@ -344,7 +399,8 @@ def create_setting_dictionary(
 
     Args:
         app: PowerFactory application object
-        settings: List of IPS setting rows
+        settings: The device's IPS settings (settings in mA, ms and kA
+            are applied in A, s and A)
         mapping_file: List of mapping file rows
         pf_device: The PowerFactory device object
 
@@ -355,7 +411,7 @@ def create_setting_dictionary(
 
     for setting in settings:
         lines = mapping_file
-        for i, value in enumerate(setting):
+        for i, value in enumerate(setting.ips_fields):
             prob_lines = []
             for line in lines:
                 if line[3] in ["None", "ON", "On", "OFF", "Off"]:
@@ -369,12 +425,7 @@ def create_setting_dictionary(
 
                 if line[index] == "use_setting":
                     key = build_setting_key(line)
-                    # Apply unit conversions
-                    if setting[-1] in ["mA", "ms"]:
-                        setting[i] = float(setting[i]) / 1000
-                    elif setting[-1] in ["kA"]:
-                        setting[i] = float(setting[i]) * 1000
-                    setting_dictionary[key] = setting[i]
+                    setting_dictionary[key] = setting.mapped_value(i)
                     continue
                 elif (
                     str(line[index]) != str(value)
@@ -408,7 +459,8 @@ def apply_settings(
     Apply settings from the mapping file to the relay.
 
     Iterates through the mapping file and applies each setting
-    to the appropriate PowerFactory element.
+    to the appropriate PowerFactory element. Settings adjusted by CT
+    ratio or a mapping file operation are adjusted together first.
 
     Args:
         app: PowerFactory application object
@@ -422,22 +474,42 @@ def apply_settings(
     """
     pf_device = device_object.pf_obj
 
-    for mapped_set in mapping_file:
-        # Skip logic elements (handled by sub-modules)
-        if (
+    # Skip logic elements (handled by sub-modules)
+    rows = [
+        (mapped_set, build_setting_key(mapped_set))
+        for mapped_set in mapping_file
+        if not (
             "_logic" in mapped_set[1]
             or "_dip" in mapped_set[1]
             or "_Trips" in mapped_set[1]
-        ):
-            continue
-
+        )
+    ]
+
+    adjusted_rows = [
+        i for i, (mapped_set, key) in enumerate(rows)
+        if key in setting_dict and _is_adjusted_setting(mapped_set)
+    ]
+    adjusted_values = dict(zip(adjusted_rows, adjust_settings(
+        app,
+        [rows[i][0] for i in adjusted_rows],
+        [setting_dict[rows[i][1]] for i in adjusted_rows],
+        device_object,
+    )))
+
+    for i, (mapped_set, key) in enumerate(rows):
         # Get the PowerFactory object for the setting
         element = find_element(app, pf_device, mapped_set)
         if not element:
             app.PrintError(f"Unable to find an element for {mapped_set}")
             continue
 
-        key = build_setting_key(mapped_set)
+        attribute = f"e:{mapped_set[2]}"
+        if i in adjusted_values:
+            updates = _set_adjusted_attribute(
+                element, attribute, adjusted_values[i], updates
+            )
+            continue
+
         try:
             setting = setting_dict[key]
         except KeyError:
@@ -447,7 +519,6 @@ def apply_settings(
             else:
                 continue
 
-        attribute = f"e:{mapped_set[2]}"
         updates = set_attribute(
             app,
             mapped_set,
@@ -584,17 +655,57 @@ def set_attribute(
     else:
         # Setting needs adjustment based on mapping file
         setting_value = setting_adjustment(app, line, setting_dictionary, device_object)
-        if not setting_value:
-            return updates
-        existing_setting = element.GetAttribute(attribute)
-        try:
-            if setting_value != existing_setting:
-                element.SetAttribute(attribute, setting_value)
-                return True
-        except TypeError:
-            setting_value = int(setting_value)
-            if setting_value != existing_setting:
-                element.SetAttribute(attribute, setting_value)
-                return True
+        return _set_adjusted_attribute(element, attribute, setting_value, updates)
+
+    return updates
+
+
+def _is_adjusted_setting(line: List) -> bool:
+    """
+    Check whether set_attribute applies a line's setting with adjustment.
+
+    Args:
+        line: Mapping file line
+
+    Returns:
+        True if the line's setting goes through setting_adjustment
+    """
+    return (
+        line[2] not in ("pcharac", "outserv")
+        and len(line) > 6
+        and line[6] != "None"
+    )
+
+
+def _set_adjusted_attribute(
+    element: Any,
+    attribute: str,
+    setting_value: Any,
+    updates: bool
+) -> bool:
+    """
+    Set an attribute to an adjusted setting value.
+
+    Args:
+        element: The PowerFactory element
+        attribute: The attribute name (e.g., "e:Ipset")
+        setting_value: Result of setting adjustment (falsy values are
+            not applied)
+        updates: Current updates flag
 
+    Returns:
+        Updated updates flag
+    """
+    if not setting_value:
+        return updates
+    existing_setting = element.GetAttribute(attribute)
+    try:
+        if setting_value != existing_setting:
+            element.SetAttribute(attribute, setting_value)
+            return True
+    except TypeError:
+        setting_value = int(setting_value)
+        if setting_value != existing_setting:
+            element.SetAttribute(attribute, setting_value)
+            return True
     return updates
\ No newline at end of file
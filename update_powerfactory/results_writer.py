@@ -0,0 +1,264 @@
+"""
+Streaming writer for the results file.
+
+update_pf used to hold every result until the end of the run, when main
+wrote them all to the results CSV. A crash lost the lot, even though the
+run journal could resume the PowerFactory changes. ResultsWriter appends
+each result to a partial file ("<results file>.partial") as its device
+completes:
+- Rows are flushed as they are written and synced to disk every
+  SYNC_EVERY_ROWS rows
+- The columns are derived from UpdateResult (RESULT_COLUMNS), so the
+  header is written first
+- Columns only known during the run (the TIME_<STAGE> stage timings) are
+  added with add_columns() and appended after the existing ones
+- finalise() writes the rows in their original device order to a
+  temporary file and replaces the results file with it in one step. The
+  header then lists every column, and rows written before a column was
+  added are given an empty value for it. A results file from an earlier
+  run is left in place until then.
+
+Only the byte range, sort position and column count of each row, and the
+number of rows per result, are kept in memory. After a crash, the partial
+file holds the results of every device completed so far, in processing
+order; its header lists only the columns known when it was opened.
+read_results() reads a finalised file back one row at a time.
+
+Usage:
+    from update_powerfactory.results_writer import ResultsWriter
+
+    writer = ResultsWriter(save_file)
+    try:
+        _, updates = up.update_pf(
+            app, devices, capture, results_writer=writer
+        )
+    except Exception:
+        writer.close()  # Keep the partial file
+        raise
+    if writer.finalise():
+        print_results(app, read_results(save_file))
+"""
+
+import csv
+import io
+import os
+from pathlib import Path
+from typing import (
+    Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
+
+from core import UpdateResult
+from core.update_result import RESULT_COLUMNS
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Sync the partial file to disk after this many rows
+SYNC_EVERY_ROWS = 25
+
+# Suffix of the file rows are appended to during the run
+PARTIAL_SUFFIX = ".partial"
+
+
+class ResultsWriter:
+    """
+    Append-only results file writer with an atomic finalise.
+
+    Attributes:
+        path: Location of the results file
+        partial_path: Location of the partial file written during the run
+        columns: Column names, in order
+        rows: Number of rows written
+        result_counts: Number of rows written per RESULT value
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        columns: Sequence[str] = tuple(RESULT_COLUMNS.values()),
+        encoding: str = "utf-8",
+        sync_every: int = SYNC_EVERY_ROWS
+    ):
+        """
+        Open the partial file and write the header.
+
+        Args:
+            path: Location of the results file
+            columns: Column names (keys outside them and columns added
+                later are not written)
+            encoding: File encoding
+            sync_every: Sync to disk after this many rows
+        """
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + PARTIAL_SUFFIX)
+        self.columns: List[str] = list(columns)
+        self.rows = 0
+        self.result_counts: Dict[str, int] = {}
+        self._encoding = encoding
+        self._sync_every = sync_every
+        self._unsynced = 0
+
+        # (sort position, start offset, end offset, column count) of each row
+        self._index: List[Tuple[int, int, int, int]] = []
+
+        # The DictWriter shares the column list, so added columns are
+        # written from the next row on
+        self._buffer = io.StringIO()
+        self._csv = csv.DictWriter(
+            self._buffer, fieldnames=self.columns, extrasaction="ignore"
+        )
+        self._csv.writeheader()
+
+        self.partial_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.partial_path, "wb")
+        self._file.write(self._take_buffer())
+
+    def _take_buffer(self) -> bytes:
+        """Get and clear the encoded CSV buffer."""
+        data = self._buffer.getvalue().encode(self._encoding)
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def add_columns(self, columns: Iterable[str]) -> None:
+        """
+        Add columns after the existing ones.
+
+        Columns already present are ignored.
+
+        Args:
+            columns: Column names, in order
+        """
+        known = set(self.columns)
+        for column in columns:
+            if column not in known:
+                self.columns.append(column)
+                known.add(column)
+
+    def write(
+        self,
+        result: Union[UpdateResult, Dict[str, str]],
+        position: Optional[int] = None
+    ) -> None:
+        """
+        Append a result.
+
+        Args:
+            result: The device's UpdateResult (or result dictionary)
+            position: Sort position of the row in the finalised file (in
+                order written if not given). Rows with equal positions keep
+                the order they were written in.
+        """
+        if isinstance(result, UpdateResult):
+            result = result.to_dict()
+        self._csv.writerow(result)
+        outcome = result.get(RESULT_COLUMNS["result"], "")
+        self.result_counts[outcome] = self.result_counts.get(outcome, 0) + 1
+
+        start = self._file.tell()
+        self._file.write(self._take_buffer())
+        self._file.flush()
+        self._index.append((
+            self.rows if position is None else position,
+            start,
+            self._file.tell(),
+            len(self.columns),
+        ))
+        self.rows += 1
+
+        self._unsynced += 1
+        if self._unsynced >= self._sync_every:
+            self._sync()
+
+    def write_all(
+        self,
+        results: Sequence[Union[UpdateResult, Dict[str, Any]]],
+        first_position: int = 0
+    ) -> None:
+        """
+        Append several results with consecutive sort positions.
+
+        Args:
+            results: UpdateResults or result dictionaries, in order
+            first_position: Sort position of the first result
+        """
+        for offset, result in enumerate(results):
+            self.write(result, first_position + offset)
+
+    def _sync(self) -> None:
+        """Flush the partial file to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def finalise(self) -> Optional[Path]:
+        """
+        Replace the results file with the rows in sort order.
+
+        If no rows were written, no results file is created and a
+        results file from an earlier run is removed.
+
+        Returns:
+            The results file, or None if there were no rows
+        """
+        self._sync()
+        self._file.close()
+
+        if not self._index:
+            logger.warning(f"No data to write to {self.path}")
+            self.partial_path.unlink()
+            self.path.unlink(missing_ok=True)
+            return None
+
+        # Header with every column, and the padding of rows written before
+        # the last columns were added
+        self._csv.writeheader()
+        header = self._take_buffer()
+        terminator = self._csv.writer.dialect.lineterminator.encode(self._encoding)
+        delimiter = self._csv.writer.dialect.delimiter.encode(self._encoding)
+
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(self.partial_path, "rb") as source, open(temp_path, "wb") as target:
+            target.write(header)
+            for _, start, end, count in sorted(self._index, key=lambda entry: entry[0]):
+                source.seek(start)
+                row = source.read(end - start)
+                if count < len(self.columns):
+                    padding = delimiter * (len(self.columns) - count)
+                    row = row[:-len(terminator)] + padding + terminator
+                target.write(row)
+            target.flush()
+            os.fsync(target.fileno())
+
+        os.replace(temp_path, self.path)
+        self.partial_path.unlink()
+        logger.debug(f"Wrote {self.rows} rows to {self.path}")
+        return self.path
+
+    def close(self) -> None:
+        """Close the partial file without finalising, keeping its rows."""
+        if not self._file.closed:
+            self._sync()
+            self._file.close()
+
+
+def read_results(
+    path: Union[str, Path],
+    encoding: str = "utf-8"
+) -> Iterator[Dict[str, str]]:
+    """
+    Read a results file one row at a time.
+
+    Empty values are left out, so rows have the keys UpdateResult.to_dict()
+    gives them.
+
+    Args:
+        path: Location of the results file
+        encoding: File encoding
+
+    Yields:
+        Result dictionary of each row, in file order
+    """
+    with open(path, "r", encoding=encoding, newline="") as f:
+        for row in csv.DictReader(f):
+            yield {column: value for column, value in row.items() if value}
@@ -0,0 +1,216 @@
+"""
+Checkpoint and resume journal for long batch runs.
+
+update_pf holds PowerFactory changes in the write cache and results in
+memory until the end of the run, so a crash or PowerFactory hang near the
+end of a large batch loses everything. The run journal records each
+completed device and its UpdateResult as the run progresses.
+
+The journal is an append-only JSON Lines file with two record types:
+- {"type": "device", "key": ..., "result": {...}}
+- {"type": "commit", "devices": n, "timestamp": ...}
+
+A commit record is written immediately after each WriteChangesToDb call.
+Only devices followed by a commit record are treated as completed when
+the journal is loaded, because changes still held in the write cache
+are lost if PowerFactory crashes.
+
+Usage:
+    from update_powerfactory.run_journal import RunJournal
+
+    journal = RunJournal(get_journal_file(name), resume=True)
+    if journal.is_completed(key):
+        ...
+    journal.record(key, result)
+    app.WriteChangesToDb()
+    journal.mark_committed()
+    journal.finalise()
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core import UpdateResult
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def device_key(device_object: Any) -> str:
+    """
+    Build a journal key that identifies a device across runs.
+
+    The key combines the full PowerFactory path of the device object with
+    the IPS setting ID, so A+B devices sharing a setting ID and devices
+    sharing a name in different cubicles remain distinct.
+
+    Args:
+        device_object: The ProtectionDevice being processed
+
+    Returns:
+        Journal key string
+    """
+    pf_obj = device_object.pf_obj
+    try:
+        location = pf_obj.GetFullName()
+    except AttributeError:
+        location = getattr(pf_obj, "loc_name", "")
+    return f"{location}|{device_object.setting_id or ''}"
+
+
+class RunJournal:
+    """
+    Append-only journal of devices completed during an update run.
+
+    Attributes:
+        path: Location of the journal file
+        resumed: Number of committed devices loaded from a previous run
+    """
+
+    def __init__(self, path: Union[str, Path], resume: bool = False):
+        """
+        Open a journal, optionally resuming from an existing file.
+
+        Args:
+            path: Location of the journal file
+            resume: If True, load committed devices from an existing
+                journal and append to it. If False, any existing journal
+                is discarded.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._completed: Dict[str, Dict[str, str]] = {}
+        self._pending = 0
+
+        if resume and self.path.exists():
+            self._load()
+            mode = "a"
+        else:
+            mode = "w"
+
+        self.resumed = len(self._completed)
+        self._file = open(self.path, mode, encoding="utf-8")
+
+        if self.resumed:
+            logger.info(
+                f"Resuming from journal {self.path}: "
+                f"{self.resumed} devices already completed"
+            )
+
+    def _load(self) -> None:
+        """Load committed device results from the journal file."""
+        pending: Dict[str, Dict[str, str]] = {}
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written final line from a crashed run
+                    continue
+
+                if entry.get("type") == "device":
+                    pending[entry["key"]] = entry.get("result", {})
+                elif entry.get("type") == "commit":
+                    self._completed.update(pending)
+                    pending.clear()
+
+        if pending:
+            logger.warning(
+                f"Ignoring {len(pending)} uncommitted journal entries in {self.path}"
+            )
+
+    def is_completed(self, key: str) -> bool:
+        """
+        Check whether a device was completed and committed in a previous run.
+
+        Args:
+            key: Journal key from device_key()
+
+        Returns:
+            True if the device can be skipped
+        """
+        return key in self._completed
+
+    def completed_result(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Get the journalled result of a completed device.
+
+        Args:
+            key: Journal key from device_key()
+
+        Returns:
+            The result dictionary, or None if not journalled
+        """
+        return self._completed.get(key)
+
+    def completed_results(self) -> List[Dict[str, str]]:
+        """
+        Get all journalled results loaded from a previous run.
+
+        Returns:
+            List of result dictionaries
+        """
+        return list(self._completed.values())
+
+    def record(self, key: str, result: Union[UpdateResult, Dict[str, str]]) -> None:
+        """
+        Append a completed device to the journal.
+
+        Args:
+            key: Journal key from device_key()
+            result: The device's UpdateResult (or result dictionary)
+        """
+        if isinstance(result, UpdateResult):
+            result = result.to_dict()
+        entry = {"type": "device", "key": key, "result": result}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._pending += 1
+
+    @property
+    def pending(self) -> int:
+        """Number of devices recorded since the last commit."""
+        return self._pending
+
+    def mark_committed(self) -> None:
+        """
+        Record that all devices journalled so far are committed to the database.
+
+        Call immediately after WriteChangesToDb. The commit record is
+        synced to disk before returning.
+        """
+        entry = {
+            "type": "commit",
+            "devices": self._pending,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        """Close the journal file, keeping it for a later resume."""
+        if not self._file.closed:
+            self._file.close()
+
+    def finalise(self) -> None:
+        """
+        Close and remove the journal once the run's results are saved.
+        """
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,320 @@
+"""
+Content-addressed memoisation of computed relay setting plans.
+
+Many devices in a project share identical inputs. A+B double cable box
+records create two devices from one setting ID, and standard recloser
+templates are applied with identical settings across a feeder. Without
+memoisation, relay_settings recomputes the setting dictionary, the
+reclosing logic rows and the dip switch strings for every one of them.
+
+A setting plan is addressed by a hash of everything that determines it:
+- Relay pattern (after SWER/switch/sectionaliser/earth classification)
+- Mapping file version (content digest of the relay map CSV)
+- The IPS setting rows
+- CT and VT ratios
+- The phase assigned to single-phase relays
+
+Plan components are stored in a device-independent form. Mapping rows
+have their folder column substituted with the device name, so setting
+dictionary entries are stored by mapping row position and rebuilt into
+keys for the device being configured.
+
+Cache Statistics:
+    Call get_cache_stats() to see hit/miss counts and hit rates. The
+    orchestrator clears the plans and statistics at the start of each
+    update run and reports them in the run summary, so each project in a
+    batch reports its own rates.
+
+Usage:
+    from update_powerfactory import setting_plan as sp
+
+    key = sp.compute_plan_key(pattern, version, settings, ratios, phase)
+    setting_dict = sp.get_setting_dictionary(key, mapping_file)
+    if setting_dict is None:
+        setting_dict = create_setting_dictionary(...)
+        sp.store_setting_dictionary(key, mapping_file, setting_dict)
+"""
+
+import hashlib
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from core.setting_table import IPS_FIELD_COUNT
+from update_powerfactory.setting_utils import build_setting_key
+
+
+# Upper bound on the number of plans held at once. Plans are small, but
+# a batch runner processing many projects in one process should not
+# grow without limit. The oldest plans are evicted first.
+MAX_CACHED_PLANS = 5000
+
+
+# =============================================================================
+# Cache Storage
+# =============================================================================
+
+# Setting dictionaries: {plan_key: [(mapping_row_index, value), ...]}
+_setting_dict_cache: Dict[str, List[Tuple[int, Any]]] = {}
+
+# Reclosing logic rows: {(plan_key, op_to_lockout): {row_name: (values...)}}
+_reclosing_cache: Dict[Tuple[str, int], Dict[str, Tuple[float, ...]]] = {}
+
+# Dip switch strings: {(plan_key, element_name, dip_names, base): dip_set}
+_dip_cache: Dict[Tuple[Hashable, ...], str] = {}
+
+# Cache statistics for monitoring
+_cache_stats = {
+    "setting_dict_hits": 0,
+    "setting_dict_misses": 0,
+    "reclosing_hits": 0,
+    "reclosing_misses": 0,
+    "dip_hits": 0,
+    "dip_misses": 0,
+}
+
+
+# =============================================================================
+# Cache Management
+# =============================================================================
+
+def clear_cache() -> None:
+    """
+    Clear all cached setting plans and reset statistics.
+
+    Call this if mapping files or setting logic have been changed
+    during runtime.
+    """
+    _setting_dict_cache.clear()
+    _reclosing_cache.clear()
+    _dip_cache.clear()
+    for stat in _cache_stats:
+        _cache_stats[stat] = 0
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get plan cache statistics for monitoring and the run summary.
+
+    Returns:
+        Dictionary with hit/miss counts, hit rates and current cache sizes
+    """
+    stats: Dict[str, Any] = dict(_cache_stats)
+    for component in ("setting_dict", "reclosing", "dip"):
+        hits = _cache_stats[f"{component}_hits"]
+        total = hits + _cache_stats[f"{component}_misses"]
+        stats[f"{component}_hit_rate"] = round(hits / total, 3) if total else 0.0
+    stats["plans_cached"] = len(_setting_dict_cache)
+    return stats
+
+
+def _store(cache: Dict, key: Hashable, value: Any) -> None:
+    """Store a value, evicting the oldest entry if the cache is full."""
+    if key not in cache and len(cache) >= MAX_CACHED_PLANS:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+# =============================================================================
+# Plan Keys
+# =============================================================================
+
+def compute_plan_key(
+    pattern: str,
+    mapping_version: Optional[str],
+    settings: Sequence[Sequence[Any]],
+    ratios: Tuple[Any, ...],
+    phase: Optional[int]
+) -> str:
+    """
+    Compute the content address of a device's setting plan.
+
+    Args:
+        pattern: The relay pattern after device classification
+        mapping_version: Version string of the pattern's mapping file
+        settings: The device's IPS setting rows (only the IPS fields of
+            each row are hashed)
+        ratios: (ct_primary, ct_secondary, vt_primary, vt_secondary)
+        phase: Phase index for single-phase relays, or None
+
+    Returns:
+        Hex digest identifying the plan
+
+    Example:
+        >>> key = compute_plan_key("RC10", "rc10:ab12", [], (1, 1, 1, 1), None)
+        >>> len(key)
+        40
+    """
+    digest = hashlib.sha1()
+    digest.update(repr((pattern, mapping_version, ratios, phase)).encode("utf-8"))
+    for row in settings:
+        digest.update(repr(tuple(row[:IPS_FIELD_COUNT])).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# =============================================================================
+# Setting Dictionary
+# =============================================================================
+
+def get_setting_dictionary(
+    plan_key: Optional[str],
+    mapping_file: List[List]
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a cached setting dictionary rebuilt for this device's mapping rows.
+
+    Args:
+        plan_key: The plan key, or None to bypass the cache
+        mapping_file: The device's processed mapping file rows
+
+    Returns:
+        The setting dictionary, or None on a cache miss
+    """
+    if plan_key is None:
+        return None
+
+    entries = _setting_dict_cache.get(plan_key)
+    if entries is None:
+        _cache_stats["setting_dict_misses"] += 1
+        return None
+
+    _cache_stats["setting_dict_hits"] += 1
+    return {
+        build_setting_key(mapping_file[index]): value
+        for index, value in entries
+    }
+
+
+def store_setting_dictionary(
+    plan_key: Optional[str],
+    mapping_file: List[List],
+    setting_dict: Dict[str, Any]
+) -> None:
+    """
+    Store a setting dictionary in device-independent (row position) form.
+
+    Args:
+        plan_key: The plan key, or None to bypass the cache
+        mapping_file: The device's processed mapping file rows
+        setting_dict: The setting dictionary computed for the device
+    """
+    if plan_key is None:
+        return
+
+    first_row_for_key: Dict[str, int] = {}
+    for index, line in enumerate(mapping_file):
+        first_row_for_key.setdefault(build_setting_key(line), index)
+
+    entries = []
+    for key, value in setting_dict.items():
+        index = first_row_for_key.get(key)
+        if index is None:
+            # Key cannot be expressed positionally - do not cache this plan
+            return
+        entries.append((index, value))
+
+    _store(_setting_dict_cache, plan_key, entries)
+
+
+# =============================================================================
+# Reclosing Logic Rows
+# =============================================================================
+
+def get_reclosing_rows(
+    plan_key: Optional[str],
+    op_to_lockout: int
+) -> Optional[Dict[str, List[float]]]:
+    """
+    Get cached reclosing logic rows for a plan.
+
+    Args:
+        plan_key: The plan key, or None to bypass the cache
+        op_to_lockout: Number of operations to lockout on the element
+
+    Returns:
+        Dictionary mapping row names to logic values, or None on a miss
+    """
+    if plan_key is None:
+        return None
+
+    rows = _reclosing_cache.get((plan_key, op_to_lockout))
+    if rows is None:
+        _cache_stats["reclosing_misses"] += 1
+        return None
+
+    _cache_stats["reclosing_hits"] += 1
+    return {name: list(values) for name, values in rows.items()}
+
+
+def store_reclosing_rows(
+    plan_key: Optional[str],
+    op_to_lockout: int,
+    row_dict: Dict[str, List[float]]
+) -> None:
+    """
+    Store reclosing logic rows for a plan.
+
+    Args:
+        plan_key: The plan key, or None to bypass the cache
+        op_to_lockout: Number of operations to lockout on the element
+        row_dict: Dictionary mapping row names to logic values
+    """
+    if plan_key is None:
+        return
+    rows = {name: tuple(values) for name, values in row_dict.items()}
+    _store(_reclosing_cache, (plan_key, op_to_lockout), rows)
+
+
+# =============================================================================
+# Dip Switch Settings
+# =============================================================================
+
+def get_dip_setting(
+    plan_key: Optional[str],
+    element_name: str,
+    dip_names: Sequence[str],
+    dip_base: str
+) -> Optional[str]:
+    """
+    Get a cached dip switch string for a plan's dip element.
+
+    Args:
+        plan_key: The plan key, or None to bypass the cache
+        element_name: Name of the dip element in the mapping file
+        dip_names: Dip switch names from the element type
+        dip_base: The element's dip string with every switch OFF
+
+    Returns:
+        The dip switch string, or None on a miss
+    """
+    if plan_key is None:
+        return None
+
+    dip_set = _dip_cache.get((plan_key, element_name, tuple(dip_names), dip_base))
+    if dip_set is None:
+        _cache_stats["dip_misses"] += 1
+        return None
+
+    _cache_stats["dip_hits"] += 1
+    return dip_set
+
+
+def store_dip_setting(
+    plan_key: Optional[str],
+    element_name: str,
+    dip_names: Sequence[str],
+    dip_base: str,
+    dip_set: str
+) -> None:
+    """
+    Store a dip switch string for a plan's dip element.
+
+    Args:
+        plan_key: The plan key, or None to bypass the cache
+        element_name: Name of the dip element in the mapping file
+        dip_names: Dip switch names from the element type
+        dip_base: The element's dip string with every switch OFF
+        dip_set: The computed dip switch string
+    """
+    if plan_key is None:
+        return
+    key = (plan_key, element_name, tuple(dip_names), dip_base)
+    _store(_dip_cache, key, dip_set)
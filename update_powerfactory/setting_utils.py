@@ -9,21 +9,46 @@ modules for common operations like:
 - Setting value adjustments
 - String-to-list conversion
 
+Binary settings are handled as integers: bit selections, disable
+condition lists and binary setting strings are parsed once per distinct
+mapping file value, and on/off results are memoised by (setting value,
+disable condition). These run for every outserv/pcharac line of every
+relay.
+
+Setting adjustments are compiled per mapping line (CT ratio adjustments
+and operators with their parsed operand) and applied to all of a device's
+adjusted settings in one adjust_settings() call.
+
 Usage:
     from update_powerfactory.setting_utils import (
         build_setting_key,
         determine_on_off,
         convert_binary,
         setting_adjustment,
+        adjust_settings,
     )
 """
 
 import ast
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on each memo of parsed or evaluated setting values
+MAX_CACHED_VALUES = 4096
+
+
+def clear_cache() -> None:
+    """Clear the parsed setting value and on/off memos."""
+    for cached in (
+        _parse_string_list, _bit_positions, _extract_bits,
+        _cached_on_off, _parse_disable_condition, _binary_digits,
+        _math_adjustment,
+    ):
+        cached.cache_clear()
+
 
 # =============================================================================
 # Key Construction
@@ -73,11 +98,17 @@ def convert_string_to_list(string: str) -> List[str]:
         >>> convert_string_to_list("[ON, Off, AUTO]")
         ['on', 'off', 'auto']
     """
+    return list(_parse_string_list(string))
+
+
+@lru_cache(maxsize=MAX_CACHED_VALUES)
+def _parse_string_list(string: str) -> Tuple[str, ...]:
+    """Parse a list-like string once (see convert_string_to_list)."""
     try:
         # Use ast.literal_eval for safe parsing of list literals
         parsed = ast.literal_eval(string)
         if isinstance(parsed, list):
-            return [str(item).lower() for item in parsed]
+            return tuple(str(item).lower() for item in parsed)
     except (ValueError, SyntaxError):
         pass
 
@@ -99,7 +130,7 @@ def convert_string_to_list(string: str) -> List[str]:
         else:
             element += char
 
-    return result if result else [string.lower().strip("[]")]
+    return tuple(result) if result else (string.lower().strip("[]"),)
 
 
 # =============================================================================
@@ -128,24 +159,55 @@ def convert_binary(app, setting_value: Any, line: List) -> str:
         '101'
     """
     try:
-        binary_val = str(bin(int(setting_value))).replace("0b", "")
+        value = int(setting_value)
     except (ValueError, TypeError):
         return "0"
 
-    # Get bit positions from mapping file (negative indices from right)
-    bits_of_int = [-int(num) for num in str(line[-2])]
+    return _extract_bits(value, _bit_positions(str(line[-2])))
 
-    # Pad binary value with leading zeros
-    binary_val = "0000000000000" + binary_val
 
-    new_setting_value = ""
-    for bit_of_int in bits_of_int:
-        try:
-            new_setting_value += binary_val[bit_of_int]
-        except IndexError:
-            new_setting_value += "0"
+@lru_cache(maxsize=MAX_CACHED_VALUES)
+def _bit_positions(spec: str) -> Tuple[int, ...]:
+    """
+    Parse the bit positions of a binary mapping line.
+
+    Args:
+        spec: One digit per extracted bit, counted from the right starting
+            at 1 (0 always extracts "0")
+
+    Returns:
+        Tuple of bit positions
+
+    Raises:
+        ValueError: If spec contains a character that is not a digit
+    """
+    return tuple(int(num) for num in spec)
+
+
+@lru_cache(maxsize=MAX_CACHED_VALUES)
+def _extract_bits(value: int, positions: Tuple[int, ...]) -> str:
+    """
+    Extract bits of an integer as a string of "0"s and "1"s.
 
-    return new_setting_value
+    Matches indexing the sign and binary digits of the value from the
+    right, with zeros beyond them: for a negative value the position just
+    past its highest bit extracts "-".
+
+    Args:
+        value: The setting value
+        positions: Bit positions from _bit_positions()
+
+    Returns:
+        String with one character per position
+    """
+    magnitude = abs(value)
+    sign_position = magnitude.bit_length() + 1 if value < 0 else None
+    return "".join(
+        "-" if position == sign_position
+        else "1" if position and magnitude >> (position - 1) & 1
+        else "0"
+        for position in positions
+    )
 
 
 # =============================================================================
@@ -169,6 +231,15 @@ def determine_on_off(app, setting_value: Any, disable_cond: Any) -> int:
     Returns:
         0 for disabled/off, 1 for enabled/on
     """
+    try:
+        return _cached_on_off(setting_value, disable_cond)
+    except TypeError:
+        # Unhashable setting value or condition
+        return _on_off(setting_value, disable_cond)
+
+
+def _on_off(setting_value: Any, disable_cond: Any) -> int:
+    """Evaluate determine_on_off without memoisation."""
     # Handle empty/None setting values
     if not setting_value:
         if str(disable_cond).upper() == "ON":
@@ -182,14 +253,19 @@ def determine_on_off(app, setting_value: Any, disable_cond: Any) -> int:
         return _check_bit_condition(setting_value, int(disable_cond))
 
     # Handle list-based disable conditions
-    disable_list = _parse_disable_condition(disable_cond)
+    disable_set = _parse_disable_condition(str(disable_cond))
 
-    if str(setting_value).lower() in disable_list:
+    if str(setting_value).lower() in disable_set:
         return 1
 
     return 0
 
 
+# Results by (setting value, disable condition). Typed, so that 1, 1.0 and
+# True are kept apart (their strings differ).
+_cached_on_off = lru_cache(maxsize=MAX_CACHED_VALUES, typed=True)(_on_off)
+
+
 def _is_integer(value: Any) -> bool:
     """Check if a value can be converted to an integer."""
     try:
@@ -199,22 +275,21 @@ def _is_integer(value: Any) -> bool:
         return False
 
 
-def _parse_disable_condition(disable_cond: Any) -> List[str]:
+@lru_cache(maxsize=MAX_CACHED_VALUES)
+def _parse_disable_condition(cond_str: str) -> FrozenSet[str]:
     """
-    Parse a disable condition into a list of lowercase strings.
+    Parse a disable condition into a set of lowercase strings.
 
     Args:
-        disable_cond: The disable condition (string or list-like string)
+        cond_str: The disable condition (string or list-like string)
 
     Returns:
-        List of lowercase condition strings
+        Set of lowercase condition strings
     """
-    cond_str = str(disable_cond)
-
     if "[" in cond_str and "]" in cond_str:
-        return convert_string_to_list(cond_str)
+        return frozenset(_parse_string_list(cond_str))
 
-    return [cond_str.lower()]
+    return frozenset((cond_str.lower(),))
 
 
 def _check_bit_condition(setting_value: Any, bit_position: int) -> int:
@@ -228,20 +303,37 @@ def _check_bit_condition(setting_value: Any, bit_position: int) -> int:
     Returns:
         0 if bit is set (disabled), 1 if bit is clear (enabled)
     """
-    normalized = _normalize_binary_string(str(setting_value))
+    digits = _binary_digits(str(setting_value))
+    if digits is None:
+        return 1  # Default to enabled for non-binary values
 
-    # Check for valid binary string (all 0s and 1s)
-    for char in normalized:
-        if char not in ["0", "1"]:
-            return 1  # Default to enabled for non-binary values
-
-    try:
-        if normalized[bit_position] == "1":
-            return 0  # Bit set = disabled
-        return 1  # Bit clear = enabled
-    except IndexError:
+    length, mask = digits
+    if not -length <= bit_position < length:
         return 1  # Default to enabled if bit position out of range
 
+    # Positions index the string from the left (negative from the right)
+    if mask >> (length - 1 - bit_position % length) & 1:
+        return 0  # Bit set = disabled
+    return 1  # Bit clear = enabled
+
+
+@lru_cache(maxsize=MAX_CACHED_VALUES)
+def _binary_digits(setting_str: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a setting value as a binary string.
+
+    Args:
+        setting_str: The setting value as a string
+
+    Returns:
+        (number of digits, integer value) of the normalized string, or
+        None if it contains anything but 0s and 1s
+    """
+    normalized = _normalize_binary_string(setting_str)
+    if normalized.strip("01"):
+        return None
+    return len(normalized), int(normalized, 2) if normalized else 0
+
 
 def _normalize_binary_string(setting_str: str) -> str:
     """
@@ -255,7 +347,6 @@ def _normalize_binary_string(setting_str: str) -> str:
     Returns:
         Normalized string suitable for bit checking
     """
-    result = ""
     expected_len = len(setting_str)
 
     # Handle exponential notation
@@ -265,24 +356,19 @@ def _normalize_binary_string(setting_str: str) -> str:
         except (ValueError, IndexError):
             pass
 
-    for char in setting_str:
-        if char == "e":
-            break
-        if char == ".":
-            continue
-        result += char
-
-    # Pad to expected length
-    while len(result) < expected_len:
-        result += "0"
-
-    return result
+    # Mantissa digits without the decimal point, padded to expected length
+    result = setting_str.split("e", 1)[0].replace(".", "")
+    return result.ljust(expected_len, "0")
 
 
 # =============================================================================
 # Setting Adjustment
 # =============================================================================
 
+# Setting adjustment as (setting, ct_primary, ct_secondary) -> value
+Adjustment = Callable[[Any, Any, Any], Any]
+
+
 def setting_adjustment(
     app,
     line: List,
@@ -299,6 +385,8 @@ def setting_adjustment(
     - "perc_pu": Convert percentage to per-unit using CT secondary
     - Mathematical operation: Apply +, -, *, / with value from mapping file
 
+    Use adjust_settings() to adjust all of a device's settings at once.
+
     Args:
         app: PowerFactory application object
         line: Mapping file line containing adjustment parameters
@@ -308,82 +396,149 @@ def setting_adjustment(
     Returns:
         Adjusted setting value, or None if adjustment failed
     """
-    key = build_setting_key(line)
-
     try:
-        setting = float(setting_dictionary[key])
-    except (KeyError, ValueError, TypeError):
-        # Try to handle as on/off value
-        try:
-            setting_value = determine_on_off(app, setting_dictionary[key], line[6])
-            return setting_value
-        except (KeyError, IndexError, ValueError, TypeError):
-            setting = 0
-
-    adjustment_type = line[-1]
-
-    if adjustment_type == "primary":
-        primary = device_object.ct_primary
-        if primary == 0:
-            return None
-        return setting / primary
-
-    elif adjustment_type == "ctr":
-        primary = device_object.ct_primary
-        secondary = device_object.ct_secondary
-        if primary == 0:
-            return None
-        return setting * secondary / primary
-
-    elif adjustment_type == "secondary":
-        secondary = device_object.ct_secondary
-        if secondary == 0:
-            return None
-        return setting / secondary
-
-    elif adjustment_type == "perc_pu":
-        secondary = device_object.ct_secondary
-        return (setting / 100) * secondary
+        setting_value = setting_dictionary[build_setting_key(line)]
+    except KeyError:
+        # No setting to adjust
+        return compile_adjustment(line)(
+            0, device_object.ct_primary, device_object.ct_secondary
+        )
 
-    else:
-        # Mathematical operation
-        return _apply_math_operation(setting, line)
+    return adjust_settings(app, [line], [setting_value], device_object)[0]
 
 
-def _apply_math_operation(
-    setting: float,
-    line: List
-) -> Optional[float]:
+def adjust_settings(
+    app,
+    lines: Sequence[List],
+    setting_values: Sequence[Any],
+    device_object: Any
+) -> List[Optional[float]]:
     """
-    Apply a mathematical operation to a setting value.
+    Adjust a batch of setting values of one device.
+
+    Settings that are not numbers are evaluated with determine_on_off()
+    against column G of their line. Numbers are adjusted with the compiled
+    adjustment of their line (see setting_adjustment()).
+
+    Args:
+        app: PowerFactory application object
+        lines: Mapping file lines containing adjustment parameters
+        setting_values: Setting dictionary value of each line
+        device_object: The ProtectionDevice (for CT ratios)
+
+    Returns:
+        Adjusted value of each line, or None where adjustment failed
+    """
+    primary = device_object.ct_primary
+    secondary = device_object.ct_secondary
+    adjusted = []
+
+    for line, setting_value in zip(lines, setting_values):
+        try:
+            setting = float(setting_value)
+        except (ValueError, TypeError):
+            # Try to handle as on/off value
+            try:
+                adjusted.append(determine_on_off(app, setting_value, line[6]))
+                continue
+            except (IndexError, ValueError, TypeError):
+                setting = 0
+
+        adjusted.append(compile_adjustment(line)(setting, primary, secondary))
+
+    return adjusted
+
 
-    The operation and operand are read from the mapping file line.
+def compile_adjustment(line: List) -> Adjustment:
+    """
+    Get the adjustment a mapping file line applies to its setting.
 
     Args:
-        setting: The base setting value
-        line: Mapping file line with operator at [6] and value at [7]
+        line: Mapping file line, with the adjustment type in the last
+            column, or an operator at [6] and operand at [7]
 
     Returns:
-        Result of the operation, or the original setting if operation fails
+        Function of (setting, ct_primary, ct_secondary) returning the
+        adjusted setting, or None if a CT ratio is zero
     """
+    ct_adjustment = CT_ADJUSTMENTS.get(line[-1])
+    if ct_adjustment is not None:
+        return ct_adjustment
+
     try:
         math_sym = line[6]
         manipulator_value = float(line[7])
     except (IndexError, ValueError, TypeError):
-        return setting
+        return _unadjusted
+
+    return _math_adjustment(math_sym, manipulator_value)
+
+
+def _adjust_primary(setting: float, primary: Any, secondary: Any) -> Optional[float]:
+    """Divide by CT primary."""
+    if primary == 0:
+        return None
+    return setting / primary
+
+
+def _adjust_ctr(setting: float, primary: Any, secondary: Any) -> Optional[float]:
+    """Apply CT ratio."""
+    if primary == 0:
+        return None
+    return setting * secondary / primary
+
+
+def _adjust_secondary(setting: float, primary: Any, secondary: Any) -> Optional[float]:
+    """Divide by CT secondary."""
+    if secondary == 0:
+        return None
+    return setting / secondary
+
+
+def _adjust_perc_pu(setting: float, primary: Any, secondary: Any) -> float:
+    """Convert percentage to per-unit using CT secondary."""
+    return (setting / 100) * secondary
+
 
+def _unadjusted(setting: float, primary: Any, secondary: Any) -> float:
+    """Leave the setting unchanged."""
+    return setting
+
+
+# Adjustments by mapping file adjustment type (last column)
+CT_ADJUSTMENTS: Dict[str, Adjustment] = {
+    "primary": _adjust_primary,
+    "ctr": _adjust_ctr,
+    "secondary": _adjust_secondary,
+    "perc_pu": _adjust_perc_pu,
+}
+
+
+@lru_cache(maxsize=MAX_CACHED_VALUES)
+def _math_adjustment(math_sym: Any, manipulator_value: float) -> Adjustment:
+    """
+    Compile a mathematical operation on a setting value.
+
+    Args:
+        math_sym: Operator from the mapping file ("+", "-", "*" or "/";
+            anything else leaves the setting unchanged)
+        manipulator_value: Operand from the mapping file
+
+    Returns:
+        Adjustment applying the operation
+    """
     if math_sym == "+":
-        return setting + manipulator_value
+        return lambda setting, primary, secondary: setting + manipulator_value
     elif math_sym == "-":
-        return setting - manipulator_value
+        return lambda setting, primary, secondary: setting - manipulator_value
     elif math_sym == "/":
         if manipulator_value == 0:
-            return 0
-        return setting / manipulator_value
+            return lambda setting, primary, secondary: 0
+        return lambda setting, primary, secondary: setting / manipulator_value
     elif math_sym == "*":
-        return setting * manipulator_value
+        return lambda setting, primary, secondary: setting * manipulator_value
     else:
-        return setting
+        return _unadjusted
 
 
 # =============================================================================
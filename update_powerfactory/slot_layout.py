@@ -0,0 +1,114 @@
+"""
+Relay type slot layouts for CT and VT slot assignment.
+
+update_ct_slots, update_vt_slots and the "No CT/VT Linked" branches of
+update_ct and update_vt need to know which of a relay's slots take a CT
+or VT. That is decided by the relay type's block definitions (pblk) and
+their filter models (filtmod), not by the device, so the layout is read
+once per TypRelay and reused for every relay of that type:
+- CT slots: filtmod "StaCt*" or "StaCt*,StaCombi", excluding remote slots
+- Remote CT slots: CT slots PowerFactory populates itself, which are
+  cleared ("Ct-3P(remote)", "Winding 2 Ct")
+- VT slots: filtmod "StaVt*"
+- Unlinked CT/VT slot: the first slot with filtmod exactly "StaCt*" or
+  "StaVt*", cleared when IPS has no CT or VT for the device
+
+Slots are identified by their position in pblk, which is also their
+position in the device's pdiselm list.
+
+Usage:
+    from update_powerfactory.slot_layout import get_slot_layout
+
+    layout = get_slot_layout(pf_device.typ_id)
+    for index, slot_name in layout.ct_slots:
+        ct_obj = pf_device.GetSlot(slot_name)
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# CT slots populated automatically by PowerFactory
+REMOTE_CT_SLOT_NAMES: Tuple[str, ...] = ("Ct-3P(remote)", "Winding 2 Ct")
+
+# Filter models of the slots that take a CT
+CT_FILTER_MODELS: Tuple[str, ...] = ("StaCt*", "StaCt*,StaCombi")
+
+VT_FILTER_MODEL = "StaVt*"
+
+
+class SlotLayout(NamedTuple):
+    """CT and VT slot positions of a relay type."""
+    ct_slots: Tuple[Tuple[int, str], ...]
+    remote_ct_slots: Tuple[int, ...]
+    vt_slots: Tuple[Tuple[int, str], ...]
+    unlinked_ct_slot: Optional[int]
+    unlinked_vt_slot: Optional[int]
+
+
+# Layouts by relay type, cleared by update_pf at the start of each run as
+# the keys are type objects of the active project
+_layout_cache: Dict[Any, SlotLayout] = {}
+
+
+def clear_cache() -> None:
+    """Clear the cached slot layouts."""
+    _layout_cache.clear()
+
+
+def read_slot_layout(relay_type: Any) -> SlotLayout:
+    """
+    Read the CT and VT slot layout of a relay type.
+
+    Args:
+        relay_type: PowerFactory TypRelay object
+
+    Returns:
+        SlotLayout of the type's block definitions
+    """
+    ct_slots = []
+    remote_ct_slots = []
+    vt_slots = []
+    unlinked_ct_slot = None
+    unlinked_vt_slot = None
+
+    for i, item in enumerate(relay_type.GetAttribute("pblk")):
+        if not item:
+            continue
+
+        filtmod = item.GetAttribute("filtmod")
+        if filtmod in CT_FILTER_MODELS:
+            slot_name = item.GetAttribute("loc_name")
+            if slot_name in REMOTE_CT_SLOT_NAMES:
+                remote_ct_slots.append(i)
+            else:
+                ct_slots.append((i, slot_name))
+            if filtmod == "StaCt*" and unlinked_ct_slot is None:
+                unlinked_ct_slot = i
+        elif filtmod == VT_FILTER_MODEL:
+            vt_slots.append((i, item.GetAttribute("loc_name")))
+            if unlinked_vt_slot is None:
+                unlinked_vt_slot = i
+
+    return SlotLayout(
+        tuple(ct_slots),
+        tuple(remote_ct_slots),
+        tuple(vt_slots),
+        unlinked_ct_slot,
+        unlinked_vt_slot,
+    )
+
+
+def get_slot_layout(relay_type: Any) -> SlotLayout:
+    """
+    Get the CT and VT slot layout of a relay type, reading it once.
+
+    Args:
+        relay_type: PowerFactory TypRelay object
+
+    Returns:
+        SlotLayout of the type's block definitions
+    """
+    layout = _layout_cache.get(relay_type)
+    if layout is None:
+        layout = read_slot_layout(relay_type)
+        _layout_cache[relay_type] = layout
+    return layout
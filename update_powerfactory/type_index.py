@@ -1,13 +1,20 @@
 """
-Type indexing for PowerFactory relay and fuse types.
+Type indexing for PowerFactory relay, fuse and instrument transformer types.
 
-This module provides indexed lookups for relay and fuse types,
-replacing O(n) linear scans with O(1) dictionary lookups.
+This module provides indexed lookups for relay and fuse types, and for
+the CT and VT types in the local library, replacing O(n) linear scans
+with O(1) dictionary lookups.
 
 The TypeIndex classes are designed to be built once at the start of
 processing and reused for all device updates, providing significant
 performance improvements when processing large numbers of devices.
 
+Indexes can also be created from a catalog of library type names and
+full names (see library_catalog.py). Types from a catalog are resolved
+to PowerFactory objects on first use. If a lookup misses or a catalog
+type can no longer be found, the index is rebuilt from the libraries
+once.
+
 Usage:
     # Build indexes once
     relay_index = RelayTypeIndex.build(app)
@@ -16,15 +23,28 @@ Usage:
     # O(1) lookups
     relay_type = relay_index.get("Generic SEL351 Relay")
     fuse_type = fuse_index.get_by_curve_and_rating("K", "100A")
+
+    # CT/VT types are found or created on demand
+    instrument_index = InstrumentTypeIndex(app)
+    ct_type = instrument_index.get_ct_type(400, 1)
 """
 
+import bisect
 import re
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Any, Sequence, Tuple
 
 from utils.pf_utils import all_relevant_objects
 
 
+def _resolve_catalog_entry(app, full_name: str) -> Optional[Any]:
+    """Find a library type by the full name recorded in a catalog."""
+    try:
+        return app.GetGlobalLibrary().SearchObject(full_name)
+    except AttributeError:
+        return None
+
+
 @dataclass
 class RelayTypeIndex:
     """
@@ -34,14 +54,22 @@ class RelayTypeIndex:
     a list of relay types for each device update.
 
     Attributes:
-        _by_name: Dictionary mapping relay type name to PF object
-        _all_types: List of all relay type objects (for compatibility)
+        _by_name: Dictionary mapping relay type name to PF object (None
+            for catalog types not resolved yet)
+        _all_types: Names of all relay types (for compatibility)
+        _full_names: Full names of the catalog types
+        _app: Application used to resolve catalog types
+        _rebuild: Builds the index from the libraries; called at most
+            once, on the first miss of a catalog index
     """
     _by_name: Dict[str, Any] = field(default_factory=dict)
-    _all_types: List[Any] = field(default_factory=list)
+    _all_types: List[str] = field(default_factory=list)
+    _full_names: Dict[str, str] = field(default_factory=dict)
+    _app: Any = None
+    _rebuild: Optional[Callable[[], 'RelayTypeIndex']] = None
 
     @classmethod
-    def build(cls, app) -> 'RelayTypeIndex':
+    def build(cls, app, library_types: Optional[List[Any]] = None) -> 'RelayTypeIndex':
         """
         Build the relay type index from PowerFactory libraries.
 
@@ -55,55 +83,77 @@ class RelayTypeIndex:
 
         Args:
             app: PowerFactory application object
+            library_types: Result of library_relay_types(), if the
+                caller has already read the libraries
 
         Returns:
             RelayTypeIndex with all relay types indexed by name
         """
         index = cls()
+        if library_types is None:
+            library_types = library_relay_types(app)
+        for relay_type in library_types:
+            index._add(relay_type.loc_name, relay_type)
+        index._add_local_types(app)
+        return index
+
+    @classmethod
+    def from_catalog(
+        cls,
+        app,
+        entries: Sequence[Tuple[str, str]],
+        rebuild: Optional[Callable[[], 'RelayTypeIndex']] = None
+    ) -> 'RelayTypeIndex':
+        """
+        Create the index from a catalog of library relay types.
 
-        # 1. Get relay types from ErgonLibrary
-        global_library = app.GetGlobalLibrary()
-        protection_lib = global_library.GetContents("Protection")
-        ergon_types = all_relevant_objects(app, protection_lib, "*.TypRelay", None)
+        Library types are resolved on first use. Local relay types are
+        always read from the current user's Protection folder, as they
+        differ per user and take precedence.
 
-        for relay_type in ergon_types or []:
-            name = relay_type.loc_name
-            index._by_name[name] = relay_type
-            index._all_types.append(relay_type)
-
-        # 2. Get relay types from DIgSILENT library
-        try:
-            database = global_library.fold_id
-            dig_lib = database.GetContents("Lib")[0]
-            prot_lib = dig_lib.GetContents("Prot")[0]
-            relay_lib = prot_lib.GetContents("ProtRelay")
-            dig_types = all_relevant_objects(app, relay_lib, "*.TypRelay", None)
-
-            for relay_type in dig_types or []:
-                name = relay_type.loc_name
-                if name not in index._by_name:
-                    index._by_name[name] = relay_type
-                    index._all_types.append(relay_type)
-        except (IndexError, AttributeError):
-            pass
-
-        # 3. Get local relay types (these take precedence)
+        Args:
+            app: PowerFactory application object
+            entries: (name, full name) of each library type, in the
+                precedence order build() would find them
+            rebuild: Builds the index from the libraries if a lookup
+                misses
+
+        Returns:
+            RelayTypeIndex with library types unresolved
+        """
+        index = cls(_app=app, _rebuild=rebuild)
+        for name, full_name in entries:
+            if name not in index._by_name:
+                index._add(name, None)
+                index._full_names[name] = full_name
+        index._add_local_types(app)
+        return index
+
+    def _add(self, name: str, relay_type: Optional[Any]) -> None:
+        """Add a type unless one with the same name was found earlier."""
+        if name not in self._by_name:
+            self._by_name[name] = relay_type
+            self._all_types.append(name)
+
+    def _add_local_types(self, app) -> None:
+        """Add the current user's relay types, overriding library types."""
         current_user = app.GetCurrentUser()
         protection_folder = current_user.GetContents("Protection")
         local_types = all_relevant_objects(app, protection_folder, "*.TypRelay", None)
 
-        if local_types:
-            for relay_type in local_types:
-                name = relay_type.loc_name
-                if name not in index._by_name:
-                    # New type not in libraries
-                    index._by_name[name] = relay_type
-                    index._all_types.append(relay_type)
-                else:
-                    # Local type overrides library type
-                    index._by_name[name] = relay_type
-
-        return index
+        for relay_type in local_types or []:
+            name = relay_type.loc_name
+            self._add(name, relay_type)
+            self._by_name[name] = relay_type
+            self._full_names.pop(name, None)
+
+    def _lookup(self, name: str) -> Optional[Any]:
+        """Get a type, resolving a catalog type on first use."""
+        relay_type = self._by_name.get(name)
+        if relay_type is None and name in self._full_names:
+            relay_type = _resolve_catalog_entry(self._app, self._full_names.pop(name))
+            self._by_name[name] = relay_type
+        return relay_type
 
     def get(self, name: str) -> Optional[Any]:
         """
@@ -115,18 +165,30 @@ class RelayTypeIndex:
         Returns:
             The PowerFactory TypRelay object, or None if not found
         """
-        return self._by_name.get(name)
+        relay_type = self._lookup(name)
+        if relay_type is None and self._rebuild is not None:
+            # The catalog is out of date; use the libraries for the rest
+            # of the run
+            rebuilt, self._rebuild = self._rebuild(), None
+            self._by_name, self._all_types = rebuilt._by_name, rebuilt._all_types
+            self._full_names = {}
+            relay_type = self._by_name.get(name)
+        return relay_type
 
     def get_all(self) -> List[Any]:
         """
         Get all relay types as a list.
 
         Provided for backward compatibility with code expecting a list.
+        Catalog types are resolved by this call.
 
         Returns:
             List of all relay type objects
         """
-        return self._all_types
+        return [
+            relay_type for relay_type in map(self._lookup, self._all_types)
+            if relay_type is not None
+        ]
 
     def __len__(self) -> int:
         """Return the number of indexed relay types."""
@@ -137,69 +199,234 @@ class RelayTypeIndex:
         return name in self._by_name
 
 
+# Ratings in fuse type names and sizes: "100A", "31.5A", "3/10A" (dual
+# rated), "16K", "3/10K"
+_RATING_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(?:/(\d+(?:\.\d+)?))?')
+_NAME_RATING_PATTERN = re.compile(_RATING_PATTERN.pattern + r'\s*A')
+
+
+class FuseKey(NamedTuple):
+    """
+    Structured key of a fuse type.
+
+    Attributes:
+        curve: Curve type letter (last character of the name, e.g. "K")
+        rating: Rating in amps (the first rating of a dual-rated fuse)
+        dual_rating: Second rating of a dual-rated fuse ("3/10A" -> 10.0),
+            or None
+    """
+    curve: str
+    rating: float
+    dual_rating: Optional[float] = None
+
+    def whole(self) -> 'FuseKey':
+        """Get the key with the ratings truncated to whole amps."""
+        return FuseKey(
+            self.curve,
+            float(int(self.rating)),
+            None if self.dual_rating is None else float(int(self.dual_rating)),
+        )
+
+
+def parse_rating(text: str) -> Optional[Tuple[float, Optional[float]]]:
+    """
+    Parse the first rating in a rating string.
+
+    Args:
+        text: Rating text (e.g., " 100A", "3/10", "Dual Rated 6/20/")
+
+    Returns:
+        (rating, dual_rating), or None if the text has no rating
+
+    Example:
+        >>> parse_rating("3/10")
+        (3.0, 10.0)
+    """
+    match = _RATING_PATTERN.search(text or "")
+    if not match:
+        return None
+    dual = match.group(2)
+    return float(match.group(1)), float(dual) if dual else None
+
+
+def parse_fuse_name(name: str) -> Optional[FuseKey]:
+    """
+    Parse a fuse type name into its key.
+
+    Args:
+        name: Fuse type name (e.g., "HRC 100A K", "Fuse 3/10A K")
+
+    Returns:
+        FuseKey, or None if the name has no "<rating>A" part
+
+    Example:
+        >>> parse_fuse_name("Fuse 3/10A K")
+        FuseKey(curve='K', rating=3.0, dual_rating=10.0)
+    """
+    match = _NAME_RATING_PATTERN.search(name)
+    if not name or not match:
+        return None
+    dual = match.group(2)
+    return FuseKey(
+        name[-1].upper(), float(match.group(1)), float(dual) if dual else None
+    )
+
+
 @dataclass
 class FuseTypeIndex:
     """
     Indexed collection of PowerFactory fuse types for O(1) lookup.
 
-    Fuse types are matched by curve type (K, T, etc.) and rating (e.g., "100A").
-    This class provides multiple lookup strategies:
+    Fuse type names are parsed once into (curve, rating, dual rating)
+    keys (see parse_fuse_name). This class provides multiple lookup
+    strategies:
     - Exact name match
     - Curve + rating match
     - Fuse size match (for Tx fuses)
 
+    Ratings are matched exactly. A whole-amp rating with no exact match
+    also matches a fractional rating with the same whole part ("31K"
+    matches "31.5A K"). Optionally, a rating with no match selects the
+    next higher rating of the same curve and kind (single or dual rated).
+
     Attributes:
-        _by_name: Dictionary mapping fuse type name to PF object
-        _by_curve: Dictionary mapping curve letter to list of fuse types
-        _all_types: List of all fuse type objects (for compatibility)
+        _by_name: Dictionary mapping fuse type name to PF object (None
+            for catalog types not resolved yet)
+        _by_key: Dictionary mapping FuseKey to the first fuse type name
+            with that key
+        _by_whole_key: As _by_key, with ratings truncated to whole amps
+        _all_types: Names of all fuse types (for compatibility)
+        _full_names: Full names of the catalog types
+        _app: Application used to resolve catalog types
+        _rebuild: Builds the index from the library; called at most once,
+            on the first miss of a catalog index
     """
     _by_name: Dict[str, Any] = field(default_factory=dict)
-    _by_curve: Dict[str, List[Any]] = field(default_factory=dict)
-    _all_types: List[Any] = field(default_factory=list)
-
-    # Pattern to extract rating from fuse name (e.g., " 100A" from "HRC 100A K")
-    _RATING_PATTERN = re.compile(r'\s+(\d+)A')
+    _by_key: Dict[FuseKey, str] = field(default_factory=dict)
+    _by_whole_key: Dict[FuseKey, str] = field(default_factory=dict)
+    _all_types: List[str] = field(default_factory=list)
+    _full_names: Dict[str, str] = field(default_factory=dict)
+    _app: Any = None
+    _rebuild: Optional[Callable[[], 'FuseTypeIndex']] = None
+
+    # ((rating, dual rating), name) sorted by rating for each (curve, dual
+    # rated) pair, built on the first nearest-rating lookup
+    _ladders: Optional[
+        Dict[Tuple[str, bool], List[Tuple[Tuple[float, float], str]]]
+    ] = None
 
     @classmethod
-    def build(cls, app) -> 'FuseTypeIndex':
+    def build(cls, app, library_types: Optional[List[Any]] = None) -> 'FuseTypeIndex':
         """
         Build the fuse type index from PowerFactory ErgonLibrary.
 
         Args:
             app: PowerFactory application object
+            library_types: Result of library_fuse_types(), if the caller
+                has already read the library
 
         Returns:
             FuseTypeIndex with all fuse types indexed
         """
         index = cls()
+        if library_types is None:
+            library_types = library_fuse_types(app)
+        for fuse_type in library_types:
+            index._add(fuse_type.loc_name, fuse_type)
+        return index
 
-        try:
-            ergon_lib = app.GetGlobalLibrary()
-            fuse_folder = ergon_lib.SearchObject(
-                r"\ErgonLibrary\Protection\Fuses.IntFolder"
-            )
-
-            if not fuse_folder:
-                app.PrintWarn("Fuse folder not found in ErgonLibrary")
-                return index
+    @classmethod
+    def from_catalog(
+        cls,
+        app,
+        entries: Sequence[Tuple[str, str]],
+        rebuild: Optional[Callable[[], 'FuseTypeIndex']] = None
+    ) -> 'FuseTypeIndex':
+        """
+        Create the index from a catalog of library fuse types.
 
-            fuse_types = fuse_folder.GetContents("*.TypFuse", 0)
+        Fuse types are matched by name, so only the matching type is
+        resolved to a PowerFactory object, on first use.
 
-            for fuse_type in fuse_types or []:
-                name = fuse_type.loc_name
-                index._by_name[name] = fuse_type
-                index._all_types.append(fuse_type)
+        Args:
+            app: PowerFactory application object
+            entries: (name, full name) of each fuse type
+            rebuild: Builds the index from the library if a lookup misses
 
-                # Index by curve type (last character of name)
-                curve = name[-1].upper()
-                if curve not in index._by_curve:
-                    index._by_curve[curve] = []
-                index._by_curve[curve].append(fuse_type)
+        Returns:
+            FuseTypeIndex with all fuse types unresolved
+        """
+        index = cls(_app=app, _rebuild=rebuild)
+        for name, full_name in entries:
+            index._add(name, None)
+            index._full_names[name] = full_name
+        return index
 
-        except AttributeError:
-            pass
+    def _add(self, name: str, fuse_type: Optional[Any]) -> None:
+        """Add a fuse type, indexed by its parsed key."""
+        self._by_name[name] = fuse_type
+        self._all_types.append(name)
+        key = parse_fuse_name(name)
+        if key is not None:
+            self._by_key.setdefault(key, name)
+            self._by_whole_key.setdefault(key.whole(), name)
+
+    def _lookup(self, name: str) -> Optional[Any]:
+        """Get a fuse type, resolving a catalog type on first use."""
+        fuse_type = self._by_name.get(name)
+        if fuse_type is None and name in self._full_names:
+            fuse_type = _resolve_catalog_entry(self._app, self._full_names.pop(name))
+            self._by_name[name] = fuse_type
+        return fuse_type
+
+    def _refresh(self) -> bool:
+        """
+        Replace a catalog index with one built from the library.
 
-        return index
+        Returns:
+            True if the index was rebuilt, False if it was already built
+            from the library
+        """
+        if self._rebuild is None:
+            return False
+        rebuilt, self._rebuild = self._rebuild(), None
+        self._by_name, self._all_types = rebuilt._by_name, rebuilt._all_types
+        self._by_key, self._by_whole_key = rebuilt._by_key, rebuilt._by_whole_key
+        self._full_names, self._ladders = {}, None
+        return True
+
+    def _nearest_higher(self, key: FuseKey) -> Optional[str]:
+        """Get the fuse type with the lowest rating above the key's."""
+        if self._ladders is None:
+            self._ladders = {}
+            for fuse_key, name in self._by_key.items():
+                ladder = self._ladders.setdefault(
+                    (fuse_key.curve, fuse_key.dual_rating is not None), []
+                )
+                ladder.append(((fuse_key.rating, fuse_key.dual_rating or 0.0), name))
+            for ladder in self._ladders.values():
+                ladder.sort()
+
+        ladder = self._ladders.get((key.curve, key.dual_rating is not None), [])
+        position = bisect.bisect_left(ladder, ((key.rating, key.dual_rating or 0.0),))
+        return ladder[position][1] if position < len(ladder) else None
+
+    def _match(self, key: FuseKey, nearest_higher: bool) -> Optional[Any]:
+        """Get the fuse type for a key, refreshing a stale catalog index."""
+        name = self._by_key.get(key)
+        if name is None and key.rating.is_integer():
+            name = self._by_whole_key.get(key)
+        # A catalog may predate the matching type, so it is checked against
+        # the library before falling back to the nearest higher rating
+        if name is None and self._refresh():
+            return self._match(key, nearest_higher)
+        if name is None and nearest_higher:
+            name = self._nearest_higher(key)
+
+        fuse_type = self._lookup(name) if name else None
+        if fuse_type is None and self._refresh():
+            return self._match(key, nearest_higher)
+        return fuse_type
 
     def get(self, name: str) -> Optional[Any]:
         """
@@ -211,12 +438,16 @@ class FuseTypeIndex:
         Returns:
             The PowerFactory TypFuse object, or None if not found
         """
-        return self._by_name.get(name)
+        fuse_type = self._lookup(name)
+        if fuse_type is None and self._refresh():
+            fuse_type = self._by_name.get(name)
+        return fuse_type
 
     def get_by_curve_and_rating(
         self,
         curve_type: str,
-        rating: str
+        rating: str,
+        nearest_higher: bool = False
     ) -> Optional[Any]:
         """
         Find a fuse type matching the curve type and rating.
@@ -227,30 +458,32 @@ class FuseTypeIndex:
         Args:
             curve_type: The curve type letter (e.g., "K", "T")
             rating: The rating string (e.g., "100A", " 100/")
+            nearest_higher: If no fuse type has the rating, use the one
+                with the next higher rating
 
         Returns:
             The matching PowerFactory TypFuse object, or None if not found
         """
-        curve_upper = curve_type.upper()
-
-        # Get all fuses with this curve type
-        candidates = self._by_curve.get(curve_upper, [])
-
-        for fuse in candidates:
-            if rating in fuse.loc_name:
-                return fuse
-
-        return None
+        ratings = parse_rating(rating)
+        if not curve_type or ratings is None:
+            return None
+        return self._match(FuseKey(curve_type.upper(), *ratings), nearest_higher)
 
-    def get_by_fuse_size(self, fuse_size: str) -> Optional[Any]:
+    def get_by_fuse_size(
+        self,
+        fuse_size: str,
+        nearest_higher: bool = False
+    ) -> Optional[Any]:
         """
         Find a fuse type matching the fuse size specification.
 
         Used for Tx fuses where the size is determined by transformer rating.
 
         Args:
-            fuse_size: The fuse size string (e.g., "100K", "50T")
+            fuse_size: The fuse size string (e.g., "100K", "3/10K")
                       Last character is curve type, rest is rating
+            nearest_higher: If no fuse type has the rating, use the one
+                with the next higher rating
 
         Returns:
             The matching PowerFactory TypFuse object, or None if not found
@@ -258,22 +491,16 @@ class FuseTypeIndex:
         if not fuse_size or len(fuse_size) < 2:
             return None
 
-        curve = fuse_size[-1].upper()
-        rating_prefix = fuse_size[:-1]
-
-        candidates = self._by_curve.get(curve, [])
-
-        for fuse in candidates:
-            if rating_prefix in fuse.loc_name:
-                return fuse
-
-        return None
+        return self.get_by_curve_and_rating(
+            fuse_size[-1], fuse_size[:-1], nearest_higher
+        )
 
     def find_matching_fuse(
         self,
         curve_type: Optional[str] = None,
         rating: Optional[str] = None,
-        fuse_size: Optional[str] = None
+        fuse_size: Optional[str] = None,
+        nearest_higher: bool = False
     ) -> Optional[Any]:
         """
         Find a matching fuse type using available criteria.
@@ -286,19 +513,21 @@ class FuseTypeIndex:
             curve_type: The curve type letter (optional)
             rating: The rating string (optional)
             fuse_size: The fuse size specification (optional)
+            nearest_higher: Select the next higher rating when no fuse
+                type has the requested one
 
         Returns:
             The matching PowerFactory TypFuse object, or None if not found
         """
         # Try curve + rating first
         if curve_type and rating:
-            result = self.get_by_curve_and_rating(curve_type, rating)
+            result = self.get_by_curve_and_rating(curve_type, rating, nearest_higher)
             if result:
                 return result
 
         # Fall back to fuse size
         if fuse_size:
-            return self.get_by_fuse_size(fuse_size)
+            return self.get_by_fuse_size(fuse_size, nearest_higher)
 
         return None
 
@@ -307,11 +536,15 @@ class FuseTypeIndex:
         Get all fuse types as a list.
 
         Provided for backward compatibility with code expecting a list.
+        Catalog types are resolved by this call.
 
         Returns:
             List of all fuse type objects
         """
-        return self._all_types
+        return [
+            fuse_type for fuse_type in map(self._lookup, self._all_types)
+            if fuse_type is not None
+        ]
 
     def __len__(self) -> int:
         """Return the number of indexed fuse types."""
@@ -322,6 +555,179 @@ class FuseTypeIndex:
         return name in self._by_name
 
 
+@dataclass
+class InstrumentTypeIndex:
+    """
+    Per-run index of the local library CT and VT types.
+
+    update_ct and update_vt need a TypCt for the CT's (primary, secondary)
+    taps and a TypVt for the VT's primary tap. The library folders are
+    located once and each is read on the first request for its kind of
+    type. A type that is not found is created in the folder and added to
+    the index, so later devices with the same ratio reuse it.
+
+    As select_ct_type and select_vt_type do, a CT type matches if its tap
+    arrays contain both taps and a VT type matches on its primary taps
+    alone. Where several types match, the first in the folder is used.
+
+    Attributes:
+        _app: PowerFactory application object
+        _folders: Library folder for each folder name, located or created
+            on first use
+        _ct_types: Dictionary mapping (primary, secondary) to TypCt
+        _vt_types: Dictionary mapping primary to TypVt
+    """
+    _app: Any = None
+    _folders: Dict[str, Any] = field(default_factory=dict)
+    _ct_types: Optional[Dict[Tuple[float, float], Any]] = None
+    _vt_types: Optional[Dict[float, Any]] = None
+
+    CT_FOLDER = "Current Transformers"
+    VT_FOLDER = "Voltage Transformers"
+
+    def _folder(self, name: str) -> Any:
+        """Get a local library folder, creating it if it does not exist."""
+        folder = self._folders.get(name)
+        if folder is None:
+            local_library = self._app.GetLocalLibrary()
+            found = all_relevant_objects(
+                self._app, [local_library], f"{name}.IntFolder"
+            )
+            folder = (
+                found[0] if found else local_library.CreateObject("IntFolder", name)
+            )
+            self._folders[name] = folder
+        return folder
+
+    def _index_ct_types(self) -> Dict[Tuple[float, float], Any]:
+        """Index the CT types by every (primary, secondary) tap pair."""
+        if self._ct_types is None:
+            self._ct_types = {}
+            for ct_type in self._folder(self.CT_FOLDER).GetContents("*.TypCt"):
+                for primary in ct_type.GetAttribute("e:primtaps") or []:
+                    for secondary in ct_type.GetAttribute("e:sectaps") or []:
+                        self._ct_types.setdefault((primary, secondary), ct_type)
+        return self._ct_types
+
+    def _index_vt_types(self) -> Dict[float, Any]:
+        """Index the VT types by every primary tap."""
+        if self._vt_types is None:
+            self._vt_types = {}
+            for vt_type in self._folder(self.VT_FOLDER).GetContents("*.TypVt"):
+                for primary in vt_type.GetAttribute("e:primtaps") or []:
+                    self._vt_types.setdefault(primary, vt_type)
+        return self._vt_types
+
+    def get_ct_type(self, primary: int, secondary: int) -> Any:
+        """
+        Get the CT type for a ratio, creating it if there is none.
+
+        Args:
+            primary: Primary tap setting
+            secondary: Secondary tap setting
+
+        Returns:
+            The PowerFactory TypCt object
+        """
+        ct_types = self._index_ct_types()
+        ct_type = ct_types.get((primary, secondary))
+        if ct_type is None:
+            ct_type = self._folder(self.CT_FOLDER).CreateObject(
+                "TypCt", "{}/{}".format(primary, secondary)
+            )
+            ct_type.SetAttribute("e:primtaps", [primary])
+            ct_type.SetAttribute("e:sectaps", [secondary])
+            ct_types[(primary, secondary)] = ct_type
+        return ct_type
+
+    def get_vt_type(self, primary: int, secondary: int) -> Any:
+        """
+        Get the VT type for a primary tap, creating it if there is none.
+
+        Args:
+            primary: Primary tap setting
+            secondary: Secondary tap setting (used to name a new type)
+
+        Returns:
+            The PowerFactory TypVt object
+        """
+        vt_types = self._index_vt_types()
+        vt_type = vt_types.get(primary)
+        if vt_type is None:
+            vt_type = self._folder(self.VT_FOLDER).CreateObject(
+                "TypVt", "{}/{}".format(primary, secondary)
+            )
+            vt_type.SetAttribute("e:primtaps", [primary])
+            vt_type.SetAttribute("e:iopt_mod", 0)
+            vt_types[primary] = vt_type
+        return vt_type
+
+
+# =============================================================================
+# Library crawls
+# =============================================================================
+
+def library_relay_types(app) -> List[Any]:
+    """
+    Get the relay types in the global libraries, in precedence order.
+
+    Searches the ErgonLibrary Protection folder, then the DIgSILENT
+    ProtRelay library. Local relay types are not included.
+
+    Args:
+        app: PowerFactory application object
+
+    Returns:
+        List of TypRelay objects (names may repeat; the first wins)
+    """
+    # 1. Get relay types from ErgonLibrary
+    global_library = app.GetGlobalLibrary()
+    protection_lib = global_library.GetContents("Protection")
+    relay_types = list(
+        all_relevant_objects(app, protection_lib, "*.TypRelay", None) or []
+    )
+
+    # 2. Get relay types from DIgSILENT library
+    try:
+        database = global_library.fold_id
+        dig_lib = database.GetContents("Lib")[0]
+        prot_lib = dig_lib.GetContents("Prot")[0]
+        relay_lib = prot_lib.GetContents("ProtRelay")
+        relay_types.extend(
+            all_relevant_objects(app, relay_lib, "*.TypRelay", None) or []
+        )
+    except (IndexError, AttributeError):
+        pass
+
+    return relay_types
+
+
+def library_fuse_types(app) -> List[Any]:
+    """
+    Get the fuse types in the ErgonLibrary Fuses folder.
+
+    Args:
+        app: PowerFactory application object
+
+    Returns:
+        List of TypFuse objects
+    """
+    try:
+        ergon_lib = app.GetGlobalLibrary()
+        fuse_folder = ergon_lib.SearchObject(
+            r"\ErgonLibrary\Protection\Fuses.IntFolder"
+        )
+
+        if not fuse_folder:
+            app.PrintWarn("Fuse folder not found in ErgonLibrary")
+            return []
+
+        return list(fuse_folder.GetContents("*.TypFuse", 0) or [])
+
+    except AttributeError:
+        return []
+
+
 # =============================================================================
 # Factory functions for convenience
 # =============================================================================
@@ -11,20 +11,22 @@ the same cubicle.
 
 It includes:
 - VT slot assignment and update
-- VT type selection and creation
+- VT type selection and creation (through InstrumentTypeIndex)
 - Measurement element configuration
 """
 
 from typing import Any, Optional
 
-from utils.pf_utils import all_relevant_objects
+from update_powerfactory.slot_layout import get_slot_layout
+from update_powerfactory.type_index import InstrumentTypeIndex
 from core import UpdateResult
 
 
 def update_vt(
         app,
         device_object: Any,
-        result: UpdateResult
+        result: UpdateResult,
+        instrument_index: Optional[InstrumentTypeIndex] = None
 ) -> UpdateResult:
     """
     Update VT configuration for a protection device.
@@ -38,6 +40,8 @@ def update_vt(
         app: PowerFactory application object
         device_object: The ProtectionDevice to configure
         result: UpdateResult to update with VT information
+        instrument_index: Per-run CT/VT type index (a new one is created
+            for this call if not given)
 
     Returns:
         Updated UpdateResult with VT configuration status
@@ -46,31 +50,22 @@ def update_vt(
     # VT is required.
     if device_object.vt_secondary == 1:
         slot_objs = device_object.pf_obj.GetAttribute("pdiselm")
-        for i, item in enumerate(device_object.pf_obj.GetAttribute("r:typ_id:e:pblk")):
-            if item.GetAttribute("filtmod") == "StaVt*":
-                slot_objs[i] = None
-                break
+        layout = get_slot_layout(device_object.pf_obj.GetAttribute("typ_id"))
+        if layout.unlinked_vt_slot is not None:
+            slot_objs[layout.unlinked_vt_slot] = None
         device_object.pf_obj.SetAttribute("pdiselm", slot_objs)
         result.vt_result = "No VT Linked"
         return result
 
-    # VTs have a type, assign the library folder containing these types to a
-    # variable.
-    vt_library = all_relevant_objects(
-        app, [app.GetLocalLibrary()], "Voltage Transformers.IntFolder"
-    )
-    if not vt_library:
-        vt_library = app.GetLocalLibrary().CreateObject(
-            "IntFolder", "Voltage Transformers"
-        )
-    else:
-        vt_library = vt_library[0]
+    # VTs have a type, found in or added to the local library folder
+    if instrument_index is None:
+        instrument_index = InstrumentTypeIndex(app)
 
     # Set up variables with the correct VT winding settings
     primary = int(float(device_object.vt_primary))
     secondary = int(float(device_object.vt_secondary))
     volt_trans = update_vt_slots(app, device_object)
-    required_vt_type = select_vt_type(app, vt_library, primary, secondary)
+    required_vt_type = instrument_index.get_vt_type(primary, secondary)
 
     try:
         if required_vt_type.loc_name != volt_trans.GetAttribute("r:typ_id:e:loc_name"):
@@ -117,53 +112,51 @@ def update_vt_slots(app, device_object: Any) -> Any:
 
     volt_trans = None
 
-    for i, item in enumerate(pf_device.GetAttribute("typ_id").GetAttribute("pblk")):
-        if not item:
-            continue
-
-        if item.GetAttribute("filtmod") == "StaVt*":
-            vt_obj = pf_device.GetSlot(item.GetAttribute("loc_name"))
-            if not vt_obj:
-                vt_obj_name = "Not Configured"
-            else:
-                vt_obj_name = vt_obj.loc_name
-
-            if vt_obj_name == vt_name:
-                # This indicates that the existing assigned VT object is correctly
-                # assigned
-                volt_trans = vt_obj
+    layout = get_slot_layout(pf_device.GetAttribute("typ_id"))
+
+    for i, slot_name in layout.vt_slots:
+        vt_obj = pf_device.GetSlot(slot_name)
+        if not vt_obj:
+            vt_obj_name = "Not Configured"
+        else:
+            vt_obj_name = vt_obj.loc_name
+
+        if vt_obj_name == vt_name:
+            # This indicates that the existing assigned VT object is correctly
+            # assigned
+            volt_trans = vt_obj
+        else:
+            # Search the cubicle for a VT with a matching name
+            for obj in cubical.GetContents("*.StaVt"):
+                if not obj:
+                    continue
+                obj_name = obj.loc_name
+
+                if obj_name == vt_name:
+                    # This object matches the required VT name. Assign it to
+                    # the appropriate slot
+                    slot_objs[i] = obj
+                    volt_trans = obj
+                    break
+
+                if (
+                        obj.ptapset == device_object.vt_primary
+                        and obj.stapset == device_object.vt_secondary
+                        and not device_object.ct_op_id
+                ):
+                    # This deals with objects that have the correct tappings
+                    new_name = str()
+                    for char in device_object.pf_obj.loc_name:
+                        if char == "_":
+                            break
+                        new_name = new_name + char
+                    obj.loc_name = f"{new_name}_VT"
+                    slot_objs[i] = obj
+                    volt_trans = obj
+                    break
             else:
-                # Search the cubicle for a VT with a matching name
-                for obj in cubical.GetContents("*.StaVt"):
-                    if not obj:
-                        continue
-                    obj_name = obj.loc_name
-
-                    if obj_name == vt_name:
-                        # This object matches the required VT name. Assign it to
-                        # the appropriate slot
-                        slot_objs[i] = obj
-                        volt_trans = obj
-                        break
-
-                    if (
-                            obj.ptapset == device_object.vt_primary
-                            and obj.stapset == device_object.vt_secondary
-                            and not device_object.ct_op_id
-                    ):
-                        # This deals with objects that have the correct tappings
-                        new_name = str()
-                        for char in device_object.pf_obj.loc_name:
-                            if char == "_":
-                                break
-                            new_name = new_name + char
-                        obj.loc_name = f"{new_name}_VT"
-                        slot_objs[i] = obj
-                        volt_trans = obj
-                        break
-                else:
-                    volt_trans = cubical.CreateObject("StaVt", vt_name)
-                    slot_objs[i] = volt_trans
+                volt_trans = cubical.CreateObject("StaVt", vt_name)
+                slot_objs[i] = volt_trans
 
     pf_device.SetAttribute("pdiselm", slot_objs)
     return volt_trans
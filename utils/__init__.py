@@ -12,6 +12,8 @@ Modules:
     pf_utils: PowerFactory-specific utilities
     file_utils: File and CSV handling utilities
     time_utils: Time formatting and measurement utilities
+    profiling: Hierarchical stage timing for update runs
+    pf_proxy: Opt-in PowerFactory API call counting and read caching proxy
 
 Usage:
     from utils import pf_utils, file_utils, time_utils
@@ -46,6 +48,18 @@ from utils.time_utils import (
     Timer,
 )
 
+from utils.profiling import (
+    StageProfiler,
+    get_profiler,
+    stage,
+)
+
+from utils.pf_proxy import (
+    ApiCallCounter,
+    PFObjectProxy,
+    ReadCache,
+)
+
 __all__ = [
     # PowerFactory utilities
     "all_relevant_objects",
@@ -61,4 +75,12 @@ __all__ = [
     # Time utilities
     "format_duration",
     "Timer",
+    # Profiling
+    "StageProfiler",
+    "get_profiler",
+    "stage",
+    # API proxy
+    "ApiCallCounter",
+    "PFObjectProxy",
+    "ReadCache",
 ]
@@ -0,0 +1,508 @@
+"""
+Opt-in PowerFactory API proxy for measuring API traffic.
+
+Calls across the Python/PowerFactory boundary (GetContents, GetAttribute,
+SetAttribute, CreateObject, Delete, attribute reads and writes) are the
+expensive resource in this tool. ApiCallCounter wraps the application
+object in a proxy. Every DataObject returned through the proxy is wrapped
+too, so all API traffic of a run is counted by:
+- Method (attribute reads and writes are counted as "getattr"/"setattr")
+- PowerFactory class of the object the call was made on
+- Pipeline stage (the current utils.profiling stage)
+
+Proxies compare and hash equal to the objects they wrap, and are
+unwrapped before being passed back into the API, so the proxied run
+behaves exactly like an unproxied one. The proxy works the same way
+against real PowerFactory objects and in-memory fakes, so benchmarks can
+assert API call budgets with calls().
+
+Read Cache:
+    Attributes that do not change during a run unless this tool changes
+    them (loc_name, fold_id, typ_id, cpGrid, obj_id, GetClassName() and
+    GetAttribute chains made only of these, such as
+    "r:fold_id:r:obj_id:e:loc_name") are read repeatedly from the same
+    objects. With a ReadCache, the proxy serves repeat reads from memory.
+    Entries are invalidated when the proxied code writes or renames the
+    object, and chain entries are dropped when any object's attribute in
+    the chain is written. Delete drops the object and all chains. Move
+    (folder.Move(obj)) drops every entry, as the parents and grids of the
+    moved object and everything it contains change.
+    Cache hits are not counted as API calls.
+
+Usage:
+    from utils.pf_proxy import ApiCallCounter, ReadCache
+
+    counter = ApiCallCounter(read_cache=ReadCache())
+    app = counter.wrap(app)
+    ...
+    report = counter.report()
+    assert counter.calls(method="GetContents", stage="update_ct") <= 4
+"""
+
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from utils.profiling import get_profiler
+
+logger = logging.getLogger(__name__)
+
+# Values returned by the API that are never wrapped
+_PLAIN_TYPES = (str, int, float, bool, bytes, type(None))
+
+# Class name used for objects without GetClassName (the application)
+APPLICATION_CLASS = "Application"
+
+# Attributes treated as immutable unless written through the proxy
+CACHED_ATTRIBUTES = frozenset({"loc_name", "fold_id", "typ_id", "cpGrid", "obj_id"})
+
+# Argument-less methods whose results are cached
+CACHED_METHODS = frozenset({"GetClassName"})
+
+# Methods that invalidate every cached read of the target object
+STRUCTURAL_METHODS = frozenset({"Delete"})
+
+# Methods that invalidate every cached read (they change other objects'
+# parents and grids)
+MOVE_METHODS = frozenset({"Move"})
+
+
+def unwrap(value: Any) -> Any:
+    """
+    Replace proxies with the objects they wrap.
+
+    Lists, tuples and dict values are unwrapped element by element so
+    proxies never reach the PowerFactory API.
+
+    Args:
+        value: An argument about to be passed to the API
+
+    Returns:
+        The value with all proxies unwrapped
+    """
+    if isinstance(value, PFObjectProxy):
+        return object.__getattribute__(value, "_pf_obj")
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, list):
+        return [unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: unwrap(item) for key, item in value.items()}
+    return value
+
+
+def path_attributes(path: str) -> Tuple[str, ...]:
+    """
+    Get the attribute names in a GetAttribute/SetAttribute path.
+
+    Args:
+        path: Attribute path such as "r:fold_id:r:obj_id:e:loc_name"
+
+    Returns:
+        Attribute names with the r:/e: qualifiers removed
+
+    Example:
+        >>> path_attributes("r:cpGrid:e:loc_name")
+        ('cpGrid', 'loc_name')
+    """
+    return tuple(part for part in path.split(":") if part not in ("r", "e"))
+
+
+class ReadCache:
+    """
+    Per-run cache of immutable-during-run PowerFactory reads.
+
+    Entries are keyed by the wrapped object, so the cache must be
+    discarded at the end of the run.
+    """
+
+    def __init__(self):
+        # {pf_obj: {read_key: value}}
+        self._entries: Dict[Any, Dict[Hashable, Any]] = {}
+        # {attribute: {(pf_obj, read_key), ...}} for chained reads
+        self._chains: Dict[str, Set[Tuple[Any, Hashable]]] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def read_key(method: str, args: Tuple[Any, ...]) -> Optional[Hashable]:
+        """
+        Get the cache key for a method call, if the call is cacheable.
+
+        Args:
+            method: API method name
+            args: Positional call arguments
+
+        Returns:
+            Cache key, or None if the call must go to the API
+        """
+        if method in CACHED_METHODS and not args:
+            return method
+        if method == "GetAttribute" and len(args) == 1 and isinstance(args[0], str):
+            names = path_attributes(args[0])
+            if names and all(name in CACHED_ATTRIBUTES for name in names):
+                return ("GetAttribute", args[0])
+        return None
+
+    def lookup(self, pf_obj: Any, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached read.
+
+        Args:
+            pf_obj: The wrapped PowerFactory object
+            key: Attribute name or read_key() result
+
+        Returns:
+            Tuple of (found, value)
+        """
+        try:
+            entries = self._entries.get(pf_obj)
+        except TypeError:
+            return False, None
+        if entries is not None and key in entries:
+            self._stats["hits"] += 1
+            return True, entries[key]
+        self._stats["misses"] += 1
+        return False, None
+
+    def peek(self, pf_obj: Any, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached read without recording a hit or miss.
+
+        Args:
+            pf_obj: The wrapped PowerFactory object
+            key: Attribute name or read_key() result
+
+        Returns:
+            Tuple of (found, value)
+        """
+        try:
+            entries = self._entries.get(pf_obj)
+        except TypeError:
+            return False, None
+        if entries is not None and key in entries:
+            return True, entries[key]
+        return False, None
+
+    def store(self, pf_obj: Any, key: Hashable, value: Any) -> None:
+        """
+        Store a read result.
+
+        Args:
+            pf_obj: The wrapped PowerFactory object
+            key: Attribute name or read_key() result
+            value: The unwrapped value read from the API
+        """
+        try:
+            self._entries.setdefault(pf_obj, {})[key] = value
+        except TypeError:
+            return  # Unhashable object - do not cache
+
+        if isinstance(key, tuple):
+            names = path_attributes(key[1])
+            if len(names) > 1:
+                for name in names:
+                    self._chains.setdefault(name, set()).add((pf_obj, key))
+
+    def invalidate_attribute(self, pf_obj: Any, attribute: str) -> None:
+        """
+        Invalidate reads affected by writing an attribute of an object.
+
+        Args:
+            pf_obj: The object being written
+            attribute: Name of the attribute being written
+        """
+        if attribute not in CACHED_ATTRIBUTES:
+            return
+        self._drop_object(pf_obj)
+        for obj, key in self._chains.pop(attribute, ()):
+            entries = self._entries.get(obj)
+            if entries and entries.pop(key, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def invalidate_object(self, pf_obj: Any) -> None:
+        """
+        Invalidate every read of an object and all chained reads.
+
+        Args:
+            pf_obj: The object being deleted
+        """
+        self._drop_object(pf_obj)
+        for chain in self._chains.values():
+            for obj, key in chain:
+                entries = self._entries.get(obj)
+                if entries and entries.pop(key, None) is not None:
+                    self._stats["invalidations"] += 1
+        self._chains.clear()
+
+    def before_call(self, pf_obj: Any, method: str, args: Tuple[Any, ...]) -> None:
+        """
+        Invalidate reads affected by a method call before it is made.
+
+        Args:
+            pf_obj: The target object
+            method: API method name
+            args: Positional call arguments
+        """
+        if method == "SetAttribute" and args and isinstance(args[0], str):
+            names = path_attributes(args[0])
+            if len(names) == 1:
+                self.invalidate_attribute(pf_obj, names[0])
+            elif any(name in CACHED_ATTRIBUTES for name in names):
+                # Writing through a reference changes another object
+                self.clear()
+        elif method in STRUCTURAL_METHODS:
+            self.invalidate_object(pf_obj)
+        elif method in MOVE_METHODS:
+            self.clear()
+
+    def _drop_object(self, pf_obj: Any) -> None:
+        """Drop all entries of an object."""
+        try:
+            entries = self._entries.pop(pf_obj, None)
+        except TypeError:
+            return
+        if entries:
+            self._stats["invalidations"] += len(entries)
+
+    def clear(self) -> None:
+        """Drop every cached read."""
+        self._stats["invalidations"] += sum(len(e) for e in self._entries.values())
+        self._entries.clear()
+        self._chains.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, invalidations and hit rate
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+        stats["objects_cached"] = len(self._entries)
+        return stats
+
+
+class ApiCallCounter:
+    """
+    Counts PowerFactory API calls made through proxied objects.
+
+    Attributes:
+        stage_provider: Callable returning the current pipeline stage
+        read_cache: Optional ReadCache serving repeat immutable reads
+    """
+
+    def __init__(
+        self,
+        stage_provider: Optional[Callable[[], str]] = None,
+        read_cache: Optional[ReadCache] = None
+    ):
+        """
+        Create a counter.
+
+        Args:
+            stage_provider: Callable returning the current stage name.
+                Defaults to the shared profiler's current stage.
+            read_cache: Optional read cache shared by all proxies
+        """
+        profiler = get_profiler()
+        self.stage_provider = stage_provider or (lambda: profiler.current_stage)
+        self.read_cache = read_cache
+        # {(method, class_name, stage): count}
+        self._counts: Dict[Tuple[str, str, str], int] = {}
+
+    def wrap(self, value: Any) -> Any:
+        """
+        Wrap an API object (or list of objects) in counting proxies.
+
+        Args:
+            value: Application object, DataObject, or API return value
+
+        Returns:
+            The proxied value. Plain values are returned unchanged.
+        """
+        if isinstance(value, (_PLAIN_TYPES, PFObjectProxy)):
+            return value
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.wrap(item) for item in value)
+        return PFObjectProxy(value, self)
+
+    def record(self, method: str, class_name: str) -> None:
+        """
+        Count one API call.
+
+        Args:
+            method: API method name, "getattr" or "setattr"
+            class_name: PowerFactory class of the target object
+        """
+        key = (method, class_name, self.stage_provider() or "")
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def calls(
+        self,
+        method: Optional[str] = None,
+        class_name: Optional[str] = None,
+        stage: Optional[str] = None
+    ) -> int:
+        """
+        Get the number of calls matching the given filters.
+
+        Args:
+            method: Only count this method
+            class_name: Only count calls on this class
+            stage: Only count calls in this stage path, or its sub-stages
+
+        Returns:
+            Number of matching calls
+        """
+        total = 0
+        for (m, c, s), count in self._counts.items():
+            if method is not None and m != method:
+                continue
+            if class_name is not None and c != class_name:
+                continue
+            if stage is not None and s != stage and not s.startswith(stage + "/"):
+                continue
+            total += count
+        return total
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the per-run breakdown of API calls.
+
+        Returns:
+            Dictionary with the total and counts by method, class and stage,
+            each sorted by descending count
+        """
+        by_method: Dict[str, int] = {}
+        by_class: Dict[str, int] = {}
+        by_stage: Dict[str, int] = {}
+        for (method, class_name, stage), count in self._counts.items():
+            by_method[method] = by_method.get(method, 0) + count
+            by_class[class_name] = by_class.get(class_name, 0) + count
+            by_stage[stage] = by_stage.get(stage, 0) + count
+
+        def ordered(counts: Dict[str, int]) -> Dict[str, int]:
+            return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+        report: Dict[str, Any] = {
+            "total": sum(self._counts.values()),
+            "by_method": ordered(by_method),
+            "by_class": ordered(by_class),
+            "by_stage": ordered(by_stage),
+        }
+        if self.read_cache is not None:
+            report["read_cache"] = self.read_cache.get_stats()
+        return report
+
+    def reset(self) -> None:
+        """Clear all counts."""
+        self._counts.clear()
+
+
+class PFObjectProxy:
+    """
+    Proxy for a PowerFactory object that reports API traffic to a counter.
+
+    The proxy forwards attribute access, attribute assignment and method
+    calls to the wrapped object. Objects returned by the API are wrapped
+    in proxies bound to the same counter. If the counter has a read cache,
+    cacheable reads are served from it and writes invalidate it.
+    """
+
+    __slots__ = ("_pf_obj", "_counter", "_class_name")
+
+    def __init__(self, pf_obj: Any, counter: ApiCallCounter):
+        object.__setattr__(self, "_pf_obj", pf_obj)
+        object.__setattr__(self, "_counter", counter)
+        object.__setattr__(self, "_class_name", None)
+
+    def _get_class_name(self) -> str:
+        """Get the wrapped object's class name, read once without counting."""
+        class_name = object.__getattribute__(self, "_class_name")
+        if class_name is None:
+            pf_obj = object.__getattribute__(self, "_pf_obj")
+            cache = object.__getattribute__(self, "_counter").read_cache
+            found = False
+            if cache is not None:
+                found, class_name = cache.peek(pf_obj, "GetClassName")
+            if not found:
+                try:
+                    class_name = pf_obj.GetClassName()
+                except AttributeError:
+                    class_name = APPLICATION_CLASS
+                if cache is not None:
+                    cache.store(pf_obj, "GetClassName", class_name)
+            object.__setattr__(self, "_class_name", class_name)
+        return class_name
+
+    def __getattr__(self, name: str) -> Any:
+        pf_obj = object.__getattribute__(self, "_pf_obj")
+        counter = object.__getattribute__(self, "_counter")
+        cache = counter.read_cache
+
+        if cache is not None and name in CACHED_ATTRIBUTES:
+            found, value = cache.lookup(pf_obj, name)
+            if not found:
+                counter.record("getattr", self._get_class_name())
+                value = getattr(pf_obj, name)
+                cache.store(pf_obj, name, value)
+            return counter.wrap(value)
+
+        value = getattr(pf_obj, name)
+
+        if callable(value):
+            class_name = self._get_class_name()
+
+            def call(*args, **kwargs):
+                args = unwrap(args)
+                key = None
+                if cache is not None:
+                    key = None if kwargs else cache.read_key(name, args)
+                    if key is not None:
+                        found, result = cache.lookup(pf_obj, key)
+                        if found:
+                            return counter.wrap(result)
+                    else:
+                        cache.before_call(pf_obj, name, args)
+
+                counter.record(name, class_name)
+                result = value(*args, **unwrap(kwargs))
+                if key is not None:
+                    cache.store(pf_obj, key, result)
+                return counter.wrap(result)
+
+            return call
+
+        counter.record("getattr", self._get_class_name())
+        return counter.wrap(value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pf_obj = object.__getattribute__(self, "_pf_obj")
+        counter = object.__getattribute__(self, "_counter")
+        if counter.read_cache is not None:
+            counter.read_cache.invalidate_attribute(pf_obj, name)
+        counter.record("setattr", self._get_class_name())
+        setattr(pf_obj, name, unwrap(value))
+
+    def __eq__(self, other: Any) -> bool:
+        return object.__getattribute__(self, "_pf_obj") == unwrap(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(object.__getattribute__(self, "_pf_obj"))
+
+    def __bool__(self) -> bool:
+        return bool(object.__getattribute__(self, "_pf_obj"))
+
+    def __str__(self) -> str:
+        return str(object.__getattribute__(self, "_pf_obj"))
+
+    def __repr__(self) -> str:
+        return f"PFObjectProxy({object.__getattribute__(self, '_pf_obj')!r})"
@@ -11,10 +11,12 @@ Functions:
     get_all_switches: Get all switches/CBs from network model
     get_active_feeders: Get all active feeders from network data
     determine_region: Determine Energex/Ergon from project structure
+    determine_fuse_role: Classify a fuse as a line or transformer fuse
+    tx_fuse_sizes: Fuse sizes for a transformer type, resolved once per type
 """
 
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, NamedTuple, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -288,11 +290,149 @@ def get_fuse_types(app: Any) -> List[Any]:
     return all_relevant_objects(app, folders, "*.TypFuse")
 
 
+# =============================================================================
+# Transformer Fuse Sizing
+# =============================================================================
+
+# Default size when a transformer is not in the sizing tables
+DEFAULT_TX_FUSE_SIZE = "3/10K"
+
+# Distribution transformer fuse sizes from STNW1001, by (phases, HV kV) and
+# then rating in kVA. SWER distribution transformers are single phase at the
+# SWER voltage.
+TX_FUSE_SIZES: Dict[Tuple[int, float], Dict[int, str]] = {
+    (1, 11): {5: "3/10K", 10: "3/10K", 25: "6/20K", 50: "10K", 63: "10K"},
+    (1, 12.7): {5: "3/10K", 10: "3/10K", 25: "3/10K", 50: "10K", 63: "10K"},
+    (1, 19.1): {5: "3/10K", 10: "3/10K", 25: "3/10K", 50: "6/20K", 63: "6/20K"},
+    (2, 11): {10: "3/10K", 15: "3/10K", 25: "6/20K", 50: "16K"},
+    (2, 22): {10: "3/10K", 15: "3/10K", 25: "3/10K", 50: "6/20K"},
+    (2, 33): {10: "3/10K", 25: "3/10K", 50: "3/10K"},
+    (3, 11): {
+        15: "3/10K", 25: "3/10K", 50: "6/20K", 63: "6/20K", 75: "12K",
+        100: "16K", 150: "20K", 200: "25K", 250: "31K", 300: "31K",
+        315: "31K", 500: "50K", 750: "63K", 1000: "80K", 1500: "100K",
+    },
+    (3, 22): {
+        15: "3/10K", 25: "3/10K", 50: "3/10K", 63: "3/10K", 75: "6/20K",
+        100: "6/20K", 150: "12K", 200: "16K", 250: "20K", 300: "20K",
+        315: "20K", 500: "31K", 750: "40K", 1000: "50K", 1500: "63K",
+    },
+    (3, 33): {
+        25: "3/10K", 50: "3/10K", 63: "3/10K", 100: "3/10K", 200: "12K",
+        300: "16K", 315: "16K", 500: "20K",
+    },
+}
+
+# SWER isolating transformer fuse sizes from STNW1001, by (HV kV, SWER kV)
+# and then rating in kVA
+ISOLATOR_FUSE_SIZES: Dict[Tuple[float, float], Dict[int, str]] = {
+    (11, 11): {25: "12K", 50: "16K", 100: "25K", 150: "31K", 200: "40K"},
+    (11, 12.7): {25: "12K", 50: "16K", 100: "25K", 150: "31K", 200: "40K"},
+    (22, 12.7): {25: "6/20K", 50: "10K", 100: "20K", 150: "25K", 200: "31K"},
+    (33, 12.7): {25: "6/20K", 50: "6/20K", 100: "16K", 150: "20K", 200: "25K"},
+    (11, 19.1): {25: "16K", 50: "20K", 100: "31K", 150: "40K", 200: "50K"},
+    (22, 19.1): {25: "6/20K", 50: "6/20K", 100: "20K", 150: "25K", 200: "31K"},
+    (33, 19.1): {25: "6/20K", 50: "6/20K", 100: "16K", 150: "20K", 200: "25K"},
+}
+
+
+class TxFuseSizes(NamedTuple):
+    """Fuse sizes for one transformer type, by how the transformer is used."""
+    phases: Optional[int]
+    standard: str
+    isolator: str
+    swer: str
+
+
+# Resolved sizes by transformer type. Thousands of transformers share a
+# handful of types, so each type is read once. The keys are types of the
+# active project, so the cache is cleared at the start of each update run.
+_tx_fuse_size_cache: Dict[Any, TxFuseSizes] = {}
+
+
+def clear_tx_fuse_size_cache() -> None:
+    """Clear the resolved transformer type fuse sizes."""
+    _tx_fuse_size_cache.clear()
+
+
+def _standard_fuse_size(tx_type: Any, phases: int) -> str:
+    """Size for a distribution transformer on a three phase network."""
+    hv_volt = int(tx_type.GetAttribute("e:utrn_h"))
+    rating = int(round(tx_type.GetAttribute("e:strn"), 4) * 1000)
+    return TX_FUSE_SIZES.get((phases, hv_volt), {}).get(rating, DEFAULT_TX_FUSE_SIZE)
+
+
+def _isolator_fuse_size(tx_type: Any) -> str:
+    """Size for a SWER isolating transformer, in either winding order."""
+    hv_volt = round(float(tx_type.GetAttribute("e:utrn_h")), 1)
+    lv_volt = round(float(tx_type.GetAttribute("e:utrn_l")), 1)
+    rating = int(float(tx_type.GetAttribute("e:strn")) * 1000)
+    sizes = (
+        ISOLATOR_FUSE_SIZES.get((hv_volt, lv_volt))
+        or ISOLATOR_FUSE_SIZES.get((lv_volt, hv_volt))
+        or {}
+    )
+    return sizes.get(rating, DEFAULT_TX_FUSE_SIZE)
+
+
+def _swer_fuse_size(tx_type: Any) -> str:
+    """Size for a single phase transformer on a SWER network."""
+    hv_volt = round(float(tx_type.GetAttribute("e:utrn_h")), 1)
+    rating = int(float(tx_type.GetAttribute("e:strn")) * 1000)
+    return TX_FUSE_SIZES.get((1, hv_volt), {}).get(rating, DEFAULT_TX_FUSE_SIZE)
+
+
+def _size_or_default(size_function, *args) -> str:
+    """Call a size function, using the default size if the type is incomplete."""
+    try:
+        return size_function(*args)
+    except (AttributeError, ValueError, TypeError):
+        return DEFAULT_TX_FUSE_SIZE
+
+
+def tx_fuse_sizes(tx_type: Any) -> TxFuseSizes:
+    """
+    Get the fuse sizes for a transformer type, resolving them once per type.
+
+    Args:
+        tx_type: PowerFactory TypTr2 object
+
+    Returns:
+        TxFuseSizes with the number of phases (None if unreadable) and the
+        size for each way the type can be used
+    """
+    sizes = _tx_fuse_size_cache.get(tx_type)
+    if sizes is not None:
+        return sizes
+
+    try:
+        phases = tx_type.GetAttribute("e:nt2ph")
+    except (AttributeError, ValueError, TypeError):
+        phases = None
+    if phases is None:
+        sizes = TxFuseSizes(None, *[DEFAULT_TX_FUSE_SIZE] * 3)
+    else:
+        sizes = TxFuseSizes(
+            phases,
+            _size_or_default(_standard_fuse_size, tx_type, phases),
+            (
+                _size_or_default(_isolator_fuse_size, tx_type)
+                if phases == 2
+                else DEFAULT_TX_FUSE_SIZE
+            ),
+            (
+                _size_or_default(_swer_fuse_size, tx_type)
+                if phases == 2
+                else DEFAULT_TX_FUSE_SIZE
+            ),
+        )
+    _tx_fuse_size_cache[tx_type] = sizes
+    return sizes
+
+
 def determine_fuse_role(app, fuse):
     """This function will observe the fuse location and determine if it is
     a Distribution transformer fuse, SWER isolating fuse or a line fuse"""
-    # Create the fuse dictionary for sizes based on transformer data
-    size_dict = create_fuse_dict()
     # First check is that if the fuse exists in a terminal that is in the
     # System Overiew then it will be a line fuse.
     fuse_active = fuse.HasAttribute("r:fold_id:r:obj_id:e:loc_name")
@@ -316,168 +456,17 @@ def determine_fuse_role(app, fuse):
     else:
         return ["Line Fuse", None]
     try:
-        # Determine the type of transformer
-        tx_type = content.typ_id
-        tx_constr = tx_type.GetAttribute("e:nt2ph")
-        if tx_constr == 3:
+        # Sizes depend only on the transformer type, so they are resolved
+        # once per type. How the transformer is used depends on where it is.
+        sizes = tx_fuse_sizes(content.typ_id)
+        if sizes.phases != 2:
             # Three winding transformers are always going to be
             # distribution transformers
-            hv_term_volt = int(tx_type.GetAttribute("e:utrn_h"))
-            tx_rating = int(round(tx_type.GetAttribute("e:strn"), 4) * 1000)
-            key = "{}{}{}".format(tx_constr, hv_term_volt, tx_rating)
-            try:
-                fuse_size = size_dict[key]
-            except KeyError:
-                # Set the fuse to the smallest available fuse.
-                fuse_size = "3/10K"
-            return ["Tx Fuse", fuse_size]
-        if (
-            tx_constr == 2
-            and secondary_sub.GetAttribute("e:sType").lower() == "swer isolator"
-        ):
-            # These are SWER Isolator transformers
-            term1_volt = int(tx_type.GetAttribute("e:utrn_h"))
-            term2_volt = int(tx_type.GetAttribute("e:utrn_l"))
-            tx_rating = int(float(tx_type.GetAttribute("e:strn")) * 1000)
-            try:
-                key = "{}{}{}".format(term1_volt, term2_volt, tx_rating)
-                fuse_size = size_dict[key]
-            except KeyError:
-                key = "{}{}{}".format(term2_volt, term1_volt, tx_rating)
-                try:
-                    fuse_size = size_dict[key]
-                except KeyError:
-                    # Set the fuse to the smallest available fuse.
-                    fuse_size = "3/10K"
-            return ["Tx Fuse", fuse_size]
-        elif tx_constr == 2 and content.bushv.cterm.GetAttribute("e:phtech") == 6:
-            tx_constr = 1
-            hv_term_volt = str(tx_type.GetAttribute("e:utrn_h"))[:4]
-            tx_rating = int(float(tx_type.GetAttribute("e:strn")) * 1000)
-            key = "{}{}{}".format(tx_constr, hv_term_volt, tx_rating)
-            try:
-                fuse_size = size_dict[key]
-            except KeyError:
-                # Set the fuse to the smallest available fuse.
-                fuse_size = "3/10K"
-            return ["Tx Fuse", fuse_size]
-        else:
-            hv_term_volt = int(tx_type.GetAttribute("e:utrn_h"))
-            tx_rating = int(round(tx_type.GetAttribute("e:strn"), 4) * 1000)
-            key = "{}{}{}".format(tx_constr, hv_term_volt, tx_rating)
-            try:
-                fuse_size = size_dict[key]
-            except KeyError:
-                # Set the fuse to the smallest available fuse.
-                fuse_size = "3/10K"
-            return ["Tx Fuse", fuse_size]
+            return ["Tx Fuse", sizes.standard]
+        if secondary_sub.GetAttribute("e:sType").lower() == "swer isolator":
+            return ["Tx Fuse", sizes.isolator]
+        if content.bushv.cterm.GetAttribute("e:phtech") == 6:
+            return ["Tx Fuse", sizes.swer]
+        return ["Tx Fuse", sizes.standard]
     except (AttributeError, ValueError, TypeError):
-        fuse_size = "3/10K"
-        return ["Tx Fuse", fuse_size]
-
-
-def create_fuse_dict():
-    """This has been developed based on STNW1001. The key will be
-    pf attribute for transfomer type, Voltage level, rating"""
-    fuse_dict = {
-        "21110": "3/10K",
-        "21115": "3/10K",
-        "21125": "6/20K",
-        "21150": "16K",
-        "31115": "3/10K",
-        "31125": "3/10K",
-        "31150": "6/20K",
-        "31163": "6/20K",
-        "31175": "12K",
-        "311100": "16K",
-        "311150": "20K",
-        "311200": "25K",
-        "311250": "31K",
-        "311300": "31K",
-        "311315": "31K",
-        "311500": "50K",
-        "311750": "63K",
-        "3111000": "80K",
-        "3111500": "100K",
-        "22210": "3/10K",
-        "22215": "3/10K",
-        "22225": "3/10K",
-        "22250": "6/20K",
-        "32215": "3/10K",
-        "32225": "3/10K",
-        "32250": "3/10K",
-        "32263": "3/10K",
-        "32275": "6/20K",
-        "322100": "6/20K",
-        "322150": "12K",
-        "322200": "16K",
-        "322250": "20K",
-        "322300": "20K",
-        "322315": "20K",
-        "322500": "31K",
-        "322750": "40K",
-        "3221000": "50K",
-        "3221500": "63K",
-        "23310": "3/10K",
-        "23325": "3/10K",
-        "23350": "3/10K",
-        "33325": "3/10K",
-        "33350": "3/10K",
-        "33363": "3/10K",
-        "333100": "3/10K",
-        "333200": "12K",
-        "333300": "16K",
-        "333315": "16K",
-        "333500": "20K",
-        "111125": "12K",
-        "111150": "16K",
-        "1111100": "25K",
-        "1111150": "31K",
-        "1111200": "40K",
-        "1112.725": "12K",
-        "1112.750": "16K",
-        "1112.7100": "25K",
-        "1112.7150": "31K",
-        "1112.7200": "40K",
-        "2212.725": "6/20K",
-        "2212.750": "10K",
-        "2212.7100": "20K",
-        "2212.7150": "25K",
-        "2212.7200": "31K",
-        "3312.725": "6/20K",
-        "3312.750": "6/20K",
-        "3312.7100": "16K",
-        "3312.7150": "20K",
-        "3312.7200": "25K",
-        "1119.125": "16K",
-        "1119.150": "20K",
-        "1119.1100": "31K",
-        "1119.1150": "40K",
-        "1119.1200": "50K",
-        "2219.125": "6/20K",
-        "2219.150": "6/20K",
-        "2219.1100": "20K",
-        "2219.1150": "25K",
-        "2219.1200": "31K",
-        "3319.125": "6/20K",
-        "3319.150": "6/20K",
-        "3319.1100": "16K",
-        "3319.1150": "20K",
-        "3319.1200": "25K",
-        "1115": "3/10K",
-        "11110": "3/10K",
-        "11125": "6/20K",
-        "11150": "10K",
-        "11163": "10K",
-        "112.75": "3/10K",
-        "112.710": "3/10K",
-        "112.725": "3/10K",
-        "112.750": "10K",
-        "112.763": "10K",
-        "119.15": "3/10K",
-        "119.110": "3/10K",
-        "119.125": "3/10K",
-        "119.150": "6/20K",
-        "119.163": "6/20K",
-    }
-    return fuse_dict
+        return ["Tx Fuse", DEFAULT_TX_FUSE_SIZE]
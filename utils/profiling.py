@@ -0,0 +1,242 @@
+"""
+Hierarchical stage timing for update runs.
+
+The overall Timer in main.main shows how long a run took, but not where
+the time went. The StageProfiler records nested stage spans within each
+device span:
+
+    with profiler.device("RC-12345", pattern="RC01") as span:
+        with profiler.stage("relay_settings"):
+            with profiler.stage("apply_settings"):
+                ...
+
+Stage paths are slash-joined ("relay_settings/apply_settings"). Time spent
+in a repeated stage within one device is summed. When a device span ends:
+- Its stage timings are added to the run samples for its pattern
+- If emit_json is set, a JSON Lines record is logged with the timings in
+  extra_data, so it is written by the logging queue listener
+
+report() aggregates the run samples into count/total/p50/p95/max per
+pattern and stage. Stages timed outside a device span are reported under
+the RUN_PATTERN pattern.
+
+A module-level profiler is shared by the instrumented modules. Use the
+stage() helper to add a span to it.
+
+Usage:
+    from utils.profiling import get_profiler, stage
+
+    with stage("update_ct"):
+        update_ct(...)
+
+    report = get_profiler().report()
+"""
+
+import logging
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pattern name for stages timed outside a device span
+RUN_PATTERN = "(run)"
+
+
+class DeviceSpan:
+    """
+    Timing span for a single device.
+
+    Attributes:
+        name: Device name
+        pattern: Pattern the device is reported under (may be updated
+            while the span is open, e.g. after SWER classification)
+        timings: Seconds spent in each stage path, plus "total"
+    """
+
+    __slots__ = ("name", "pattern", "timings")
+
+    def __init__(self, name: str, pattern: str = ""):
+        self.name = name
+        self.pattern = pattern
+        self.timings: Dict[str, float] = {}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Get a nearest-rank percentile from sorted values.
+
+    Args:
+        sorted_values: Values sorted in ascending order
+        fraction: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        The percentile value, or 0.0 for an empty list
+
+    Examples:
+        >>> percentile([1.0, 2.0, 3.0, 4.0], 0.5)
+        2.0
+        >>> percentile([1.0, 2.0, 3.0, 4.0], 0.95)
+        4.0
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class StageProfiler:
+    """
+    Records hierarchical stage spans per device and aggregates them per run.
+
+    Attributes:
+        enabled: If False, spans are not timed
+        emit_json: If True, log a JSON Lines record for each device span
+    """
+
+    def __init__(self, enabled: bool = True, emit_json: bool = True):
+        """
+        Create a profiler.
+
+        Args:
+            enabled: Whether spans are timed
+            emit_json: Whether to log a record for each device span
+        """
+        self.enabled = enabled
+        self.emit_json = emit_json
+        self._stack: List[str] = []
+        self._device: Optional[DeviceSpan] = None
+        # {pattern: {stage_path: [seconds, ...]}}
+        self._samples: Dict[str, Dict[str, List[float]]] = {}
+
+    @property
+    def current_stage(self) -> str:
+        """Path of the innermost open stage, or "" outside any stage."""
+        return self._stack[-1] if self._stack else ""
+
+    @contextmanager
+    def device(self, name: str, pattern: str = "") -> Iterator[Optional[DeviceSpan]]:
+        """
+        Open a device span.
+
+        Args:
+            name: Device name
+            pattern: Pattern to report the device under
+
+        Yields:
+            The DeviceSpan, or None if the profiler is disabled
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = DeviceSpan(name, pattern)
+        outer_device, outer_stack = self._device, self._stack
+        self._device, self._stack = span, []
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.timings["total"] = time.perf_counter() - start
+            self._device, self._stack = outer_device, outer_stack
+            self._record(span.pattern, span.timings)
+            if self.emit_json:
+                self._emit(span)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Open a stage span nested in the current stage.
+
+        Args:
+            name: Stage name
+        """
+        if not self.enabled:
+            yield
+            return
+
+        path = f"{self._stack[-1]}/{name}" if self._stack else name
+        self._stack.append(path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            if self._device is not None:
+                timings = self._device.timings
+                timings[path] = timings.get(path, 0.0) + elapsed
+            else:
+                self._record(RUN_PATTERN, {path: elapsed})
+
+    def _record(self, pattern: str, timings: Dict[str, float]) -> None:
+        """Add stage timings to the run samples for a pattern."""
+        samples = self._samples.setdefault(pattern, {})
+        for path, seconds in timings.items():
+            samples.setdefault(path, []).append(seconds)
+
+    def _emit(self, span: DeviceSpan) -> None:
+        """Log a JSON Lines record for a completed device span."""
+        logger.info(
+            f"Stage timings for {span.name}",
+            extra={"extra_data": {
+                "device": span.name,
+                "pattern": span.pattern,
+                "timings": {path: round(s, 6) for path, s in span.timings.items()},
+            }},
+        )
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Aggregate run samples per pattern and stage.
+
+        Returns:
+            {pattern: {stage_path: {"count", "total", "p50", "p95", "max"}}}
+        """
+        report: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for pattern, stages in self._samples.items():
+            report[pattern] = {}
+            for path, values in stages.items():
+                ordered = sorted(values)
+                report[pattern][path] = {
+                    "count": len(ordered),
+                    "total": round(sum(ordered), 6),
+                    "p50": round(percentile(ordered, 0.50), 6),
+                    "p95": round(percentile(ordered, 0.95), 6),
+                    "max": round(ordered[-1], 6),
+                }
+        return report
+
+    def reset(self) -> None:
+        """Clear run samples, e.g. between projects in a batch."""
+        self._samples.clear()
+        self._stack = []
+        self._device = None
+
+
+# Profiler shared by the instrumented modules
+_profiler = StageProfiler()
+
+
+def get_profiler() -> StageProfiler:
+    """
+    Get the shared profiler.
+
+    Returns:
+        The module-level StageProfiler
+    """
+    return _profiler
+
+
+def stage(name: str):
+    """
+    Open a stage span on the shared profiler.
+
+    Args:
+        name: Stage name
+
+    Returns:
+        Context manager timing the stage
+    """
+    return _profiler.stage(name)